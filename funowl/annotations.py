@@ -19,7 +19,7 @@ AnnotationPropertyRange := 'AnnotationPropertyRange' '(' axiomAnnotations Annota
 """
 from abc import ABC
 from dataclasses import dataclass, fields, field
-from typing import Union, List, Callable, ClassVar, Tuple, Any
+from typing import Union, List, Callable, ClassVar, Tuple, Any, FrozenSet
 
 from rdflib import URIRef, Graph
 from rdflib.namespace import OWL, RDF, RDFS
@@ -59,7 +59,9 @@ class Annotation(object):
 
 @dataclass
 class Annotatable(FunOwlBase, ABC):
+    __slots__ = ()
     annotation_type: ClassVar[URIRef] = OWL.Axiom
+    _set_fields: ClassVar[FrozenSet[str]] = frozenset({'annotations'})
 
     """ Annotatable must declare annotations after the required fields """
 
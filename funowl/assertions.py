@@ -27,7 +27,7 @@ NegativeDataPropertyAssertion := 'NegativeDataPropertyAssertion'
                             '(' axiomAnnotations DataPropertyExpression sourceIndividual targetValue ')'
 """
 from dataclasses import dataclass
-from typing import List, Optional, Union
+from typing import List, Optional, Union, ClassVar, FrozenSet
 
 from rdflib import Graph, OWL, RDF
 from rdflib.term import BNode
@@ -49,6 +49,7 @@ from funowl.writers import FunctionalWriter
 class SameIndividual(Annotatable):
     individuals: List[Individual]
     annotations: List[Annotation] = empty_list_wrapper(Annotation)
+    _set_fields: ClassVar[FrozenSet[str]] = Annotatable._set_fields | {'individuals'}
 
     def __init__(self, *individuals: Individual, annotations: Optional[List[Annotation]] = None) -> None:
         self.individuals = list(individuals)
@@ -87,6 +88,7 @@ class SameIndividual(Annotatable):
 class DifferentIndividuals(Annotatable):
     individuals: List[Individual]
     annotations: List[Annotation] = empty_list_wrapper(Annotation)
+    _set_fields: ClassVar[FrozenSet[str]] = Annotatable._set_fields | {'individuals'}
 
     def __init__(self, *individuals: Individual,  annotations: Optional[List[Annotation]] = None) -> None:
         self.individuals = list(individuals)
@@ -3,11 +3,23 @@ from collections.abc import Iterable
 from collections import UserList
 from copy import copy
 from dataclasses import Field, MISSING, field
-from typing import Type, Any, Optional, Union, List, TypeVar
-
+from functools import partial
+from typing import Type, Any, Optional, Union, List, TypeVar, Callable, Dict, Tuple
 
 from funowl.terminals.TypingHelper import is_union, get_args, isinstance_, is_list, is_dict, is_tuple, \
-    is_set
+    is_set, type_decides
+
+# False means always search the target types instead of using the cast plans
+USE_CAST_PLANS = True
+
+# (id of target, type of value) -> (target, target type, plan).  The plan is a function that casts a value of that type
+# to the target or None if the outcome depends on the value itself.  The target is a type or a Field.  Targets are
+# keyed on their id because hashing a Union hashes every one of its members.  The target type is the type of the Field,
+# which can change when forward references are resolved
+_cast_plans: Dict[Tuple[int, Type], Tuple[Any, Any, Optional[Callable[[Any], Any]]]] = {}
+
+# Class -> the class that its instances stand in for.  See register_stand_in
+_stand_ins: Dict[Type, Type] = {}
 
 
 # The basic problem we face is that when you are using an IDE, we want to be permissive.  As an example, if you are
@@ -47,6 +59,114 @@ def remove_exclusions(typ: Union[Field, Type]) -> Union[List[Type], Type]:
     return [typ]
 
 
+def register_stand_in(cls: Type, for_cls: Type) -> None:
+    """
+    Have cast() store instances of cls unchanged wherever for_cls is expected, as if they were instances of for_cls.
+    cls must also pass isinstance and issubclass checks for for_cls (e.g. by being registered as a virtual subclass)
+
+    :param cls: class whose instances stand in for instances of for_cls
+    :param for_cls: class that is stood in for
+    """
+    _stand_ins[cls] = for_cls
+    _cast_plans.clear()
+
+
+def stand_in_for(cls: Type) -> Type:
+    """ Return the class that instances of cls stand in for -- cls itself if it isn't a registered stand in """
+    return _stand_ins.get(cls, cls)
+
+
+def _do_cast(target_type: Type, target_value: Any) -> Any:
+    # Try to kick out a better error here
+    args = getattr(target_type, '_parse_input', lambda e: e)(target_value)
+    if target_type is str:
+        raise ValueError(f'Not expecting a quoted string in this context: "{target_value}"')
+    return target_type(*args)
+
+
+def _do_cast_copy(target_type: Type, target_value: Any) -> Any:
+    return _do_cast(target_type, copy(target_value))
+
+
+def _identity(v: Any) -> Any:
+    return v
+
+
+def _cast_list(element_type: Optional[Type], wrap: bool, v: Any) -> Any:
+    if wrap:
+        v = [v]
+    return [cast(element_type, vi) for vi in v] if element_type is not None else v
+
+
+def _compile_cast_plan(cast_to: Union[Type, Field], value_type: Type) -> Optional[Callable[[Any], Any]]:
+    """
+    Work out what cast does with values of type value_type, following the same steps in the same order
+
+    :param cast_to: Field, FunOwlChoice instance or Type definition we want to cast to
+    :param value_type: type of the values
+    :return: function that casts a value or None if what happens depends on the value
+    """
+    from funowl.base.fun_owl_choice import FunOwlChoice
+
+    type_list = remove_exclusions(cast_to)
+    exact_type = _stand_ins.get(value_type, value_type)
+    if any(exact_type is typ for typ in type_list):
+        return _identity
+    for typ in type_list:
+        if typ is Any or isinstance(typ, TypeVar):
+            return partial(_do_cast, typ)
+        elif isinstance_(typ, FunOwlChoice):
+            return None
+        elif is_union(typ):
+            for t in get_args(typ):
+                decided = type_decides(value_type, t)
+                if decided is None:
+                    return None
+                if decided:
+                    return _identity if exact_type is t else partial(_do_cast, t)
+        elif is_dict(typ):
+            if issubclass(value_type, dict):
+                return None
+        elif is_list(typ):
+            wrap = issubclass(value_type, str) or not issubclass(value_type, Iterable)
+            if wrap or issubclass(value_type, (list, UserList)):
+                list_type = get_args(typ)
+                return partial(_cast_list, list_type[0] if list_type else None, wrap)
+        elif is_tuple(typ):
+            if issubclass(value_type, tuple):
+                return None
+        elif is_set(typ):
+            if issubclass(value_type, set):
+                return None
+        else:
+            decided = type_decides(value_type, typ)
+            if decided is None:
+                return None
+            if decided:
+                return partial(_do_cast if issubclass(typ, str) else _do_cast_copy, typ)
+    return None
+
+
+def _cast_plan(cast_to: Union[Type, Field], value_type: Type) -> Optional[Callable[[Any], Any]]:
+    """ Return the compiled plan for casting values of type value_type to cast_to, if there is one """
+    target_type = cast_to.type if isinstance(cast_to, Field) else cast_to
+    entry = _cast_plans.get((id(cast_to), value_type))
+    if entry is None or entry[0] is not cast_to or entry[1] is not target_type:
+        entry = _cast_plans[(id(cast_to), value_type)] = (cast_to, target_type, _compile_cast_plan(cast_to, value_type))
+    return entry[2]
+
+
+def casts_unchanged(cast_to: Union[Type, Field], value_type: Type) -> bool:
+    """
+    Determine whether cast(cast_to, v) returns v itself for every v of type value_type
+
+    :param cast_to: Field, FunOwlChoice instance or Type definition
+    :param value_type: type of the values
+    :return: True if values of value_type need no cast
+    """
+    return USE_CAST_PLANS and _cast_plan(cast_to, value_type) is _identity
+
+
 def cast(cast_to: Union[Type, Field], v: Any, _coercion_allowed: Optional[bool] = None) -> Any:
     """
     Convert value v to type cast_to.  Raises TypeError if conversion is not possible.  Note that None and empty lists are
@@ -57,6 +177,17 @@ def cast(cast_to: Union[Type, Field], v: Any, _coercion_allowed: Optional[bool]
     :param _coercion_allowed: True means type coercion is allowed.  False means only matching types work
     :return: instance of cast_to
     """
+    # None and empty lists are universal types.  If already cast, we're done
+    v_type = _stand_ins.get(type(v), type(v))
+    if v is None or v == [] or (isinstance(cast_to, Field) and v_type is cast_to.type) or v_type is cast_to:
+        return v
+
+    # Values whose type alone determines the outcome go straight to the conversion that was worked out the first time
+    if USE_CAST_PLANS and _coercion_allowed is not False:
+        plan = _cast_plan(cast_to, type(v))
+        if plan is not None:
+            return plan(v)
+
     from funowl.base.fun_owl_choice import FunOwlChoice
 
     def cast_to_choice(choice: FunOwlChoice, v: Any) -> Any:
@@ -78,23 +209,14 @@ def cast(cast_to: Union[Type, Field], v: Any, _coercion_allowed: Optional[bool]
         return rval
 
     # TODO: this should be a parameterized type for return
-    def do_cast(target_type: Type, target_value: Any) -> Any:
-        # Try to kick out a better error here
-        args = getattr(target_type, '_parse_input', lambda e: e)(target_value)
-        if target_type is str:
-            raise ValueError(f'Not expecting a quoted string in this context: "{target_value}"')
-        return target_type(*args)
-
-    # None and empty lists are universal types.  If already cast, we're done
-    if v is None or v == [] or (isinstance_(cast_to, Field) and type(v) is cast_to.type) or type(v) is cast_to:
-        return v
+    do_cast = _do_cast
 
     # Create an ordered list of target types -- these are the types IN cast_to
     type_list = remove_exclusions(cast_to)
 
     # If we already match the list, no coercion is necessary
     for typ in type_list:
-        if type(v) is typ:
+        if v_type is typ:
             return v
 
     # Iterate through the list to determine whether we can coerce v to any of the targets
@@ -114,7 +236,7 @@ def cast(cast_to: Union[Type, Field], v: Any, _coercion_allowed: Optional[bool]
             elif is_union(typ):
                 for t in get_args(typ):
                     if isinstance_(v, t):
-                        if type(v) is t:
+                        if v_type is t:
                             return v
                         else:
                             return do_cast(t, v)
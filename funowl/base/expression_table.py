@@ -0,0 +1,181 @@
+"""
+Hash consing for class expressions and data ranges.
+
+Large ontologies repeat the same expressions (e.g. ObjectSomeValuesFrom(:partOf :Heart)) many times over.  While an
+ExpressionTable is active, every class expression and data range that is constructed resolves to one shared instance
+per structure, so a repeated expression is held in memory once and structurally equal expressions are identical.
+"""
+from collections import UserList
+from contextlib import contextmanager
+from contextvars import ContextVar
+from copy import deepcopy
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
+
+from funowl.base.fun_owl_base import FunOwlBase, FunOwlBaseMeta, FunOwlRoot, class_metadata
+
+
+class FrozenList(list):
+    """ The list fields of a shared expression.  Compares equal to lists, but can't be modified """
+    def _frozen(self, *_, **__):
+        raise TypeError("The lists of a shared expression can't be modified -- modify a copy of the expression instead")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _frozen
+    append = extend = insert = remove = pop = clear = sort = reverse = _frozen
+
+    def __reduce__(self):
+        return FrozenList, (list(self),)
+
+
+class ExpressionTable:
+    """
+    Hash consing table for class expressions and data ranges.  While a table is active, constructing a class expression
+    or data range returns the shared instance that the table holds for its structure.  Shared instances can't be
+    modified -- modify a copy instead.
+
+    to_python only shares expressions through a table that it is given.  Pass the same table to share expressions
+    across documents, or use intern() to share expressions that were built without a table.
+    """
+    def __init__(self) -> None:
+        self._entries: Dict[Tuple, SharedExpression] = {}
+        # ids of the shared instances.  The instances are held in _entries, so an id can't be reused
+        self._shared: Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @contextmanager
+    def active(self) -> Iterator["ExpressionTable"]:
+        """ Share the expressions that are constructed in this table for the duration of the context """
+        token = _expression_table.set(self)
+        try:
+            yield self
+        finally:
+            _expression_table.reset(token)
+
+    def intern(self, expr: Any) -> Any:
+        """
+        Return the shared instance of expr, adding a copy of expr to the table if it has no instance of that
+        structure yet.  Values other than class expressions and data ranges are returned as they are
+
+        :param expr: expression to share
+        :return: shared instance
+        """
+        return self._intern(expr, False)
+
+    def adopt(self, expr: Any) -> Any:
+        """
+        Version of intern for an expression that nothing else refers to (e.g. one that has just been unpickled).  If
+        the table has no instance of its structure yet, expr itself becomes the shared instance
+
+        :param expr: expression to share
+        :return: shared instance
+        """
+        return self._intern(expr, True)
+
+    def _intern(self, expr: Any, fresh: bool) -> Any:
+        if not isinstance(expr, SharedExpression) or id(expr) in self._shared:
+            return expr
+        names = class_metadata(type(expr)).fields
+        values = [self._share(getattr(expr, name)) for name in names]
+        key = (type(expr),) + tuple(self._key(v) for v in values)
+        rval = self._entries.get(key)
+        if rval is None:
+            # An expression that the caller has a reference to is left as it is
+            rval = expr if fresh else expr.__copy__()
+            for name, v in zip(names, values):
+                object.__setattr__(rval, name, v)
+            if hasattr(rval, '__dict__'):
+                object.__setattr__(rval, '_interned', True)
+            self._entries[key] = rval
+            self._shared.add(id(rval))
+        return rval
+
+    def _share(self, v: Any) -> Any:
+        """ Shared form of field value v """
+        if isinstance(v, (list, UserList)):
+            return FrozenList(self._share(e) for e in v)
+        if isinstance(v, tuple):
+            return tuple(self._share(e) for e in v)
+        return self._intern(v, False) if isinstance(v, SharedExpression) else v
+
+    def _key(self, v: Any) -> Any:
+        """ Structural key of shared field value v """
+        if isinstance(v, SharedExpression):
+            return id(v)
+        if isinstance(v, (list, tuple)):
+            return tuple(self._key(e) for e in v)
+        names = class_metadata(type(v)).fields if isinstance(v, FunOwlRoot) else None
+        if names:
+            return (type(v),) + tuple(self._key(getattr(v, name)) for name in names)
+        # Terminals -- strings (AbbreviatedIRI, URIRef, ...), numbers, literals and None
+        return type(v), v
+
+
+_expression_table: ContextVar[Optional[ExpressionTable]] = ContextVar('expression_table', default=None)
+
+
+def active_expression_table() -> Optional[ExpressionTable]:
+    """ Return the expression table that is currently active, if any """
+    return _expression_table.get()
+
+
+class ExpressionMeta(FunOwlBaseMeta):
+    """ Route class expression and data range construction through the active ExpressionTable, if any """
+    def __call__(cls, *args, **kwargs):
+        rval = super().__call__(*args, **kwargs)
+        table = _expression_table.get()
+        return rval if table is None else table._intern(rval, True)
+
+
+class SharedExpression(FunOwlBase, metaclass=ExpressionMeta):
+    """ Base of the class expressions and data ranges that an ExpressionTable can share """
+    __slots__ = ()
+    _interned = False
+
+    def __setattr__(self, key, value):
+        if self._interned:
+            raise AttributeError(f"{type(self).__name__} is shared through an ExpressionTable and can't be modified")
+        super().__setattr__(key, value)
+
+    def __eq__(self, other: Any) -> bool:
+        if self is other:
+            return True
+        # Shared expressions can't change, so their hashes are known
+        if self._interned and getattr(other, '_interned', False) and hash(self) != hash(other):
+            return False
+        return super().__eq__(other)
+
+    def __hash__(self) -> int:
+        if not self._interned:
+            return super().__hash__()
+        rval = self.__dict__.get('_hash')
+        if rval is None:
+            rval = self.__dict__['_hash'] = super().__hash__()
+        return rval
+
+    def __setstate__(self, state: Any) -> None:
+        # Hashes of strings vary from one process to the next, so a cached hash can't be unpickled
+        dict_state, slot_state = state if isinstance(state, tuple) else (state, None)
+        for k, v in list((dict_state or {}).items()) + list((slot_state or {}).items()):
+            if k != '_hash':
+                object.__setattr__(self, k, v)
+
+    def __copy__(self) -> "SharedExpression":
+        # Copies of a shared instance belong to the caller
+        cls = type(self)
+        rval = cls.__new__(cls)
+        if hasattr(self, '__dict__'):
+            rval.__dict__.update(self.__dict__)
+            rval.__dict__.pop('_interned', None)
+            rval.__dict__.pop('_hash', None)
+        for name in class_metadata(cls).fields:
+            v = getattr(self, name)
+            object.__setattr__(rval, name, list(v) if isinstance(v, FrozenList) else v)
+        return rval
+
+    def __deepcopy__(self, memo: Dict) -> "SharedExpression":
+        rval = self.__copy__()
+        memo[id(self)] = rval
+        for name in class_metadata(type(self)).fields:
+            object.__setattr__(rval, name, deepcopy(getattr(rval, name), memo))
+        return rval
@@ -1,27 +1,130 @@
 import logging
 from abc import ABCMeta
+from collections import UserList
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass, Field, fields
-from typing import List, Any, Tuple, Type, Optional
+from typing import List, Any, Tuple, Type, Optional, Dict, FrozenSet, Iterator, Callable, get_type_hints, ClassVar
 
 from rdflib import Graph
-from rdflib.term import URIRef
+from rdflib.term import URIRef, Literal
 
-from funowl.base.cast_function import cast
+from funowl.base.cast_function import cast, remove_exclusions, stand_in_for
 from funowl.base.rdftriple import SUBJ
+from funowl.terminals.TypingHelper import is_list, is_union, get_args, register_type_decider, type_decides
 from funowl.writers.FunctionalWriter import FunctionalWriter
 
 
-@dataclass(unsafe_hash=True)
+# True while objects are being built from input that is already known to be well typed.  See trusted()
+_trusted: ContextVar[bool] = ContextVar('trusted', default=False)
+
+
+class ClassMetadata:
+    """
+    What attribute assignment needs to know about the fields of a class, worked out the first time it is needed.
+    Everything that depends on the type of a field is recomputed if the type changes (see proc_forwards).
+    """
+    def __init__(self, cls: Type) -> None:
+        self.cls = cls
+        self.fields: Dict[str, Field] = {f.name: f for f in fields(cls)}
+        self._hints: Optional[Dict[str, Any]] = None
+        self._derived: Dict[Tuple[str, Callable], Tuple[Any, Any]] = {}
+
+    @property
+    def hints(self) -> Dict[str, Any]:
+        """ Type hints of the class with forward references resolved """
+        if self._hints is None:
+            self._hints = get_type_hints(self.cls)
+        return self._hints
+
+    def _derive(self, name: str, fn: Callable[[Field], Any]) -> Any:
+        fld = self.fields[name]
+        derived = self._derived.get((name, fn))
+        if derived is None or derived[0] is not fld.type:
+            derived = self._derived[(name, fn)] = (fld.type, fn(fld))
+        return derived[1]
+
+    def real_types(self, name: str) -> List[Type]:
+        """ The types in the (Union) type of field name, less the ones it excludes """
+        return self._derive(name, _real_types)
+
+    def exact_types(self, name: str) -> Optional[Tuple[FrozenSet[Type], bool]]:
+        """
+        The types that cast() passes through unchanged for field name and True if they apply to the elements of a
+        list.  None if the field has types that can't be compared by identity
+        """
+        return self._derive(name, _exact_types)
+
+
+def _real_types(fld: Field) -> List[Type]:
+    exclusions = fld.metadata.get('exclude', [])
+    return [t for t in get_args(fld.type) if t not in exclusions]
+
+
+def _exact_types(fld: Field) -> Optional[Tuple[FrozenSet[Type], bool]]:
+    types = remove_exclusions(fld)
+    is_list_ = len(types) == 1 and is_list(types[0]) and bool(get_args(types[0]))
+    if is_list_:
+        element_type = get_args(types[0])[0]
+        types = get_args(element_type) if is_union(element_type) else [element_type]
+    return (frozenset(types), is_list_) if all(isinstance(t, type) for t in types) else None
+
+
+_class_metadata: Dict[Type, ClassMetadata] = {}
+
+
+def class_metadata(cls: Type) -> ClassMetadata:
+    """ Return the ClassMetadata for cls """
+    try:
+        return _class_metadata[cls]
+    except KeyError:
+        rval = _class_metadata[cls] = ClassMetadata(cls)
+        return rval
+
+
+@contextmanager
+def trusted() -> Iterator[None]:
+    """
+    Context for building objects from values that are already of the declared types -- the output of the functional
+    parser or of an internal transform.  Inside the context a field value whose type is exactly one of the types
+    declared for the field (or, for a list, whose elements all are) is stored as is, skipping cast() entirely.  Any
+    other value is cast as usual, so user facing constructors keep their permissive coercion.
+    """
+    token = _trusted.set(True)
+    try:
+        yield
+    finally:
+        _trusted.reset(token)
+
+
+@dataclass
 class FunOwlRoot:
     """ The root object for all OWL functional representations """
+    # The abstract classes have no instance state of their own, which lets funowl.compact give its classes __slots__
+    __slots__ = ()
+
+    # Fields whose values are sets in the OWL 2 structural specification -- the order and repeats of their elements
+    # don't count in comparisons
+    _set_fields: ClassVar[FrozenSet[str]] = frozenset()
+
     def __post_init__(self):
         logging.debug(f"Constructed {repr(self)}")
 
     def __setattr__(self, key, value):
-        # Resolve Forward references before we begin the cast process
-        # TODO: This seems like it would be a performance issue -- can we do something up front to make sure that all
-        #       forward references are covered globally
-        hint = self._field_for(key)
+        # Field lookups go through the class metadata, which is built once per class
+        metadata = class_metadata(type(self))
+        hint = metadata.fields.get(key)
+        if hint and _trusted.get():
+            exact = metadata.exact_types(key)
+            if exact is not None:
+                exact_types, is_list_ = exact
+                if is_list_:
+                    if isinstance(value, (list, UserList)) and all(type(e) in exact_types for e in value):
+                        super().__setattr__(key, list(value))
+                        return
+                elif type(value) in exact_types:
+                    super().__setattr__(key, value)
+                    return
         super().__setattr__(
             key, cast(hint, value, getattr(self, '_coercion_allowed', None)) if hint else value)
 
@@ -33,11 +136,41 @@ class FunOwlRoot:
     #             return ListWrapper(rval, get_args(hints[item])[0])
     #     return rval
 
+    def _structural_key(self) -> Tuple:
+        """
+        Key that is equal for structurally equal objects (OWL 2 Structural Specification, section 3.2): the class
+        and the field values, with lists as tuples and the lists in _set_fields as frozensets.
+
+        The key is rebuilt on every comparison and hash.  Model objects are mutable -- their lists can be changed in
+        place without going through __setattr__ -- so a cached key could go stale.  Only the expressions shared through
+        an ExpressionTable, which can't be changed, cache their hashes
+        """
+        cls = type(self)
+        names = class_metadata(cls).fields
+        if not names:
+            # Terminals (AbbreviatedIRI, NonNegativeInteger, ...) are their own values
+            return stand_in_for(cls), self
+        set_fields = cls._set_fields
+        key = [stand_in_for(cls)]
+        for name in names:
+            v = getattr(self, name)
+            if isinstance(v, (list, UserList, tuple)):
+                v = frozenset(v) if name in set_fields else tuple(v)
+            key.append(v)
+        return tuple(key)
+
+    def __eq__(self, other: Any) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, FunOwlRoot):
+            return NotImplemented
+        return self._structural_key() == other._structural_key()
+
+    def __hash__(self) -> int:
+        return hash(self._structural_key())
+
     def _field_for(self, key) -> Optional[Field]:
-        for f in fields(self):
-            if f.name == key:
-                return f
-        return None
+        return class_metadata(type(self)).fields.get(key)
 
     def to_functional(self, w: FunctionalWriter) -> FunctionalWriter:
         """
@@ -81,6 +214,15 @@ class FunOwlRoot:
 
 class FunOwlBaseMeta(ABCMeta):
     """ Metaclass for FunOwlBase """
+    def __new__(mcs, name, bases, namespace, **kwargs):
+        cls = super().__new__(mcs, name, bases, namespace, **kwargs)
+        # dataclass() replaces an inherited __eq__ with a field by field comparison and drops __hash__ unless the class
+        # defines them itself.  Pin the structural versions that the class inherits
+        for attr in ('__eq__', '__hash__'):
+            if attr not in namespace:
+                setattr(cls, attr, getattr(cls, attr))
+        return cls
+
     @staticmethod
     def _is_valid(cls, instance) -> bool:
         pass
@@ -89,8 +231,33 @@ class FunOwlBaseMeta(ABCMeta):
         return cls._is_valid(cls, instance)
 
 
+def _decide_type(value_type: Type, typ: FunOwlBaseMeta) -> Optional[bool]:
+    """ type_decides for FunOwl classes, whose _is_valid may accept values that can be coerced """
+    from funowl.base.fun_owl_choice import FunOwlChoice
+
+    if typ._is_valid is FunOwlRoot._is_valid:
+        return issubclass(value_type, typ)
+    if typ._is_valid is FunOwlChoice._is_valid and not issubclass(value_type, Literal):
+        for choice_type in typ.real_types():
+            if not isinstance(choice_type, type):
+                return None
+            if issubclass(value_type, choice_type):
+                return True
+            if typ._coercion_allowed:
+                decided = type_decides(value_type, choice_type)
+                if decided is not False:
+                    return decided
+        return False
+    return None
+
+
+register_type_decider(FunOwlBaseMeta, _decide_type)
+
+
 @dataclass
 class FunOwlBase(FunOwlRoot, metaclass=FunOwlBaseMeta):
+    __slots__ = ()
+
     def _subjects(self, g: Graph) -> List[SUBJ]:
         # This should never get called.  If it does, FunOwlRoot will raise a notimplemented error.
         return super()._subjects(g)
@@ -1,18 +1,18 @@
 import logging
-from dataclasses import dataclass, fields, Field
-from typing import Any, ClassVar, get_type_hints, List, Type, Optional, Union
+from dataclasses import dataclass, Field
+from typing import Any, ClassVar, List, Type, Optional, Union, Tuple
 
 from rdflib import Graph
 from rdflib.term import URIRef, Literal
 
 from funowl.base.cast_function import cast
-from funowl.base.fun_owl_base import FunOwlBase
+from funowl.base.fun_owl_base import FunOwlBase, FunOwlRoot, class_metadata
 from funowl.base.rdftriple import NODE, SUBJ
-from funowl.terminals.TypingHelper import isinstance_, get_args
+from funowl.terminals.TypingHelper import isinstance_
 from funowl.writers.FunctionalWriter import FunctionalWriter
 
 
-@dataclass(unsafe_hash=True)
+@dataclass
 class FunOwlChoice(FunOwlBase):
     """
     Base class for different type choices.
@@ -21,15 +21,17 @@ class FunOwlChoice(FunOwlBase):
       True means try to make it fit
 
     """
+    __slots__ = ()
+
     v: Union[Any, Any]
     _coercion_allowed: ClassVar[bool] = True             # False means type has to be exact coming in
 
     @classmethod
     def v_field(cls) -> Field:
-        for fld in fields(cls):
-            if fld.name == 'v':
-                return fld
-        raise TypeError(f"{cls} (hash: {hash(cls)} does not define a valid choice variable ('v')")
+        fld = class_metadata(cls).fields.get('v')
+        if fld is None:
+            raise TypeError(f"{cls} (hash: {hash(cls)} does not define a valid choice variable ('v')")
+        return fld
 
     @classmethod
     def types(cls) -> List[Type]:
@@ -45,9 +47,7 @@ class FunOwlChoice(FunOwlBase):
         Note that this code closely parallels the cast_function remove_exclusions function.  It is separate because
         of import issues
         """
-        fld = cls.v_field()
-        exclusions = fld.metadata.get('exclude', [])
-        return [t for t in get_args(fld.type) if t not in exclusions]
+        return class_metadata(cls).real_types(cls.v_field().name)
 
     def set_v(self, value: Any) -> bool:
         """ Default setter -- can be invoked from more elaborate coercion routines
@@ -63,9 +63,16 @@ class FunOwlChoice(FunOwlBase):
 
     def __setattr__(self, key, value):
         if key != 'v' or not self.set_v(value):
-            hints = get_type_hints(type(self))
+            hints = class_metadata(type(self)).hints
             super().__setattr__(key, cast(hints[key], value) if key in hints else value)
 
+    def _structural_key(self) -> Tuple:
+        # A choice that does no more than wrap its value (e.g. ObjectPropertyExpression) is structurally the value
+        if len(class_metadata(type(self)).fields) > 1:
+            return super()._structural_key()
+        v = self.v
+        return v._structural_key() if isinstance(v, FunOwlRoot) else (v, )
+
     def to_functional(self, w: FunctionalWriter) -> FunctionalWriter:
         """ Emit functional syntax for value
 
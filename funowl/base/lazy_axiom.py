@@ -0,0 +1,113 @@
+"""
+Placeholders for axioms that haven't been parsed yet.
+
+A LazyAxiom records the name of a function and its (start, end) span in the source buffer.  The function body is only
+parsed (and its elements cast) when the axiom is actually used -- an attribute is accessed, it is serialized or it is
+converted to RDF.  The function name alone is enough to select axioms by type, so filtering never forces a parse.
+"""
+from mmap import mmap
+from typing import Union, Type, Iterable, Iterator, Optional, Any, Tuple
+
+from rdflib import Graph
+
+from funowl.base.fun_owl_base import FunOwlBase
+from funowl.base.rdftriple import NODE
+from funowl.terminals.TypingHelper import flatten_unions
+from funowl.writers.FunctionalWriter import FunctionalWriter
+
+
+class LazyAxiom:
+    __slots__ = ('function', 'start', 'end', '_source', '_decl')
+
+    def __init__(self, function: str, source: Union[bytes, mmap], start: int, end: int) -> None:
+        """
+        :param function: function name (e.g. 'SubClassOf')
+        :param source: buffer that holds the functional syntax
+        :param start: offset of the function name in source
+        :param end: offset of the first byte following the closing parenthesis
+        """
+        self.function = function
+        self.start = start
+        self.end = end
+        self._source = source
+        self._decl: Optional[FunOwlBase] = None
+
+    @property
+    def type(self) -> Type[FunOwlBase]:
+        """ The class that the axiom will materialize as """
+        import funowl
+        return getattr(funowl, self.function)
+
+    @property
+    def is_materialized(self) -> bool:
+        return self._decl is not None
+
+    def materialize(self) -> FunOwlBase:
+        """ Parse the axiom if it hasn't been parsed already and return the result """
+        if self._decl is None:
+            from funowl.converters.functional_converter import OWLFunc, _parse_args
+            from funowl.converters.functional_lexer import tokenize
+
+            tokens = tokenize(self._source, self.start, self.end)
+            token = next(tokens)
+            self._decl = OWLFunc(token.value, _parse_args(tokens)).decl
+            self._source = None
+        return self._decl
+
+    def is_a(self, *types: Type) -> bool:
+        """
+        Determine whether the axiom is an instance of any of types without materializing it
+
+        :param types: classes or Unions of classes (e.g. SubClassOf, ClassAxiom)
+        :return: True if the axiom will materialize as one of types
+        """
+        return issubclass(self.type, flatten_unions(types))
+
+    def to_functional(self, w: FunctionalWriter) -> FunctionalWriter:
+        return self.materialize().to_functional(w)
+
+    def to_rdf(self, g: Graph, emit_type_arc: bool = False) -> Optional[NODE]:
+        return self.materialize().to_rdf(g, emit_type_arc)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # The source buffer can't be pickled or copied, so the materialized axiom travels instead
+        return _materialized, (self.materialize(), )
+
+    def __getattr__(self, item: str) -> Any:
+        # Only invoked for attributes that the proxy itself doesn't have
+        if item in LazyAxiom.__slots__:
+            raise AttributeError(item)
+        return getattr(self.materialize(), item)
+
+    def __eq__(self, other: Any) -> bool:
+        return self.materialize() == (other.materialize() if isinstance(other, LazyAxiom) else other)
+
+    def __hash__(self) -> int:
+        return hash(self.materialize())
+
+    def __str__(self) -> str:
+        return str(self.materialize())
+
+    def __repr__(self) -> str:
+        return repr(self._decl) if self._decl is not None else \
+            f"LazyAxiom({self.function}, start={self.start}, end={self.end})"
+
+
+def _materialized(decl: FunOwlBase) -> FunOwlBase:
+    """ Unpickler for LazyAxiom """
+    return decl
+
+
+def axioms_of_type(axioms: Iterable[Any], *types: Type) -> Iterator[Any]:
+    """
+    Select the axioms that are instances of any of types.  Lazy axioms are selected by function name and are left
+    unparsed.
+
+    :param axioms: axioms, some or all of which may be LazyAxioms
+    :param types: classes or Unions of classes
+    :return: matching axioms
+    """
+    classes = flatten_unions(types)
+    for axiom in axioms:
+        if issubclass(axiom.type if isinstance(axiom, LazyAxiom) else type(axiom), classes):
+            yield axiom
@@ -1,23 +1,38 @@
 from collections.abc import Iterable
 from collections import UserList
-from copy import copy
 from dataclasses import field
 from typing import Type
 
-from funowl.base.cast_function import cast
+from funowl.base.cast_function import cast, casts_unchanged
 
 
 class ListWrapper(UserList):
-    def __init__(self, l: Iterable, typ = None) -> None:
+    """
+    List whose elements are cast to typ as they are added.  With validate=False the list is a plain list -- elements are
+    stored as they come until validate() is called
+    """
+    _validate: bool = True
+
+    def __init__(self, l: Iterable, typ = None, validate: bool = True) -> None:
         super().__init__()
         self._typ = typ
-        for e in l:
-            self.append(e)
+        self._validate = validate
+        self.extend(l)
+
+    def _like(self) -> "ListWrapper":
+        return ListWrapper([], self._typ, self._validate)
 
     def __add__(self, other):
-        if not isinstance(other, ListWrapper):
-            other = ListWrapper(copy(other), self._typ)
-        return super().__add__(other)
+        rval = self._like()
+        rval.data = list(self.data)
+        rval.extend(other)
+        return rval
+
+    def __radd__(self, other):
+        rval = self._like()
+        rval.extend(other)
+        rval.data += self.data
+        return rval
 
     def __iadd__(self, other):
         raise AssertionError("+= operator does not preserve list type - use extend() instead")
@@ -25,9 +40,12 @@ class ListWrapper(UserList):
         # return self
 
     def __setitem__(self, key, value):
-        super().__setitem__(key, cast(self._typ, value))
+        super().__setitem__(key, cast(self._typ, value) if self._validate else value)
 
     def append(self, item) -> None:
+        if not self._validate:
+            self.data.append(item)
+            return
         v = cast(self._typ, item)
         if isinstance(v, list):
             super().extend(v)
@@ -35,8 +53,37 @@ class ListWrapper(UserList):
             super().append(v)
 
     def extend(self, item) -> None:
+        """ Add the elements of item.  Elements of a type that the cast leaves as it is are added without a cast """
+        if not self._validate:
+            self.data.extend(item)
+            return
+        unchanged = {}
         for i in item:
-            self.append(i)
+            keep = unchanged.get(type(i))
+            if keep is None:
+                keep = unchanged[type(i)] = casts_unchanged(self._typ, type(i))
+            if keep:
+                self.data.append(i)
+            else:
+                self.append(i)
+
+    def extend_trusted(self, item) -> None:
+        """ Add elements that are already of the list type (e.g. parser output) without checking them """
+        self.data.extend(item)
+
+    def validate(self) -> "ListWrapper":
+        """
+        Cast the elements that were added without a check and check everything that is added from now on.  Raises
+        TypeError, leaving the list as it was, if an element can't be cast
+
+        :return: self
+        """
+        checked = ListWrapper([], self._typ)
+        checked.extend(self.data)
+        self.data = checked.data
+        self._validate = True
+        return self
+
 
 def empty_list_wrapper(typ: Type) -> ListWrapper:
     return field(default_factory = lambda: ListWrapper([], typ))
@@ -13,7 +13,7 @@ DisjointUnion := 'DisjointUnion' '(' axiomAnnotations Class disjointClassExpress
 disjointClassExpressions := ClassExpression ClassExpression { ClassExpression }
 """
 from dataclasses import dataclass
-from typing import List, Optional, Union
+from typing import List, Optional, Union, ClassVar, FrozenSet
 
 from rdflib import Graph, RDFS, OWL, RDF
 from rdflib.term import BNode
@@ -53,6 +53,7 @@ class SubClassOf(Annotatable):
 class EquivalentClasses(Annotatable):
     classExpressions: List[ClassExpression]
     annotations: List[Annotation] = empty_list_wrapper(Annotation)
+    _set_fields: ClassVar[FrozenSet[str]] = Annotatable._set_fields | {'classExpressions'}
 
     def __init__(self, *classExpression: ClassExpression, annotations: List[Annotation] = None) -> None:
         self.classExpressions = ListWrapper(list(classExpression), ClassExpression)
@@ -80,6 +81,7 @@ class EquivalentClasses(Annotatable):
 class DisjointClasses(Annotatable):
     classExpressions: List[ClassExpression]
     annotations: List[Annotation] = empty_list_wrapper(Annotation)
+    _set_fields: ClassVar[FrozenSet[str]] = Annotatable._set_fields | {'classExpressions'}
 
     def __init__(self, *classExpression: ClassExpression, annotations: List[Annotation] = None) -> None:
         self.classExpressions = list(classExpression)
@@ -116,6 +118,7 @@ class DisjointUnion(Annotatable):
     cls: Class
     disjointClassExpressions: List[ClassExpression]
     annotations: List[Annotation] = empty_list_wrapper(Annotation)
+    _set_fields: ClassVar[FrozenSet[str]] = Annotatable._set_fields | {'disjointClassExpressions'}
 
     def __init__(self, cls: Class, *disjointClassExpression: ClassExpression,
                  annotations: List[Annotation] = None) -> None:
@@ -141,6 +144,8 @@ class HasKey(Annotatable):
     objectPropertyExpressions: Optional[List[ObjectPropertyExpression]] = empty_list_wrapper(ObjectPropertyExpression)
     dataPropertyExpressions: Optional[List[DataPropertyExpression]] = empty_list_wrapper(DataPropertyExpression)
     annotations: List[Annotation] = empty_list_wrapper(Annotation)
+    _set_fields: ClassVar[FrozenSet[str]] = \
+        Annotatable._set_fields | {'objectPropertyExpressions', 'dataPropertyExpressions'}
 
     def __init__(self, classExpression: ClassExpression,
                  *exprs: Union[ObjectPropertyExpression, DataPropertyExpression],
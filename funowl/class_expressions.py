@@ -44,12 +44,12 @@ DataExactCardinality := 'DataExactCardinality' '(' nonNegativeInteger DataProper
 HasKey := 'HasKey' '(' axiomAnnotations ClassExpression '(' { ObjectPropertyExpression } ')' '(' { DataPropertyExpression } ')' ')'
 """
 from dataclasses import dataclass
-from typing import List, ClassVar, Union, Optional, ForwardRef
+from typing import List, ClassVar, Union, Optional, ForwardRef, FrozenSet
 
 from rdflib import URIRef, OWL, Graph, RDF
 from rdflib.term import BNode, Literal as RDFLiteral
 
-from funowl.base.fun_owl_base import FunOwlBase
+from funowl.base.expression_table import SharedExpression
 from funowl.base.list_support import ListWrapper
 from funowl.base.rdftriple import SUBJ
 from funowl.converters.rdf_converter import SEQ
@@ -72,8 +72,9 @@ class Class(IRI):
 
 
 @dataclass
-class ObjectIntersectionOf(FunOwlBase):
+class ObjectIntersectionOf(SharedExpression):
     classExpressions: List["ClassExpression"]
+    _set_fields: ClassVar[FrozenSet[str]] = frozenset({'classExpressions'})
 
     def __init__(self, *classExpression: "ClassExpression") -> None:
         self.classExpressions = list(classExpression)
@@ -95,8 +96,9 @@ class ObjectIntersectionOf(FunOwlBase):
         return []       # There are no subjects in object intersection -- only objects
 
 @dataclass
-class ObjectUnionOf(FunOwlBase):
+class ObjectUnionOf(SharedExpression):
     classExpressions: List["ClassExpression"]
+    _set_fields: ClassVar[FrozenSet[str]] = frozenset({'classExpressions'})
 
     def __init__(self, *classExpression: "ClassExpression") -> None:
         self.classExpressions = ListWrapper(classExpression, ClassExpression)
@@ -118,7 +120,7 @@ class ObjectUnionOf(FunOwlBase):
         return []       # There are no subjects in object union -- only objects
 
 @dataclass
-class ObjectComplementOf(FunOwlBase):
+class ObjectComplementOf(SharedExpression):
     classExpression:ForwardRef("ClassExpression")
 
     def to_functional(self, w: FunctionalWriter) -> FunctionalWriter:
@@ -136,8 +138,9 @@ class ObjectComplementOf(FunOwlBase):
         return []       # There are no subjects in object comlement -- only objects
 
 @dataclass(init=False)
-class ObjectOneOf(FunOwlBase):
+class ObjectOneOf(SharedExpression):
     individuals: List[Individual.types()]
+    _set_fields: ClassVar[FrozenSet[str]] = frozenset({'individuals'})
 
     def __init__(self, *individual: Individual) -> None:
         self.individuals = list(individual)
@@ -158,7 +161,7 @@ class ObjectOneOf(FunOwlBase):
         return []       # There are no subjects in object one of -- only objects
 
 @dataclass
-class ObjectSomeValuesFrom(FunOwlBase):
+class ObjectSomeValuesFrom(SharedExpression):
     objectPropertyExpression: ObjectPropertyExpression
     classExpression: ForwardRef("ClassExpression")
     coercion_allowed: ClassVar[bool] = True
@@ -180,7 +183,7 @@ class ObjectSomeValuesFrom(FunOwlBase):
         return []       # There are no subjects in object some values from -- only objects
 
 @dataclass
-class ObjectAllValuesFrom(FunOwlBase):
+class ObjectAllValuesFrom(SharedExpression):
     objectPropertyExpression: ObjectPropertyExpression
     classExpression:ForwardRef("ClassExpression")
 
@@ -202,7 +205,7 @@ class ObjectAllValuesFrom(FunOwlBase):
 
 
 @dataclass
-class ObjectHasValue(FunOwlBase):
+class ObjectHasValue(SharedExpression):
     objectPropertyExpression: ObjectPropertyExpression
     individual: Individual
 
@@ -223,7 +226,7 @@ class ObjectHasValue(FunOwlBase):
         return self.objectPropertyExpression._subjects(g)
 
 @dataclass
-class ObjectHasSelf(FunOwlBase):
+class ObjectHasSelf(SharedExpression):
     objectPropertyExpression: ObjectPropertyExpression
 
     def to_functional(self, w: FunctionalWriter) -> FunctionalWriter:
@@ -243,7 +246,7 @@ class ObjectHasSelf(FunOwlBase):
         return self.objectPropertyExpression._subjects(g)
 
 @dataclass
-class ObjectMinCardinality(FunOwlBase):
+class ObjectMinCardinality(SharedExpression):
     min_: NonNegativeInteger
     objectPropertyExpression: ObjectPropertyExpression
     classExpression: Optional["ClassExpression"] = None
@@ -273,7 +276,7 @@ class ObjectMinCardinality(FunOwlBase):
 
 
 @dataclass
-class ObjectMaxCardinality(FunOwlBase):
+class ObjectMaxCardinality(SharedExpression):
     max_: NonNegativeInteger
     objectPropertyExpression: ObjectPropertyExpression
     classExpression: Optional["ClassExpression"] = None
@@ -302,7 +305,7 @@ class ObjectMaxCardinality(FunOwlBase):
         return self.objectPropertyExpression._subjects(g)
 
 @dataclass
-class ObjectExactCardinality(FunOwlBase):
+class ObjectExactCardinality(SharedExpression):
     card: NonNegativeInteger
     objectPropertyExpression: ObjectPropertyExpression
     classExpression: Optional["ClassExpression"] = None
@@ -332,7 +335,7 @@ class ObjectExactCardinality(FunOwlBase):
         return self.objectPropertyExpression._subjects(g)
 
 @dataclass
-class DataSomeValuesFrom(FunOwlBase):
+class DataSomeValuesFrom(SharedExpression):
     dataPropertyExpressions: List[DataPropertyExpression]
     dataRange: DataRange
 
@@ -366,7 +369,7 @@ class DataSomeValuesFrom(FunOwlBase):
 
 
 @dataclass
-class DataAllValuesFrom(FunOwlBase):
+class DataAllValuesFrom(SharedExpression):
     dataPropertyExpressions: List[DataPropertyExpression]
     dataRange: DataRange
 
@@ -400,7 +403,7 @@ class DataAllValuesFrom(FunOwlBase):
 
 
 @dataclass
-class DataHasValue(FunOwlBase):
+class DataHasValue(SharedExpression):
     dataPropertyExpression: DataPropertyExpression
     literal: Literal
 
@@ -421,7 +424,7 @@ class DataHasValue(FunOwlBase):
         return self.dataPropertyExpression._subjects(g)
 
 @dataclass
-class DataMinCardinality(FunOwlBase):
+class DataMinCardinality(SharedExpression):
     min_: NonNegativeInteger
     dataPropertyExpression: DataPropertyExpression
     dataRange: Optional[DataRange] = None
@@ -451,7 +454,7 @@ class DataMinCardinality(FunOwlBase):
 
 
 @dataclass
-class DataMaxCardinality(FunOwlBase):
+class DataMaxCardinality(SharedExpression):
     max_: NonNegativeInteger
     dataPropertyExpression: DataPropertyExpression
     dataRange: Optional[DataRange] = None
@@ -480,7 +483,7 @@ class DataMaxCardinality(FunOwlBase):
         return self.dataPropertyExpression._subjects(g)
 
 @dataclass
-class DataExactCardinality(FunOwlBase):
+class DataExactCardinality(SharedExpression):
     card: NonNegativeInteger
     dataPropertyExpression: DataPropertyExpression
     dataRange: Optional[DataRange] = None
@@ -9,7 +9,10 @@ from rdflib.util import guess_format
 
 from .converters.functional_converter import to_python
 
-valid_formats = ["ttl"] + sorted(
+# Functional syntax output -- the ontology is written back out rather than converted to RDF
+FUNCTIONAL_FORMAT = "ofn"
+
+valid_formats = ["ttl", FUNCTIONAL_FORMAT] + sorted(
         [x.name for x in rdflib_plugins(None, rdflib_serializer) if "/" not in str(x.name)]
     )
 DEFAULT_FORMAT = "ttl"
@@ -20,23 +23,45 @@ def genargs(prog: Optional[str] = None) -> ArgumentParser:
     Create a command line parser
     :return: parser
     """
-    parser = ArgumentParser(prog, description="Convert OWL Functional Syntax to RDF")
-    parser.add_argument("input", help="Input OWL functional syntax. Can be a file name or URL")
+    parser = ArgumentParser(prog, description="Convert OWL Functional Syntax to RDF or rewrite it as OWL Functional "
+                                               "Syntax")
+    parser.add_argument("input", help="Input OWL functional syntax. Can be a file name or URL.  gzip, bzip2 and xz "
+                                      "compressed input is decompressed on the fly")
     parser.add_argument("output", help="Output file.  If omitted, output goes to stdout", nargs='?')
-    parser.add_argument("-f", "--format", help="Output RDF Format.  If omitted, guess from output file suffix.\n"
+    parser.add_argument("-f", "--format", help="Output RDF Format, or 'ofn' for OWL Functional Syntax.  If omitted, "
+                                               "guess from output file suffix.\n"
                                                " If guessing doesn't work, assume 'turtle'",
                         choices=valid_formats)
     parser.add_argument("-np", "--noProgressBar", help="Don't output the progress indicators", action="store_true")
+    parser.add_argument("-j", "--jobs", help="Number of processes to use when parsing the input and writing "
+                                             "functional syntax", type=int, default=1)
+    parser.add_argument("-c", "--compact", help="Write functional syntax with one axiom per line.  Only applies to "
+                                                "'ofn' output", action="store_true")
     return parser
 
 
 def evaluate_cli(argv: Optional[Union[str, List[str]]] = None, prog: Optional[str] = None) -> int:
     if isinstance(argv, str):
         argv = argv.split()
-    opts = genargs(prog).parse_args(argv if argv is not None else sys.argv[1:])
+    parser = genargs(prog)
+    opts = parser.parse_args(argv if argv is not None else sys.argv[1:])
+    functional = (opts.format or (FUNCTIONAL_FORMAT if opts.output and opts.output.endswith('.' + FUNCTIONAL_FORMAT)
+                                  else None)) == FUNCTIONAL_FORMAT
+    if opts.compact and not functional:
+        parser.error(f"-c/--compact only applies to '{FUNCTIONAL_FORMAT}' output")
 
     # Read the functional syntax ontology
-    ontology = to_python(opts.input, print_progress=bool(opts.output) and not opts.noProgressBar)
+    ontology = to_python(opts.input, print_progress=bool(opts.output) and not opts.noProgressBar, workers=opts.jobs)
+
+    # Write functional syntax
+    if functional:
+        if opts.output:
+            with open(opts.output, 'w') as f:
+                ontology.to_functional(stream=f, workers=opts.jobs, compact=opts.compact)
+        else:
+            ontology.to_functional(stream=sys.stdout, workers=opts.jobs, compact=opts.compact)
+            print()
+        return 0
 
     # Convert to RDF
     g = Graph()
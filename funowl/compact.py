@@ -0,0 +1,175 @@
+"""
+Compact variants of the axiom, class expression, data range and literal classes.
+
+The model classes are ordinary dataclasses, so every node carries an instance __dict__ and holds its lists in
+ListWrappers.  The classes in this module have the same names, fields and methods, but keep their fields in __slots__
+and their lists in tuples.  They can't be subclasses of the model classes, as a subclass would inherit the __dict__.
+Instead, each one is registered as a virtual subclass of the model class that it mirrors, so isinstance and issubclass
+accept it wherever the model class is expected and cast() stores it without converting it.
+
+Compact nodes are meant for large ontologies that are loaded, queried and written rather than edited: their list fields
+can't be appended to.  They compare (and hash) equal to the model objects that they were made from.
+
+Registering the compact classes changes what isinstance and cast() accept, so importing this module doesn't do it.  The
+classes are built and registered by the first call of compact() or the first time one of them is looked up here.
+
+    from funowl.compact import compact
+    doc = compact(to_python('big.ofn'))
+"""
+from collections import UserList
+from dataclasses import fields, is_dataclass
+from types import FunctionType
+from typing import Any, Dict, FrozenSet, ClassVar, List
+
+from funowl.annotations import Annotatable
+from funowl.base.cast_function import register_stand_in
+from funowl.base.fun_owl_base import FunOwlRoot
+from funowl.identifiers import IRI
+from funowl.ontology_document import Ontology, OntologyDocument, Import
+from funowl.prefix_declarations import Prefix
+from funowl.terminals.TypingHelper import is_list, is_union, get_args
+
+
+class CompactNode:
+    """ Mixin for the compact classes -- stores list fields as tuples """
+    __slots__ = ()
+    _list_fields: ClassVar[FrozenSet[str]] = frozenset()
+
+    def __setattr__(self, key, value):
+        if key not in self._list_fields:
+            super().__setattr__(key, value)
+            return
+        # Cast the value as a list, then freeze it
+        super().__setattr__(key, list(value) if isinstance(value, tuple) else value)
+        stored = getattr(self, key)
+        if isinstance(stored, (list, UserList)):
+            object.__setattr__(self, key, tuple(stored))
+
+
+def _is_list_type(typ: Any) -> bool:
+    return is_list(typ) or (is_union(typ) and any(is_list(t) for t in get_args(typ)))
+
+
+def _cell(value: Any) -> Any:
+    """ Return a closure cell holding value """
+    return (lambda: value).__closure__[0]
+
+
+def _rebind(member: Any, cls: type) -> Any:
+    """ Return a copy of member whose zero argument super() refers to cls """
+    # Zero argument super() finds its class in the '__class__' cell of the method's closure, which the compiler adds to
+    # every method that uses super() or __class__.  The copy is a new function around the same code object with that
+    # one cell replaced and any other cells shared.  This leans on CPython's layout of functions and closures: a model
+    # method that finds its class some other way would keep using the model class without any error being raised.
+    # test_compact.test_rebound_super checks that every rebound method sees its compact class
+    if isinstance(member, (classmethod, staticmethod)):
+        return type(member)(_rebind(member.__func__, cls))
+    if isinstance(member, property):
+        return property(*[_rebind(f, cls) for f in (member.fget, member.fset, member.fdel)], member.__doc__)
+    if not isinstance(member, FunctionType) or '__class__' not in member.__code__.co_freevars:
+        return member
+    closure = tuple(_cell(cls) if name == '__class__' else cell
+                    for name, cell in zip(member.__code__.co_freevars, member.__closure__))
+    rval = FunctionType(member.__code__, member.__globals__, member.__name__, member.__defaults__, closure)
+    rval.__kwdefaults__ = member.__kwdefaults__
+    rval.__qualname__ = member.__qualname__
+    rval.__doc__ = member.__doc__
+    rval.__annotations__ = member.__annotations__
+    rval.__dict__.update(member.__dict__)
+    return rval
+
+
+def _compact_class(cls: type) -> type:
+    """ Build the compact variant of model class cls """
+    names = [f.name for f in fields(cls)]
+    namespace = {k: v for k, v in vars(cls).items()
+                 if k not in names and k not in ('__dict__', '__weakref__', '_abc_impl', '__abstractmethods__')}
+    namespace.update(__slots__=tuple(names), __module__=__name__, __qualname__=cls.__name__,
+                     _list_fields=frozenset(f.name for f in fields(cls) if _is_list_type(f.type)))
+    rval = type(cls)(cls.__name__, (CompactNode,) + cls.__bases__, namespace)
+    for k, v in namespace.items():
+        rebound = _rebind(v, rval)
+        if rebound is not v:
+            setattr(rval, k, rebound)
+    cls.register(rval)
+    register_stand_in(rval, cls)
+    return rval
+
+
+def _model_classes() -> List[type]:
+    """
+    The model classes that have compact variants -- the axioms, expressions and values whose bases carry no instance
+    state.  IRI and the classes based on it (Class, ObjectProperty, ...) are left out, as interning marks IRI instances
+    """
+    import funowl
+
+    rval = []
+    for name, cls in sorted(vars(funowl).items()):
+        if isinstance(cls, type) and issubclass(cls, FunOwlRoot) and is_dataclass(cls) and \
+                cls not in (Annotatable, IRI, Ontology, OntologyDocument, Import, Prefix) and \
+                all(base is object or '__slots__' in vars(base) for base in cls.__mro__[1:]):
+            rval.append(cls)
+    return rval
+
+
+# Model class -> compact variant.  Filled in by _install()
+COMPACT_CLASSES: Dict[type, type] = {}
+
+_COMPACT_NAMES = frozenset(cls.__name__ for cls in _model_classes())
+
+__all__ = ['compact', 'COMPACT_CLASSES', 'CompactNode'] + sorted(_COMPACT_NAMES)
+
+
+def _install() -> Dict[type, type]:
+    """ Build the compact classes and register them with their model classes, if that hasn't been done yet """
+    if not COMPACT_CLASSES:
+        for cls in _model_classes():
+            COMPACT_CLASSES[cls] = globals()[cls.__name__] = _compact_class(cls)
+    return COMPACT_CLASSES
+
+
+def __getattr__(name: str) -> Any:
+    if name in _COMPACT_NAMES:
+        _install()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _compact(obj: Any, memo: Dict[Any, Any]) -> Any:
+    compact_cls = COMPACT_CLASSES.get(type(obj))
+    if compact_cls is None:
+        # Equal strings (prefixed names, language tags, ...) are immutable, so one copy can serve every node
+        return memo.setdefault((type(obj), obj), obj) if isinstance(obj, str) else obj
+    if id(obj) in memo:
+        return memo[id(obj)][1]
+    rval = object.__new__(compact_cls)
+    # The original is kept in memo so that its id can't be reused before the conversion is done
+    memo[id(obj)] = (obj, rval)
+    for f in fields(compact_cls):
+        v = getattr(obj, f.name)
+        object.__setattr__(rval, f.name, tuple(_compact(e, memo) for e in v)
+                           if isinstance(v, (list, UserList)) else _compact(v, memo))
+    return rval
+
+
+def _compact_in_place(values: List[Any], memo: Dict[Any, Any]) -> None:
+    target = values.data if isinstance(values, UserList) else values
+    target[:] = [_compact(v, memo) for v in target]
+
+
+def compact(obj: Any) -> Any:
+    """
+    Convert obj to compact form.  Nodes that are shared in obj are shared in the result, as are equal strings
+
+    :param obj: model object, OntologyDocument or Ontology.  The axioms and annotations of an ontology are converted
+    in place
+    :return: compact form of obj
+    """
+    _install()
+    memo: Dict[Any, Any] = {}
+    ontology = obj.ontology if isinstance(obj, OntologyDocument) else obj
+    if type(ontology) is Ontology:
+        _compact_in_place(ontology.axioms, memo)
+        _compact_in_place(ontology.annotations, memo)
+        return obj
+    return _compact(obj, memo)
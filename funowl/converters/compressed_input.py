@@ -0,0 +1,164 @@
+"""
+Streaming access to compressed functional syntax.
+
+gzip, bzip2 and xz sources are recognized by their magic bytes and decompressed with the standard library codecs.  The
+decompressed text is never held in memory as a whole -- it is read in blocks and handed to the parser as a series of
+windows, each of which ends on a top level function boundary.  A window only has to hold a block plus whatever part of
+a function straddles the end of the block.  The boundaries are found by an incremental scan of the parenthesis, quoted
+strings, IRIs and comments, so the text isn't tokenized until the parser gets to it.
+"""
+import bz2
+import gzip
+import io
+import lzma
+import re
+from mmap import mmap
+from typing import Union, Optional, Iterator, Tuple, IO
+
+from funowl.converters.parse_diagnostics import last_resync_offset
+
+# Number of decompressed bytes read at a time
+BLOCK_SIZE = 1024 * 1024
+
+# Size a window can grow to without reaching the end of a top level unit before it is cut at the start of a line.  Only
+# malformed input should ever get this far
+MAX_WINDOW = 64 * BLOCK_SIZE
+
+_QUOTE, _OPEN, _CLOSE, _LT, _HASH = b'"()<#'
+
+# Scan modes -- outside of any quoted string, IRI or comment, or inside of one
+_NORMAL, _STRING, _IRI, _COMMENT = range(4)
+_MODES = {_QUOTE: _STRING, _LT: _IRI, _HASH: _COMMENT}
+_TERMINATORS = {_IRI: b'>', _COMMENT: b'\n'}
+
+# Parenthesis and the bytes that open a quoted string, IRI or comment.  As in the lexer, the latter only count at the
+# beginning of a token ('a#b' is a name, '"1"^^<http://...>' is a literal with an IRI)
+_structure_re = re.compile(rb'[()]|(?<![^\s()">^])["<#]')
+_string_re = re.compile(rb'["\\]')
+
+_MAGIC = [(b'\x1f\x8b', gzip.open),
+          (b'BZh', bz2.open),
+          (b'\xfd7zXZ\x00', lzma.open)]
+
+
+def open_compressed(inp: Union[bytes, mmap]) -> Optional[Tuple[IO[bytes], IO[bytes]]]:
+    """
+    Open a decompressing stream on inp if it holds compressed data
+
+    :param inp: input byte stream
+    :return: (decompressed stream, raw stream) or None if inp isn't compressed.  The position of the raw stream tells
+    how much of inp has been consumed
+    """
+    for magic, opener in _MAGIC:
+        if inp[:len(magic)] == magic:
+            raw = inp if isinstance(inp, mmap) else io.BytesIO(inp)
+            raw.seek(0)
+            return opener(raw), raw
+    return None
+
+
+class _Boundaries:
+    """
+    Incremental scan for top level unit boundaries -- the offsets that follow a closing parenthesis that returns to the
+    body of the Ontology (or to the document level).  The nesting depth and whether the scan is inside of a quoted
+    string, IRI or comment carry over from one call to the next, so each byte is only looked at once, however many
+    blocks it takes to complete a unit.  Only the structural bytes are visited; the rest is skipped by the regex engine.
+
+    A boundary only counts once the next one has been found.  A function that is missing its closing parenthesis
+    "balances" against the end of the Ontology, and this keeps the two of them out of the run of complete units
+    """
+    def __init__(self) -> None:
+        self.reset(0)
+
+    def reset(self, depth: int) -> None:
+        """ Start scanning at the beginning of a buffer, nested depth parenthesis deep """
+        self.pos = 0
+        self.depth = depth
+        self.mode = _NORMAL
+        self.candidate = 0
+
+    def scan(self, buf: bytearray) -> int:
+        """
+        Scan buf from where the last scan left off
+
+        :param buf: buffer, of which the part that was already scanned is unchanged
+        :return: offset following the last boundary that has been confirmed by the newly scanned part or 0 if there is
+        none
+        """
+        boundary = 0
+        pos, depth, mode, candidate = self.pos, self.depth, self.mode, self.candidate
+        end = len(buf)
+        while pos < end:
+            if mode == _NORMAL:
+                m = _structure_re.search(buf, pos)
+                if m is None:
+                    pos = end
+                    break
+                pos = m.end()
+                c = buf[pos - 1]
+                if c == _OPEN:
+                    depth += 1
+                elif c == _CLOSE:
+                    depth -= 1
+                    if depth <= 1:
+                        boundary, candidate = candidate, pos
+                else:
+                    mode = _MODES[c]
+            elif mode == _STRING:
+                m = _string_re.search(buf, pos)
+                if m is None:
+                    pos = end
+                elif buf[m.start()] == _QUOTE:
+                    pos = m.end()
+                    mode = _NORMAL
+                elif m.end() < end:
+                    pos = m.end() + 1               # Escaped character
+                else:
+                    pos = m.start()                 # The escaped character hasn't been read yet
+                    break
+            else:
+                found = buf.find(_TERMINATORS[mode], pos)
+                if found < 0:
+                    pos = end
+                else:
+                    pos = found + 1
+                    mode = _NORMAL
+        self.pos, self.depth, self.mode, self.candidate = pos, depth, mode, candidate
+        return boundary
+
+
+def windows(stream: IO[bytes], block_size: int = BLOCK_SIZE) -> Iterator[Tuple[int, bytes, bool]]:
+    """
+    Split a decompressed stream into windows that begin and end on top level unit boundaries
+
+    :param stream: decompressed stream
+    :param block_size: number of bytes to read at a time
+    :return: (offset of the window in the decompressed stream, window, complete) tuples.  complete is False for the
+    final window, whose structure couldn't be checked
+    """
+    offset = 0
+    buf = bytearray()
+    boundaries = _Boundaries()
+    while True:
+        data = stream.read(block_size)
+        if not data:
+            if buf:
+                yield offset, bytes(buf), False
+            return
+        buf += data
+        end = boundaries.scan(buf)
+        complete = True
+        if not end and len(buf) > MAX_WINDOW:
+            # Malformed input (e.g. a function that is missing its closing parenthesis) -- cut the window at the last
+            # line in the new data that opens a function and let the parser sort it out
+            end = last_resync_offset(buf, max(len(buf) - len(data) - 1, 0))
+            complete = False
+        if end:
+            yield offset, bytes(buf[:end]), complete
+            offset += end
+            del buf[:end]
+            if complete:
+                boundaries.pos -= end
+                boundaries.candidate -= end
+            else:
+                boundaries.reset(1)
@@ -1,71 +1,85 @@
 import logging
 import re
-from contextlib import closing
-from io import BytesIO
+from collections import deque, UserList
+from dataclasses import replace
+from concurrent.futures import ProcessPoolExecutor, Future
+from contextlib import closing, contextmanager, ExitStack
 from mmap import mmap, ACCESS_READ
-from typing import Union, List, Tuple, Match, Optional, Callable, IO
-from urllib.request import urlopen, urlretrieve
+from typing import Union, List, Optional, Callable, IO, Iterator, Generator, Tuple, Iterable, Type, FrozenSet, Any, \
+    Dict
+from urllib.request import urlretrieve
 
 import rdflib
 
 import funowl
-from funowl import Annotation, OntologyDocument, Ontology
-from funowl.base.fun_owl_base import FunOwlBase
+from funowl import Annotation, OntologyDocument, Ontology, Prefix, IRI
+from funowl.base.expression_table import ExpressionTable, SharedExpression, active_expression_table
+from funowl.base.fun_owl_base import FunOwlBase, FunOwlRoot, trusted, class_metadata
+from funowl.base.lazy_axiom import LazyAxiom
 from funowl.base.fun_owl_choice import FunOwlChoice
+from funowl.converters.compressed_input import open_compressed, windows
+from funowl.converters.functional_lexer import Token, tokenize, FUNCTION, OPEN, CLOSE, FULL_IRI, PREFIX_NAME, \
+    PREFIXED_NAME, NODE_ID, LITERAL, skip_function, trailer_end
+from funowl.converters.parse_cache import ParseCache
+from funowl.converters.parse_diagnostics import ParseDiagnostic, LineCounter, resume_offset
+from funowl.converters.progress import ProgressCallback, ProgressReporter, ProgressPrinter
+from funowl.converters.structural_index import structural_index, StructuralIndex
 from funowl.dataproperty_expressions import DataPropertyExpression
+from funowl.general_definitions import AbbreviatedIRI
+from funowl.identifiers import IRITable, active_iri_table
 from funowl.literals import TypedLiteral, StringLiteralWithLanguage, StringLiteralNoLanguage
 # Ontology definition
 from funowl.objectproperty_expressions import ObjectPropertyExpression
+from funowl.prefix_declarations import PrefixDeclarations
+from funowl.terminals.TypingHelper import flatten_unions
 
-# 1: Function '('
-function_re = re.compile(rb'\s*([A-Z][A-Za-z]+)\s*\(', flags=re.DOTALL)
-inner_function_re = re.compile(r'\s*([A-Z][A-Za-z]+)\s*\(', flags=re.DOTALL)
+# Number of byte ranges handed to each worker in a parallel parse.  More than one evens out the load
+CHUNKS_PER_WORKER = 4
 
-# 1: Prefix ':=' 2: URI
-#  Note - the official source of this is https://www.w3.org/TR/2013/REC-sparql11-query-20130321/#rPN_PREFIX, but
-#         we're trying to avoid having to encode all the UTF-16 stuff, so we're generalizing here and letting the
-#         n3 parser cover the final bit
-prefix_re = re.compile(r'\s*([^"\']*):\s*=\s*([^"\']*)', flags=re.DOTALL)
-# prefix_re = re.compile(r'\s*([^"]*):\s*=\s*([^"]*)', flags=re.DOTALL)
-
-# nodeId
-blank_node_label_re = re.compile(r'\s*(_:\S*)', flags=re.DOTALL)
-
-# '<' 1:uri '>
-abs_uri = re.compile(r'\s*<([^>]+)>', flags=re.DOTALL)
-abs_uri_b = re.compile(rb'\s*<([^>]+)>', flags=re.DOTALL)
-
-# 1: rel-url
-rel_uri = re.compile(r'\s*((([A-Za-z_])[^(]*?)?:\S+)\s*', flags=re.DOTALL)
-rel_uri_b = re.compile(rb'\s*((([A-Za-z_])[^(]*?)?:\S+)\s*', flags=re.DOTALL)
-
-# 1: literal
-literal_re = re.compile(r'\s*("(?:\\.|[^"\\])*"|\S+)\s*', flags=re.DOTALL)
+ARG_TYPE = Union["OWLFunc", rdflib.Literal, rdflib.URIRef, str]
 
-# 1: lang
-literal_lang = re.compile(r'@(\S+)')
+# Escapes in a lexical form.  Only the line breaks, which a compact writer escapes, are decoded -- the others are kept
+_escape_re = re.compile(r'\\(.)', flags=re.DOTALL)
+_LINE_BREAKS = {'n': '\n', 'r': '\r'}
 
-# 1: datatype
-literal_datatype = re.compile(r'\^\^(\S+)')
 
-# '(' 1:
-nested_re = re.compile(r'\(\s*(.+\s*\))', flags=re.DOTALL)
+class FunctionFilter:
+    """ Select the top level functions in the body of an Ontology by name """
+    def __init__(self, include: Optional[Iterable[Union[str, Type]]] = None,
+                 exclude: Optional[Iterable[Union[str, Type]]] = None) -> None:
+        """
+        :param include: names of the functions to parse (e.g. 'SubClassOf') or the corresponding classes or Unions
+        thereof (e.g. ClassAxiom).  None means all functions
+        :param exclude: names, classes or Unions of the functions to skip
+        """
+        self.include = self._names(include) if include is not None else None
+        self.exclude = self._names(exclude) if exclude is not None else frozenset()
 
-# Trailing paren for ontology
-final_pren = re.compile(rb'\s*\)\s*$', flags=re.DOTALL)
+    @staticmethod
+    def _names(functions: Union[str, Type, Iterable[Union[str, Type]]]) -> FrozenSet[str]:
+        if isinstance(functions, str) or not isinstance(functions, Iterable):
+            functions = [functions]
+        return frozenset(f if isinstance(f, str) else f.__name__ for f in flatten_unions(functions))
 
+    @property
+    def key(self) -> Tuple[Optional[Tuple[str, ...]], Tuple[str, ...]]:
+        """ Canonical description of the filter """
+        return tuple(sorted(self.include)) if self.include is not None else None, tuple(sorted(self.exclude))
 
-# TODO: Where is this defined and how do we deal with different EOL's?
-comments_re = re.compile(r'\s*#[^\n]*\n?', flags=re.DOTALL)
-comments_re_b = re.compile(rb'\s*#[^\n]*\n?', flags=re.DOTALL)
+    def __call__(self, function: str) -> bool:
+        return (self.include is None or function in self.include) and function not in self.exclude
 
 
-ARG_TYPE = Union["OWLFunc", rdflib.Literal, rdflib.URIRef, str]
+def function_filter(include: Optional[Iterable[Union[str, Type]]], exclude: Optional[Iterable[Union[str, Type]]]) \
+        -> Optional[FunctionFilter]:
+    """ Return a filter for include and exclude or None if every function is wanted """
+    return FunctionFilter(include, exclude) if include is not None or exclude else None
 
 
 class OWLFunc:
     def __init__(self, function: str, body: List[Union[ARG_TYPE, List[ARG_TYPE]]]) -> None:
-        self.decl = self.eval(function, body)
+        with trusted():
+            self.decl = self.eval(function, body)
 
     def __str__(self):
         return str(self.decl)
@@ -123,195 +137,697 @@ class OWLFunc:
             raise e
 
 
-def m_rem(m: Match) -> str:
-    """ Return everything that doesn't match """
-    return m.string[m.span()[1]:]
+def lit_parser(token: Token) -> Union[rdflib.Literal, TypedLiteral]:
+    """ Convert a LITERAL token into an rdflib literal (plain or language tagged) or a TypedLiteral """
+    value = token.value
+    if '\\' in value:
+        value = _escape_re.sub(lambda m: _LINE_BREAKS.get(m.group(1), m.group()), value)
+    if token.lang is not None:
+        return rdflib.Literal(value, lang=token.lang)
+    elif token.datatype is not None:
+        datatype = token.datatype
+        return TypedLiteral(value, rdflib.URIRef(datatype[1:-1]) if datatype.startswith('<') else datatype)
+    else:
+        return rdflib.Literal(value)
 
 
-def lit_parser(value: str, rest: str) -> Tuple[rdflib.Literal, str]:
-    if len(value) > 1 and value.startswith('"') and value.endswith('"'):
-        value = value[1:-1]
-    if rest.startswith('@'):
-        m = literal_lang.match(rest)
-        return rdflib.Literal(value, lang=m.group(1)), m_rem(m)
-    elif rest.startswith('^^'):
-        m = literal_datatype.match(rest)
-        return TypedLiteral(value, m.group(1)), m_rem(m)
-    else:
-        return rdflib.Literal(value), rest
+def _prefixed_name(name: str) -> Union[AbbreviatedIRI, str]:
+    """ Pass prefixed names on as AbbreviatedIRIs, so cast can place them by type instead of by pattern matching """
+    table = active_iri_table()
+    try:
+        return AbbreviatedIRI(name) if table is None else table.intern(AbbreviatedIRI, name)
+    except ValueError:
+        return name
+
 
+def _full_iri(iri: str) -> rdflib.URIRef:
+    table = active_iri_table()
+    return rdflib.URIRef(iri) if table is None else table.intern(rdflib.URIRef, iri)
 
-def nested(s: bytes, start: int) -> Tuple[bytes, int]:
+
+def _parse_args(tokens: Iterator[Token], closed: bool = True) -> List[Union[ARG_TYPE, List[ARG_TYPE]]]:
     """
-    Return everything between start and a matching closing parenthesis
-    :param s:
-    :param start:
-    :return:
+    Parse the arguments of a function whose opening token has already been consumed
+
+    :param tokens: token stream positioned just past the function name and opening parenthesis
+    :param closed: True means the argument list must be terminated by a closing parenthesis.  False means that the
+    token stream is just the body of the function
+    :return: arguments split up into functions, urls, literals or lists thereof
     """
-    depth = 1           # Because the function match eats the opening parenthesis
-    i = start
-    in_quotes = False
-    esc = False
-    try:
-        while True:
-            m = s[i:i+1]
-            if in_quotes:
-                if esc:
-                    esc = False
-                elif m == b'\\':
-                    esc = True
-                elif m == b'"':
-                    in_quotes = False
-            elif m == b'(':
-                depth += 1
-            elif m == b')':
-                depth -= 1
-                if depth <= 0:
-                    return s[start:i], i+1
-            elif m == b'"':
-                in_quotes = True
-            i += 1
-    except IndexError:
+    rval = []
+    for token in tokens:
+        typ = token.type
+        if typ == CLOSE:
+            return rval
+        elif typ == FUNCTION:
+            rval.append(OWLFunc(token.value, _parse_args(tokens)))
+        elif typ == PREFIXED_NAME:
+            rval.append(_prefixed_name(token.value))
+        elif typ == NODE_ID or typ == PREFIX_NAME:
+            rval.append(token.value)
+        elif typ == FULL_IRI:
+            rval.append(_full_iri(token.value))
+        elif typ == LITERAL:
+            rval.append(lit_parser(token))
+        elif typ == OPEN:
+            # The nasty little HasKey parenthesis bit:
+            #   '(' { ObjectPropertyExpression } ')' '(' { DataPropertyExpression } ')'
+            rval.extend([ObjectPropertyExpression(OWLFunc._eval_body(e)) for e in _parse_args(tokens)])
+            token = next(tokens, None)
+            if token is None or token.type != OPEN:
+                raise ValueError(f"HasKey DataPropertyExpressions clause missing: {token}")
+            rval.extend([DataPropertyExpression(OWLFunc._eval_body(e)) for e in _parse_args(tokens)])
+        else:
+            raise ValueError(f"Unrecognized content: {token}")
+    if closed:
         raise ValueError("Parenthesis mismatch")
+    return rval
 
 
-def uri_matcher(unparsed: Union[str, bytes], start: int) -> Tuple[Optional[rdflib.URIRef], int]:
-    if isinstance(unparsed, (bytes, mmap)):
-        m = abs_uri_b.match(unparsed, start)
-        if m:
-            return rdflib.URIRef(m.group(1).decode()), m.span()[1]
-        m = rel_uri_b.match(unparsed, start)
-        if m:
-            return rdflib.URIRef(m.group(1).decode()), m.span()[1]
-        return None, start
-    else:
-        m = abs_uri.match(unparsed, start)
-        if m:
-            return rdflib.URIRef(m.group(1)), m.span()[1]
-        m = rel_uri.match(unparsed, start)
-        if m:
-            return m.group(1), m.span()[1]
-        return None, start
-
-
-def parse_args(s: str) -> List[Union[ARG_TYPE, List[ARG_TYPE]]]:
+def parse_args(s: Union[str, bytes]) -> List[Union[ARG_TYPE, List[ARG_TYPE]]]:
     """
     Parse an argument list to a function
 
     :param s: everything between the parenthesis
     :return: arguments split up into functions, urls, literals or lists thereof
     """
-    rval = []
-    unparsed = s
-    while unparsed:
-        unparsed = unparsed[skip_comments(unparsed, 0):]
-        m = prefix_re.match(unparsed)
-        if m:
-            rval.append(m.group(1))
-            rval.extend(parse_args(m.group(2)))
-            unparsed = unparsed[m.span()[1]:]
-            continue
-        m = inner_function_re.match(unparsed)
-        if m:
-            body = bytes(m_rem(m), encoding='utf8')
-            args, pos = nested(body, 0)
-            unparsed = body[pos:].decode()
-            rval.append(OWLFunc(m.group(1), parse_args(args.decode())))
-            continue
-        m = blank_node_label_re.match(unparsed)
-        if m:
-            rval.append(m.group(1))
-            unparsed = unparsed[m.span()[1]:]
-            continue
-        uri, pos = uri_matcher(unparsed, 0)
-        if uri:
-            rval.append(uri)
-            unparsed = unparsed[pos:]
-            continue
-        # The nasty little HasKey parenthesis bit
-        unparsed = unparsed.strip()
-        m = nested_re.match(unparsed)
-        if m:
-            body = bytes(m.group(1).strip(), encoding='utf8')
-            args, pos = nested(body, 0)
-            opes = parse_args(args.decode())
-            unparsed = body[pos:].decode().strip()
-            rval.extend([ObjectPropertyExpression(e) for e in opes])
-            m = nested_re.match(unparsed)
-            if not m:
-                raise ValueError(f"HasKey DataPropertyExpressions clause missing: {unparsed}")
-            body = bytes(m.group(1).strip(), encoding='utf8')
-            args, pos = nested(body, 0)
-            opes = parse_args(args.decode())
-            unparsed = body[pos:].decode().strip()
-            rval.extend([DataPropertyExpression(e) for e in opes])
-            continue
-        m = literal_re.match(unparsed)
-        if m:
-            lit, unparsed = lit_parser(m.group(1), m_rem(m))
-            rval.append(lit)
-            continue
-        if unparsed:
-            raise ValueError(f"Unrecognized content: {unparsed[:20]}")
+    return _parse_args(tokenize(s if isinstance(s, bytes) else bytes(s, encoding='utf8')), closed=False)
 
-    return rval
 
+def _parse_ontology_header(tokens: Iterator[Token]) -> Tuple[Ontology, Optional[Token]]:
+    """
+    Parse the optional ontology and version IRIs that follow 'Ontology('
 
-def skip_comments(inp: Union[bytes, str], start: int) -> int:
-    if isinstance(inp, (bytes, mmap)):
-        m = comments_re_b.match(inp, start)
-        while m:
-            start = m.span()[1]
-            m = comments_re_b.match(inp, start)
-    else:
-        m = comments_re.match(inp, start)
-        while m:
-            start = m.span()[1]
-            m = comments_re.match(inp, start)
-    return start
+    :param tokens: token stream positioned just past the Ontology function token
+    :return: Ontology with iri and version filled in and the first token of the Ontology body
+    """
+    o = Ontology()
+    token = next(tokens, None)
+    if token is not None and token.type in (FULL_IRI, PREFIXED_NAME):
+        o.iri = rdflib.URIRef(token.value) if token.type == FULL_IRI else token.value
+        token = next(tokens, None)
+        if token is not None and token.type in (FULL_IRI, PREFIXED_NAME):
+            o.version = rdflib.URIRef(token.value) if token.type == FULL_IRI else token.value
+            token = next(tokens, None)
+    return o, token
+
+
+def _parse_lazily(function: str) -> bool:
+    """ Determine whether function can be left unparsed in a lazy parse.  Imports, ontology annotations and anything
+    that won't parse anyway are processed immediately """
+    return function not in ('Import', 'Annotation') and getattr(funowl, function, None) is not None
+
+
+def _parse_body_lazily(inp: Union[bytes, mmap], ontology: Token, token: Optional[Token], tokens: Iterator[Token],
+                       progress: Optional[ProgressReporter] = None, wanted: Optional[FunctionFilter] = None) \
+        -> Generator[Union[FunOwlBase, LazyAxiom], None, int]:
+    """
+    Yield a LazyAxiom for each axiom in the body of the Ontology.  Axiom boundaries come from the structural index
+    when it is available, so the axioms themselves are never tokenized.
+
+    :param inp: input byte stream
+    :param ontology: the 'Ontology(' token
+    :param token: first token of the Ontology body
+    :param tokens: token stream positioned just past token
+    :param progress: progress reporter, if any
+    :param wanted: filter that selects the functions to load.  The others are dropped
+    :return: final position
+    """
+    body = _index_body(inp, ontology, token)
+    if body is not None:
+        index, body_end = body
+        spans = index.axiom_spans(token.start, body_end)
+        for span_start, span_end in spans:
+            span_tokens = tokenize(inp, span_start, span_end)
+            token = next(span_tokens)
+            if token.type != FUNCTION:
+                raise ValueError("Missing final parenthesis")
+            keep = wanted is None or wanted(token.value)
+            if not keep:
+                pass
+            elif _parse_lazily(token.value):
+                yield LazyAxiom(token.value, inp, token.start, span_end)
+            else:
+                yield OWLFunc(token.value, _parse_args(span_tokens)).decl
+            if progress is not None:
+                progress.update(span_end, int(keep))
+        _check_body_end(inp, spans, body_end)
+        return body_end + 1
+
+    while token is not None and token.type == FUNCTION:
+        keep = wanted is None or wanted(token.value)
+        if not keep:
+            skip_function(tokens)
+        elif _parse_lazily(token.value):
+            yield LazyAxiom(token.value, inp, token.start, skip_function(tokens).end)
+        else:
+            yield OWLFunc(token.value, _parse_args(tokens)).decl
+        token = next(tokens, None)
+        if progress is not None:
+            progress.update(token.start if token is not None else len(inp), int(keep))
+    if token is None or token.type != CLOSE:
+        raise ValueError("Missing final parenthesis")
+    return token.end
+
+
+def _parse_body(inp: Union[bytes, mmap], token: Optional[Token], tokens: Iterator[Token],
+                progress: Optional[ProgressReporter] = None, diagnostics: Optional[List[ParseDiagnostic]] = None,
+                balanced: bool = False, wanted: Optional[FunctionFilter] = None) \
+        -> Generator[FunOwlBase, None, Optional[Token]]:
+    """
+    Parse the run of top level functions that starts with token
 
+    :param inp: input byte stream
+    :param token: first token of the run
+    :param tokens: token stream positioned just past token
+    :param progress: progress reporter, if any
+    :param diagnostics: None means raise on the first function that fails to parse.  Otherwise each failure is
+    recorded in diagnostics and parsing resumes after the failing function
+    :param balanced: True means the parenthesis of every function in inp are known to balance
+    :param wanted: filter that selects the functions to parse.  The others are skipped by matching parenthesis
+    :return: the token following the run
+    """
+    lines = LineCounter(inp) if diagnostics is not None else None
+    while token is not None and token.type == FUNCTION:
+        keep = wanted is None or wanted(token.value)
+        if diagnostics is None:
+            if keep:
+                yield OWLFunc(token.value, _parse_args(tokens)).decl
+            else:
+                skip_function(tokens)
+        else:
+            try:
+                decl = OWLFunc(token.value, _parse_args(tokens)).decl if keep else skip_function(tokens)
+            except Exception as e:
+                resume = resume_offset(inp, token.start, balanced)
+                diagnostics.append(ParseDiagnostic(token.start, lines.line(token.start), token.value, e, resume))
+                tokens = tokenize(inp, resume)
+                keep = False
+            if keep:
+                yield decl
+        token = next(tokens, None)
+        if progress is not None:
+            progress.update(token.start if token is not None else len(inp), int(keep))
+    return token
+
+
+def _selected_tokens(inp: Union[bytes, mmap], ontology: Token, token: Optional[Token], wanted: FunctionFilter) \
+        -> Optional[Tuple[Optional[Token], Iterator[Token]]]:
+    """
+    Use the structural index to build a token stream for the body of the Ontology that leaves out the unwanted
+    functions without tokenizing them
 
-def fparse(inp: bytes, start: int, consumer: Callable[[FunOwlBase], None], print_progress: bool = True) -> int:
+    :param inp: input byte stream
+    :param ontology: the 'Ontology(' token
+    :param token: first token of the Ontology body
+    :param wanted: filter that selects the functions to keep
+    :return: first token and the remainder of the stream or None if inp can't be indexed
     """
-    Functional parser - work through inp pulling complete functions out and processing them.
+    body = _index_body(inp, ontology, token)
+    if body is None:
+        return None
+    index, body_end = body
+    spans = index.axiom_spans(token.start, body_end)
+    if spans:
+        _check_body_end(inp, spans, body_end)
+
+    def selected() -> Iterator[Token]:
+        for span_start, span_end in spans:
+            span_tokens = tokenize(inp, span_start, span_end)
+            first = next(span_tokens)
+            if first.type != FUNCTION or wanted(first.value):
+                yield first
+                yield from span_tokens
+        yield from tokenize(inp, body_end)
+
+    tokens = selected()
+    return next(tokens, None), tokens
+
+
+def _check_trailer(inp: Union[bytes, mmap], end: int, diagnostics: Optional[List[ParseDiagnostic]] = None,
+                   base: int = 0) -> bool:
+    """
+    Make sure that nothing but whitespace and comments follows the Ontology.  Anything else (e.g. the rest of the body
+    after an extra closing parenthesis) would otherwise be dropped without a word
+
+    :param inp: input byte stream
+    :param end: offset following the closing parenthesis of the Ontology
+    :param diagnostics: None means raise an error.  Otherwise the trailing content is recorded here
+    :param base: offset of inp in the document (for the error message)
+    :return: True if there is trailing content
+    """
+    trailer = trailer_end(inp, end)
+    if trailer == len(inp):
+        return False
+    error = ValueError(f"Unexpected content after the end of the Ontology at offset {base + trailer}")
+    if diagnostics is None:
+        raise error
+    content = inp[trailer:trailer + 40].split(maxsplit=1)[0].decode(errors='replace')
+    diagnostics.append(ParseDiagnostic(trailer, LineCounter(inp).line(trailer), content, error, len(inp)))
+    return True
+
+
+def _parse_document(inp: Union[bytes, mmap], start: int, lazy: bool = False,
+                    progress: Optional[ProgressReporter] = None, diagnostics: Optional[List[ParseDiagnostic]] = None,
+                    wanted: Optional[FunctionFilter] = None) -> Generator[Union[FunOwlBase, LazyAxiom], None, int]:
+    """
+    Generator behind fparse and iter_axioms.  Yields each top level function (prefix declarations), then an empty
+    Ontology carrying the ontology and version IRIs, then every element in the body of the Ontology.  Nothing is
+    retained once it has been yielded.
+
     :param inp: input byte stream
     :param start: current 0 based position in the stream
-    :param consumer: OWLFunc entry consumer
-    :param print_progress: Print conversion progress indicator on command line
+    :param lazy: True means yield the axioms as unparsed LazyAxioms
+    :param progress: progress reporter, if any
+    :param diagnostics: if present, the axioms that fail to parse are recorded here and skipped (see _parse_body)
+    :param wanted: filter that selects the functions in the body of the Ontology to parse
     :return: final position
     """
-    while True:
-        start = skip_comments(inp, start)
-        m = function_re.match(inp, start)
-        if not m:
-            break
-        func = m.group(1).decode()
-        start = m.span()[1]
+    tokens = tokenize(inp, start)
+    for token in tokens:
+        if token.type != FUNCTION:
+            return token.start
 
         # Don't try to pre-parse the arguments for an Ontology
-        if func == "Ontology":
-            o = Ontology()
-            start = skip_comments(inp, start)
-            uri, start = uri_matcher(inp, start)
-            if uri:
-                o.iri = uri
-                start = skip_comments(inp, start)
-                vers, start = uri_matcher(inp, start)
-                if vers:
-                    o.version = vers
-            start = skip_comments(inp, start)
-            start = fparse(inp, start, lambda f: o.add_arg(f, print_progress=print_progress))
-            consumer(o)
-            start = skip_comments(inp, start)
-            m = final_pren.match(inp, start)
-            if not m:
+        if token.value == "Ontology":
+            ontology = token
+            o, token = _parse_ontology_header(tokens)
+            yield o
+            if lazy:
+                end = yield from _parse_body_lazily(inp, ontology, token, tokens, progress, wanted)
+                _check_trailer(inp, end, diagnostics)
+                return end
+            if wanted is not None:
+                selected = _selected_tokens(inp, ontology, token, wanted)
+                if selected is not None:
+                    token, tokens = selected
+            token = yield from _parse_body(inp, token, tokens, progress, diagnostics, wanted=wanted)
+            if token is None or token.type != CLOSE:
                 raise ValueError("Missing final parenthesis")
-            break
+            _check_trailer(inp, token.end, diagnostics)
+            return token.end
         else:
-            body, start = nested(inp, start)
-            consumer(OWLFunc(m.group(1).decode(), parse_args(body.decode())).decl)
+            yield OWLFunc(token.value, _parse_args(tokens)).decl
 
-    return start
+    return len(inp)
+
+
+def fparse(inp: bytes, start: int, consumer: Callable[[FunOwlBase], None], print_progress: bool = True,
+           lazy: bool = False, iri_table: Optional[IRITable] = None, progress: Optional[ProgressCallback] = None,
+           strict: bool = True, expression_table: Optional[ExpressionTable] = None,
+           diagnostics: Optional[List[ParseDiagnostic]] = None,
+           include: Optional[Iterable[Union[str, Type]]] = None, exclude: Optional[Iterable[Union[str, Type]]] = None) \
+        -> int:
+    """
+    Functional parser - work through inp pulling complete functions out and processing them.
+    :param inp: input byte stream
+    :param start: current 0 based position in the stream
+    :param consumer: OWLFunc entry consumer.  The Ontology is passed once it is complete
+    :param print_progress: Print conversion progress indicator on command line.  Ignored if progress is supplied
+    :param lazy: True means load the Ontology axioms as LazyAxioms, which are parsed on first use
+    :param iri_table: table that the IRIs are interned in.  If omitted, IRIs aren't interned
+    :param expression_table: table that the class expressions and data ranges are shared through.  If omitted,
+    expressions aren't shared
+    :param progress: function that is periodically passed a Progress report
+    :param strict: False means skip the axioms that fail to parse instead of raising an error
+    :param diagnostics: where to record the axioms that were skipped in a non-strict parse
+    :param include: names (or classes) of the functions in the body of the Ontology to parse.  Default: all
+    :param exclude: names (or classes) of the functions in the body of the Ontology to skip
+    :return: final position
+    """
+    reporter = _progress_reporter(inp, print_progress, progress)
+    diagnostics = _diagnostics_list(strict, diagnostics)
+    ontology: Optional[Ontology] = None
+    elements = _parse_document(inp, start, lazy, reporter, diagnostics, function_filter(include, exclude))
+    with _active_tables(iri_table, expression_table):
+        while True:
+            try:
+                e = next(elements)
+            except StopIteration as stop:
+                if reporter is not None:
+                    reporter.finish(stop.value)
+                _log_diagnostics(diagnostics)
+                if ontology is not None:
+                    consumer(ontology)
+                return stop.value
+            if ontology is not None:
+                ontology.add_arg(e)
+            elif isinstance(e, Ontology):
+                ontology = e
+            else:
+                consumer(e)
+
+
+def _parse_stream(stream: IO[bytes], progress: Optional[ProgressReporter] = None,
+                  diagnostics: Optional[List[ParseDiagnostic]] = None, wanted: Optional[FunctionFilter] = None) \
+        -> Generator[FunOwlBase, None, int]:
+    """
+    Version of _parse_document for a decompressed stream.  The stream is parsed one window at a time, so the
+    decompressed text is never held in memory as a whole.  Diagnostic offsets refer to the decompressed text.
+
+    :param stream: decompressed stream
+    :param progress: progress reporter, if any.  It has to supply its own position, as offsets within a window don't
+    say how far the parse has come
+    :param diagnostics: if present, the axioms that fail to parse are recorded here and skipped
+    :param wanted: filter that selects the functions in the body of the Ontology to parse
+    :return: final position in the decompressed text
+    """
+    in_body = False
+    line = 1
+    length = 0
+    end = None
+    trailing = False
+    for offset, window, complete in windows(stream):
+        window_diagnostics = [] if diagnostics is not None else None
+        if end is not None:
+            # Past the end of the Ontology
+            trailing = _check_trailer(window, 0, window_diagnostics, offset)
+            token = None
+        else:
+            tokens = tokenize(window)
+            token = next(tokens, None)
+        while token is not None:
+            if in_body:
+                token = yield from _parse_body(window, token, tokens, progress, window_diagnostics, complete, wanted)
+                if token is not None:
+                    if token.type != CLOSE:
+                        raise ValueError("Missing final parenthesis")
+                    end = offset + token.end
+                    trailing = _check_trailer(window, token.end, window_diagnostics, offset)
+                break
+            if token.type != FUNCTION:
+                return offset + token.start
+            if token.value == "Ontology":
+                o, token = _parse_ontology_header(tokens)
+                in_body = True
+                yield o
+            else:
+                yield OWLFunc(token.value, _parse_args(tokens)).decl
+                token = next(tokens, None)
+        if window_diagnostics:
+            lines = LineCounter(window)
+            diagnostics += [replace(d, offset=offset + d.offset, line=line + lines.line(d.offset) - 1,
+                                    resumed_at=offset + d.resumed_at) for d in window_diagnostics]
+        if trailing:
+            return end
+        line += window.count(b'\n')
+        length = offset + len(window)
+    if end is not None:
+        return end
+    if in_body:
+        raise ValueError("Missing final parenthesis")
+    return length
+
+
+def _progress_reporter(inp: Union[bytes, mmap], print_progress: bool, progress: Optional[ProgressCallback],
+                       position: Optional[Callable[[], int]] = None) -> Optional[ProgressReporter]:
+    """ Create a reporter for progress, falling back to a status line if print_progress is set """
+    if progress is None and print_progress:
+        progress = ProgressPrinter()
+    return ProgressReporter(progress, len(inp), position=position) if progress is not None else None
+
+
+def _diagnostics_list(strict: bool, diagnostics: Optional[List[ParseDiagnostic]]) -> Optional[List[ParseDiagnostic]]:
+    """ Return the list that a non-strict parse records its diagnostics in or None for a strict parse """
+    if strict:
+        return None
+    return diagnostics if diagnostics is not None else []
+
+
+def _log_diagnostics(diagnostics: Optional[List[ParseDiagnostic]]) -> None:
+    if diagnostics:
+        for diagnostic in diagnostics:
+            logging.warning(str(diagnostic))
+        logging.warning(f"{len(diagnostics)} axiom(s) could not be parsed and were skipped")
+
+
+def _init_worker(prefixes: List[Prefix]) -> None:
+    """ Process pool initializer -- share the prefix declarations of the document with each worker """
+    prefix_declarations = PrefixDeclarations()
+    for prefix in prefixes:
+        prefix_declarations.append(prefix)
+    IRI.prefix_declarations = prefix_declarations
+
+
+@contextmanager
+def _active_tables(iri_table: Optional[IRITable], expression_table: Optional[ExpressionTable]) -> Iterator[None]:
+    """ Intern IRIs and share expressions in whichever of the tables are given for the duration of the context """
+    with ExitStack() as tables:
+        if iri_table is not None:
+            tables.enter_context(iri_table.active())
+        if expression_table is not None:
+            tables.enter_context(expression_table.active())
+        yield
+
+
+def _parse_chunk(chunk: bytes, strict: bool = True, wanted: Optional[FunctionFilter] = None,
+                 share_iris: bool = True, share_expressions: bool = True) \
+        -> Tuple[List[FunOwlBase], List[ParseDiagnostic]]:
+    """ Process pool worker -- parse a run of complete top level functions.  Diagnostic offsets and line numbers are
+    relative to the chunk.  IRIs and expressions are shared within the chunk if the parse that it belongs to shares
+    them -- see _adopt """
+    tokens = tokenize(chunk)
+    diagnostics = _diagnostics_list(strict, None)
+    rval = []
+    with _active_tables(IRITable() if share_iris else None, ExpressionTable() if share_expressions else None):
+        elements = _parse_body(chunk, next(tokens, None), tokens, diagnostics=diagnostics, balanced=True, wanted=wanted)
+        while True:
+            try:
+                rval.append(next(elements))
+            except StopIteration as stop:
+                if stop.value is not None:
+                    raise ValueError("Missing final parenthesis")
+                break
+    return rval, diagnostics or []
+
+
+def _adopt(v: Any, iri_table: Optional[IRITable], expression_table: Optional[ExpressionTable],
+           memo: Dict[int, Any]) -> Any:
+    """
+    Move v, an element that was parsed in a worker process or loaded from the parse cache, into the IRI and expression
+    tables of the parse.  A worker's own tables only reach across its chunk, so the IRIs and expressions of different
+    chunks are only shared once they have been adopted
+
+    :param v: element or field value
+    :param iri_table: table of the parse, if any
+    :param expression_table: table of the parse, if any
+    :param memo: values that have already been adopted, by id
+    :return: shared form of v
+    """
+    rval = memo.get(id(v))
+    if rval is not None:
+        return rval
+    typ = type(v)
+    rval = v
+    if typ is AbbreviatedIRI or typ is rdflib.URIRef:
+        if iri_table is not None:
+            rval = iri_table.intern(typ, v)
+    elif typ is tuple:
+        rval = tuple(_adopt(e, iri_table, expression_table, memo) for e in v)
+    elif isinstance(v, UserList):
+        v.data[:] = [_adopt(e, iri_table, expression_table, memo) for e in v.data]
+    elif isinstance(v, list):
+        # Bypasses FrozenList, whose elements are about to be shared as well
+        list.__setitem__(v, slice(None), [_adopt(e, iri_table, expression_table, memo) for e in v])
+    elif IRI in typ.__mro__:
+        if iri_table is not None:
+            rval = iri_table.intern(typ, _adopt(v.v, iri_table, expression_table, memo))
+    elif FunOwlRoot in typ.__mro__:
+        for name in class_metadata(typ).fields:
+            object.__setattr__(v, name, _adopt(getattr(v, name), iri_table, expression_table, memo))
+        if expression_table is not None and SharedExpression in typ.__mro__:
+            rval = expression_table.adopt(v)
+    memo[id(v)] = rval
+    return rval
+
+
+def _index_body(inp: Union[bytes, mmap], ontology: Token, token: Optional[Token]) \
+        -> Optional[Tuple[StructuralIndex, int]]:
+    """
+    Build the structural index of inp and check that it agrees with the token stream on where the Ontology body begins
+
+    :param inp: input byte stream
+    :param ontology: the 'Ontology(' token
+    :param token: first token of the Ontology body
+    :return: index and offset of the closing parenthesis of the Ontology or None if inp can't be indexed
+    """
+    if token is None or token.type != FUNCTION:
+        return None
+    index = structural_index(inp)
+    if index is None:
+        return None
+    try:
+        index.closing(token.end - 1)
+        return index, index.closing(ontology.end - 1)
+    except ValueError:
+        return None
+
+
+def _check_body_end(inp: Union[bytes, mmap], spans: List[Tuple[int, int]], body_end: int) -> None:
+    """ Make sure that nothing but the closing parenthesis of the Ontology follows the last span """
+    trailer = next(tokenize(inp, spans[-1][1]), None)
+    if trailer is None or trailer.type != CLOSE or trailer.start != body_end:
+        raise ValueError("Missing final parenthesis")
+
+
+def _indexed_chunks(inp: Union[bytes, mmap], ontology: Token, token: Optional[Token], nchunks: int) \
+        -> Optional[List[Tuple[int, int]]]:
+    """
+    Split the body of the Ontology into byte ranges using the structural index of inp
+
+    :param inp: input byte stream
+    :param ontology: the 'Ontology(' token
+    :param token: first token of the Ontology body
+    :param nchunks: number of ranges to split the body into
+    :return: list of (start, end) offsets or None if inp can't be indexed
+    """
+    body = _index_body(inp, ontology, token)
+    if body is None:
+        return None
+    index, body_end = body
+    chunks = index.axiom_chunks(nchunks, token.start, body_end)
+    if not chunks:
+        return None
+    _check_body_end(inp, chunks, body_end)
+    return chunks
+
+
+def _parse_document_parallel(inp: Union[bytes, mmap], workers: int, progress: Optional[ProgressReporter] = None,
+                             diagnostics: Optional[List[ParseDiagnostic]] = None,
+                             wanted: Optional[FunctionFilter] = None) -> Iterator[FunOwlBase]:
+    """
+    Parallel version of _parse_document.  The body of the Ontology is split at top level function boundaries into
+    byte ranges that are parsed in a process pool.  Results are yielded in document order.
+
+    The boundaries come from the structural index when NumPy is available.  Otherwise the body is scanned token by
+    token and each range is submitted as soon as it is found -- except in a non-strict parse, where a body that can't
+    be indexed is parsed sequentially.
+
+    :param inp: input byte stream
+    :param workers: number of worker processes
+    :param progress: progress reporter, if any
+    :param diagnostics: if present, the axioms that fail to parse are recorded here and skipped
+    :param wanted: filter that selects the functions in the body of the Ontology to parse
+    :return: element generator
+    """
+    strict = diagnostics is None
+    lines = LineCounter(inp)
+    iri_table = active_iri_table()
+    expression_table = active_expression_table()
+
+    def submit(chunk_start: int, chunk_end: int) -> Tuple[int, int, Future]:
+        return chunk_start, chunk_end, executor.submit(_parse_chunk, inp[chunk_start:chunk_end], strict, wanted,
+                                                       iri_table is not None, expression_table is not None)
+
+    def results(chunk_start: int, chunk_end: int, future: Future) -> Iterator[FunOwlBase]:
+        elements, chunk_diagnostics = future.result()
+        if iri_table is not None or expression_table is not None:
+            memo = {}
+            elements = [_adopt(e, iri_table, expression_table, memo) for e in elements]
+        yield from elements
+        for d in chunk_diagnostics:
+            offset = chunk_start + d.offset
+            diagnostics.append(replace(d, offset=offset, line=lines.line(offset),
+                                       resumed_at=chunk_start + d.resumed_at))
+        if progress is not None:
+            progress.update(chunk_end, len(elements))
+
+    tokens = tokenize(inp)
+    prefixes: List[Prefix] = []
+    for token in tokens:
+        if token.type != FUNCTION:
+            return
+        if token.value != "Ontology":
+            e = OWLFunc(token.value, _parse_args(tokens)).decl
+            if isinstance(e, Prefix):
+                prefixes.append(e)
+            yield e
+            continue
+
+        ontology = token
+        o, token = _parse_ontology_header(tokens)
+        yield o
+        chunks = _indexed_chunks(inp, ontology, token, workers * CHUNKS_PER_WORKER)
+        if chunks is None and not strict:
+            # The body can only be split up if its parenthesis balance.  Recover from any errors sequentially
+            token = yield from _parse_body(inp, token, tokens, progress, diagnostics, wanted=wanted)
+            if token is None or token.type != CLOSE:
+                raise ValueError("Missing final parenthesis")
+            _check_trailer(inp, token.end, diagnostics)
+            return
+        if chunks is not None:
+            _check_trailer(inp, next(tokenize(inp, chunks[-1][1])).end, diagnostics)
+        chunk_size = max(len(inp) // (workers * CHUNKS_PER_WORKER), 1)
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(prefixes,)) as executor:
+            pending = deque()
+            if chunks is not None:
+                for chunk_start, chunk_end in chunks:
+                    pending.append(submit(chunk_start, chunk_end))
+            else:
+                chunk_start = chunk_end = None
+                while token is not None and token.type == FUNCTION:
+                    if chunk_start is None:
+                        chunk_start = token.start
+                    chunk_end = skip_function(tokens).end
+                    if chunk_end - chunk_start >= chunk_size:
+                        pending.append(submit(chunk_start, chunk_end))
+                        chunk_start = None
+                        while pending[0][2].done():
+                            yield from results(*pending.popleft())
+                    token = next(tokens, None)
+                if chunk_start is not None:
+                    pending.append(submit(chunk_start, chunk_end))
+                if token is None or token.type != CLOSE:
+                    raise ValueError("Missing final parenthesis")
+                _check_trailer(inp, token.end, diagnostics)
+            while pending:
+                yield from results(*pending.popleft())
+        return
+
+
+def iter_axioms(defn: Union[str, bytes, IO], workers: int = 1, lazy: bool = False,
+                progress: Optional[ProgressCallback] = None, strict: bool = True,
+                diagnostics: Optional[List[ParseDiagnostic]] = None,
+                include: Optional[Iterable[Union[str, Type]]] = None,
+                exclude: Optional[Iterable[Union[str, Type]]] = None) -> Iterator[Union[FunOwlBase, LazyAxiom]]:
+    """
+    Stream the functional syntax in defn one element at a time, without ever building a complete Ontology.
+
+    Elements are yielded in document order: the Prefix declarations, an empty Ontology that carries the ontology and
+    version IRIs, and then the Imports, Annotations and Axioms from the body of the Ontology.
+
+    gzip, bzip2 and xz compressed input is decompressed on the fly.  Compressed input is always parsed sequentially
+    and eagerly (workers and lazy are ignored), as there is no decompressed buffer to split up or refer back to.
+    :param defn: The ontology definition
+    :param workers: Number of processes to use when parsing the body of the Ontology.  Ignored if lazy is True
+    :param lazy: True means yield the axioms as LazyAxioms, which hold their span in the input and are parsed on
+    first use
+    :param progress: function that is periodically passed a Progress report (see funowl.converters.progress)
+    :param strict: False means skip the axioms that fail to parse instead of raising an error.  Lazily loaded axioms
+    are only parsed when they are used, so their errors surface then
+    :param diagnostics: where to record the axioms that were skipped in a non-strict parse
+    :param include: names (e.g. 'SubClassOf') or classes (e.g. SubClassOf, ClassAxiom) of the functions in the body of
+    the Ontology to parse.  Default: all of them.  The prefix declarations and the Ontology header are always parsed
+    :param exclude: names or classes of the functions in the body of the Ontology to skip.  Skipped functions are
+    passed over by matching parenthesis -- their arguments are never parsed
+    :return: element generator
+    """
+    inp = to_bytes_array(defn)
+    compressed = open_compressed(inp)
+    reporter = _progress_reporter(inp, False, progress, compressed[1].tell if compressed else None)
+    diagnostics = _diagnostics_list(strict, diagnostics)
+    wanted = function_filter(include, exclude)
+    if compressed:
+        with compressed[0] as stream:
+            end = yield from _parse_stream(stream, reporter, diagnostics, wanted)
+    elif workers > 1 and not lazy:
+        yield from _parse_document_parallel(inp, workers, reporter, diagnostics, wanted)
+        end = len(inp)
+    else:
+        end = yield from _parse_document(inp, 0, lazy, reporter, diagnostics, wanted)
+    if reporter is not None:
+        reporter.finish(end)
+    _log_diagnostics(diagnostics)
 
 
 def to_bytes_array(defn: Union[str, bytes, IO]) -> Union[bytes, mmap]:
@@ -337,21 +853,66 @@ def to_bytes_array(defn: Union[str, bytes, IO]) -> Union[bytes, mmap]:
             return mmap(f.fileno(), 0, access=ACCESS_READ)
 
 
-def to_python(defn: Union[str, bytes, IO], print_progress: bool = True) -> Optional[OntologyDocument]:
+def to_python(defn: Union[str, bytes, IO], print_progress: bool = True, workers: int = 1, lazy: bool = False,
+              cache_dir: Optional[Union[str, ParseCache]] = None, iri_table: Optional[IRITable] = None,
+              progress: Optional[ProgressCallback] = None, strict: bool = True,
+              diagnostics: Optional[List[ParseDiagnostic]] = None, include: Optional[Iterable[Union[str, Type]]] = None,
+              exclude: Optional[Iterable[Union[str, Type]]] = None,
+              expression_table: Optional[ExpressionTable] = None) -> Optional[OntologyDocument]:
     """
     Convert the functional syntax in defn to a Python representation
-    :param defn: The ontology definition
-    :param print_progress: Print progress indicator on command line
+    :param defn: The ontology definition.  May be gzip, bzip2 or xz compressed -- see iter_axioms
+    :param print_progress: Print progress indicator on command line.  Ignored if progress is supplied
+    :param workers: Number of processes to use when parsing the body of the Ontology
+    :param lazy: True means load the axioms as LazyAxioms.  Each axiom is parsed the first time it is accessed,
+    serialized or converted to RDF.  Use Ontology.axioms_of_type to select axioms without parsing them
+    :param cache_dir: Directory of the parse cache or a ParseCache with custom limits.  The parsed document is loaded
+    from the cache if the source hasn't changed since it was stored.  Otherwise it is parsed and stored (a lazily
+    loaded document is fully parsed when it is stored).  URLs and open files are never cached.  A document that is
+    loaded from the cache is moved into iri_table and expression_table, if given, as if it had just been parsed
+    :param iri_table: table that the IRIs are interned in, so that each IRI is held in memory once.  If omitted, IRIs
+    aren't interned.  Interned IRIs can't be modified in place -- use copy.copy to get one that can (see IRITable)
+    :param progress: function that is passed a Progress report (bytes read, total bytes, axioms parsed, elapsed
+    time, axioms per second) at most every DEFAULT_INTERVAL seconds while parsing, and once more at the end
+    :param strict: False means that an axiom that fails to parse is skipped and parsing carries on with the next one.
+    Each skipped axiom is logged and recorded as a ParseDiagnostic.  Documents with skipped axioms aren't cached
+    :param diagnostics: where to record the axioms that were skipped in a non-strict parse
+    :param include: names or classes of the axioms (and Import or Annotation) to load.  Default: all of them
+    :param exclude: names or classes of the axioms to leave out.  Functions that are left out are skipped without
+    parsing their arguments, so a targeted load is many times faster than a full one
+    :param expression_table: table that the class expressions and data ranges are shared through, so that each
+    distinct expression is held in memory once.  If omitted, expressions aren't shared.  Shared expressions and their
+    lists can't be modified in place -- use copy.copy to get one that can (see ExpressionTable)
     :return: Ontology Document
     """
-    def consumer(e: FunOwlBase) -> None:
-        if isinstance(e, funowl.Prefix):
-            ontology_doc.prefixDeclarations.append(e)
-        elif isinstance(e, funowl.Ontology):
-            ontology_doc.ontology = e
-        else:
-            logging.error("Unrecognized declaration")
+    wanted = function_filter(include, exclude)
+    cache = ParseCache(cache_dir) if isinstance(cache_dir, str) else cache_dir
+    entry = cache.entry(defn, wanted.key if wanted is not None else None) if cache is not None else None
+    if entry is not None:
+        ontology_doc = cache.load(*entry)
+        if ontology_doc is not None:
+            # Only documents that were parsed without diagnostics are stored, so there are none to replay
+            if iri_table is not None or expression_table is not None:
+                _adopt(ontology_doc, iri_table, expression_table, {})
+            return ontology_doc
 
     ontology_doc = OntologyDocument()
-    fparse(to_bytes_array(defn), 0, consumer, print_progress=print_progress)
+    diagnostics = _diagnostics_list(strict, diagnostics)
+    ndiagnostics = len(diagnostics) if diagnostics is not None else 0
+    ontology: Optional[Ontology] = None
+    if progress is None and print_progress:
+        progress = ProgressPrinter()
+    with _active_tables(iri_table, expression_table):
+        for e in iter_axioms(defn, workers=workers, lazy=lazy, progress=progress, strict=strict,
+                             diagnostics=diagnostics, include=include, exclude=exclude):
+            if ontology is not None:
+                ontology.add_arg(e)
+            elif isinstance(e, funowl.Prefix):
+                ontology_doc.prefixDeclarations.append(e)
+            elif isinstance(e, funowl.Ontology):
+                ontology = ontology_doc.ontology = e
+            else:
+                logging.error("Unrecognized declaration")
+    if entry is not None and (diagnostics is None or len(diagnostics) == ndiagnostics):
+        cache.store(*entry, ontology_doc)
     return ontology_doc
@@ -0,0 +1,141 @@
+"""
+Single pass tokenizer for OWL Functional Syntax.
+
+The lexer walks a bytes (or mmap) buffer exactly once, emitting one Token per lexical element.  Tokens carry both
+their decoded value and their (start, end) offsets in the buffer, so the parser never has to slice, decode and
+re-encode the input to find where a function body begins or ends.
+
+Token types:
+    FUNCTION        'Name('    -- value is the function name.  The opening parenthesis is part of the token
+    OPEN            '('        -- a parenthesis that does not follow a function name (the HasKey property lists)
+    CLOSE           ')'
+    FULL_IRI        '<iri>'    -- value is the IRI without the angle brackets
+    PREFIX_NAME     'pfx: ='   -- the prefixName '=' portion of a Prefix declaration.  value is the prefix
+    PREFIXED_NAME   'pfx:name' -- an abbreviated IRI
+    NODE_ID         '_:label'
+    LITERAL         '"lexical"' with an optional '@lang' or '^^datatype'.  value is the raw lexical form
+"""
+import re
+from mmap import mmap
+from typing import NamedTuple, Optional, Union, Iterator
+
+FUNCTION = 'function'
+OPEN = 'open'
+CLOSE = 'close'
+FULL_IRI = 'full_iri'
+PREFIX_NAME = 'prefix_name'
+PREFIXED_NAME = 'prefixed_name'
+NODE_ID = 'node_id'
+LITERAL = 'literal'
+
+# Bare (unquoted) literals such as the cardinality in ObjectMinCardinality( 1 :p ) are reported as LITERAL as well
+_BARE = 'bare'
+
+# Whitespace and comments are consumed in front of every token.  Comments are only recognized at the start of a token,
+# so '#' inside of an IRI or quoted string is left alone.  Each repetition of the skip takes a single whitespace
+# character or a whole comment -- the trailing lookahead keeps the regex engine from backtracking into the middle of a
+# comment -- so a failed match costs time in proportion to the whitespace that was skipped.  (A '\s+' inside of the
+# repetition could split a run of whitespace in exponentially many ways before giving up.)  Nothing but a complete
+# quoted string or IRI starts with '"' or '<', so an unterminated one (e.g. one that is cut off at the end of a window)
+# doesn't match at all and the parenthesis inside of it are never taken for structure.
+_token_re = re.compile(rb'''
+    (?:\s|\#[^\n]*(?![^\n]))*
+    (?:
+        (?P<function>(?P<fname>[A-Z][A-Za-z]+)\s*\()
+      | (?P<open>\()
+      | (?P<close>\))
+      | (?P<full_iri><[^>]*>)
+      | (?P<literal>"(?P<lexical>(?:[^"\\]|\\.)*)"
+                    (?:\s*(?:@(?P<lang>[^\s()]+)|\^\^(?P<datatype><[^>]*>|[^\s()<][^\s()]*)))?(?!\s*[@^]))
+      | (?P<node_id>_:[^\s()]*)
+      | (?P<prefix_name>(?P<pname>[^\s()"<>=\#:]*):\s*=)
+      | (?P<prefixed_name>[^\s()"<>=\#:]*:[^\s()]*)
+      | (?P<bare>[^\s()\#"<][^\s()]*)
+    )''', flags=re.VERBOSE | re.DOTALL)
+
+# Anything left over after the last token must be whitespace or comments
+_trailer_re = re.compile(rb'(?:\s|\#[^\n]*(?![^\n]))*', flags=re.DOTALL)
+
+
+class Token(NamedTuple):
+    type: str
+    value: str
+    start: int                          # Offset of the first byte of the token
+    end: int                            # Offset of the first byte following the token
+    lang: Optional[str] = None          # LITERAL only - language tag
+    datatype: Optional[str] = None      # LITERAL only - datatype, either '<iri>' or a prefixed name
+
+    def __str__(self) -> str:
+        return f"{self.type}({self.value}) at offset {self.start}"
+
+
+def tokenize(inp: Union[bytes, mmap], start: int = 0, end: Optional[int] = None) -> Iterator[Token]:
+    """
+    Generate the tokens in inp[start:end]
+
+    :param inp: input buffer
+    :param start: offset of first byte to examine
+    :param end: offset of the first byte past the end of the input.  Default: len(inp)
+    :return: token generator
+    """
+    match = _token_re.match
+    end = len(inp) if end is None else end
+    pos = start
+    while True:
+        m = match(inp, pos, end)
+        if not m:
+            break
+        typ = m.lastgroup
+        tok_start = m.start(typ)
+        pos = m.end()
+        if typ == FUNCTION:
+            yield Token(FUNCTION, m.group('fname').decode(), tok_start, pos)
+        elif typ == PREFIXED_NAME or typ == NODE_ID:
+            yield Token(typ, m.group(typ).decode(), tok_start, pos)
+        elif typ == LITERAL:
+            lang = m.group('lang')
+            datatype = m.group('datatype')
+            yield Token(LITERAL, m.group('lexical').decode(), tok_start, pos,
+                        lang.decode() if lang is not None else None,
+                        datatype.decode() if datatype is not None else None)
+        elif typ == CLOSE or typ == OPEN:
+            yield Token(typ, '', tok_start, pos)
+        elif typ == FULL_IRI:
+            yield Token(FULL_IRI, inp[tok_start + 1:pos - 1].decode(), tok_start, pos)
+        elif typ == PREFIX_NAME:
+            yield Token(PREFIX_NAME, m.group('pname').decode(), tok_start, pos)
+        else:
+            yield Token(LITERAL, m.group(_BARE).decode(), tok_start, pos)
+    if _trailer_re.match(inp, pos, end).end() != end:
+        raise ValueError(f"Unrecognized content at offset {pos}")
+
+
+def trailer_end(inp: Union[bytes, mmap], start: int = 0) -> int:
+    """
+    Skip the whitespace and comments at start
+
+    :param inp: input buffer
+    :param start: offset of first byte to examine
+    :return: offset of the first byte that is neither whitespace nor part of a comment
+    """
+    return _trailer_re.match(inp, start).end()
+
+
+def skip_function(tokens: Iterator[Token]) -> Token:
+    """
+    Consume the remainder of a function whose FUNCTION (or OPEN) token has already been read, without interpreting
+    any of its arguments
+
+    :param tokens: token stream positioned just past the opening parenthesis
+    :return: the matching CLOSE token
+    """
+    depth = 1
+    for token in tokens:
+        typ = token.type
+        if typ == CLOSE:
+            depth -= 1
+            if not depth:
+                return token
+        elif typ == FUNCTION or typ == OPEN:
+            depth += 1
+    raise ValueError("Parenthesis mismatch")
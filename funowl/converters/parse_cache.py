@@ -0,0 +1,156 @@
+"""
+On-disk cache of parsed ontology documents.
+
+Each cache entry is a file holding two pickles: the key that describes the source at the time it was parsed and the
+parsed OntologyDocument itself.  Entries for files are named after the absolute path of the file, so a stale entry is
+replaced (not accumulated) when the file changes.  Entries for in-memory sources are named after the content digest.
+
+Eviction runs every time an entry is written: entries that haven't been used for max_age seconds are removed, and
+then the least recently used entries are removed until the cache fits in max_size bytes.
+"""
+import hashlib
+import logging
+import os
+import pickle
+import time
+from mmap import mmap
+from typing import Optional, Union, IO, Tuple, Any
+
+from funowl.ontology_document import OntologyDocument
+
+# Bump this whenever a change to the model classes makes existing snapshots unusable
+CACHE_FORMAT = 2
+
+DEFAULT_MAX_SIZE = 1024 * 1024 * 1024           # bytes
+DEFAULT_MAX_AGE = 30 * 24 * 60 * 60             # seconds
+
+SUFFIX = '.funowl.pickle'
+
+# Buffer size used when computing file digests
+_DIGEST_BLOCK = 1024 * 1024
+
+
+class ParseCache:
+    def __init__(self, cache_dir: str, max_size: Optional[int] = DEFAULT_MAX_SIZE,
+                 max_age: Optional[float] = DEFAULT_MAX_AGE, digest: bool = False) -> None:
+        """
+        :param cache_dir: directory that holds the snapshots.  Created if necessary
+        :param max_size: maximum total size of the snapshots in bytes.  None means no limit
+        :param max_age: number of seconds a snapshot is kept after it was last used.  None means no limit
+        :param digest: True means include a SHA-256 digest of the file contents in the key, catching changes that
+        leave the size and modification time of the source untouched
+        """
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.max_age = max_age
+        self.digest = digest
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def entry(self, defn: Union[str, bytes, IO], variant: Optional[Any] = None) \
+            -> Optional[Tuple[str, Tuple[Any, ...]]]:
+        """
+        Determine where defn would be cached and the key that describes its current state
+
+        :param defn: ontology definition as passed to to_python
+        :param variant: description of any options that change what is loaded from defn (e.g. a function filter).
+        Each variant of a source is cached separately
+        :return: (snapshot file name, key) or None if defn can't be cached (URLs, open files)
+        """
+        suffix = '' if variant is None else '-' + hashlib.sha256(repr(variant).encode()).hexdigest()[:16]
+        if isinstance(defn, (bytes, mmap)) or (isinstance(defn, str) and '\n' in defn):
+            content_digest = hashlib.sha256(defn.encode() if isinstance(defn, str) else defn).hexdigest()
+            return (os.path.join(self.cache_dir, content_digest + suffix + SUFFIX),
+                    (CACHE_FORMAT, content_digest, variant))
+        if not isinstance(defn, str) or '://' in defn or not os.path.isfile(defn):
+            return None
+        path = os.path.abspath(defn)
+        stat = os.stat(path)
+        key = (CACHE_FORMAT, path, stat.st_size, stat.st_mtime_ns, variant)
+        if self.digest:
+            key += (self._file_digest(path), )
+        name = hashlib.sha256(path.encode()).hexdigest()
+        return os.path.join(self.cache_dir, name + suffix + SUFFIX), key
+
+    @staticmethod
+    def _file_digest(path: str) -> str:
+        h = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(_DIGEST_BLOCK), b''):
+                h.update(block)
+        return h.hexdigest()
+
+    def load(self, fname: str, key: Tuple[Any, ...]) -> Optional[OntologyDocument]:
+        """
+        Return the snapshot in fname if it was taken from the source described by key
+
+        :param fname: snapshot file name
+        :param key: current key of the source
+        :return: parsed document or None if there is no (valid) snapshot
+        """
+        try:
+            with open(fname, 'rb') as f:
+                if pickle.load(f) != key:
+                    return None
+                doc = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.warning(f"Discarding unreadable cache entry {fname}: {e}")
+            self._remove(fname)
+            return None
+        os.utime(fname)
+        return doc
+
+    def store(self, fname: str, key: Tuple[Any, ...], doc: OntologyDocument) -> None:
+        """
+        Snapshot doc in fname and evict whatever no longer fits
+
+        :param fname: snapshot file name
+        :param key: key of the source doc was parsed from
+        :param doc: parsed document
+        """
+        tmp_fname = f"{fname}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_fname, 'wb') as f:
+                pickle.dump(key, f, pickle.HIGHEST_PROTOCOL)
+                pickle.dump(doc, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_fname, fname)
+        finally:
+            self._remove(tmp_fname)
+        self.evict()
+
+    def evict(self) -> None:
+        """ Remove the entries that have expired and then the least recently used ones until the cache fits """
+        entries = []
+        for fname in os.listdir(self.cache_dir):
+            if fname.endswith(SUFFIX):
+                path = os.path.join(self.cache_dir, fname)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        if self.max_age is not None:
+            cutoff = time.time() - self.max_age
+            while entries and entries[0][0] < cutoff:
+                self._remove(entries.pop(0)[2])
+        if self.max_size is not None:
+            total = sum(e[1] for e in entries)
+            while entries and total > self.max_size:
+                _, size, path = entries.pop(0)
+                self._remove(path)
+                total -= size
+
+    def clear(self) -> None:
+        """ Remove every entry in the cache """
+        for fname in os.listdir(self.cache_dir):
+            if fname.endswith(SUFFIX):
+                self._remove(os.path.join(self.cache_dir, fname))
+
+    @staticmethod
+    def _remove(fname: str) -> None:
+        try:
+            os.remove(fname)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,84 @@
+"""
+Diagnostics for error tolerant (strict=False) parsing.
+
+A non-strict parse records a ParseDiagnostic for each top level function in the body of the Ontology that fails to
+parse, skips to the end of that function and carries on with the next one.
+"""
+import re
+from dataclasses import dataclass
+from mmap import mmap
+from typing import Union
+
+from funowl.converters.functional_lexer import tokenize, skip_function
+
+# Start of a line that opens a function -- where parsing picks up again when a function can't even be tokenized
+_resync_re = re.compile(rb'\n[ \t]*(?=[A-Z][A-Za-z]*\s*\()')
+
+
+@dataclass(frozen=True)
+class ParseDiagnostic:
+    offset: int                             # Offset of the failing function in the input
+    line: int                               # 1 based line number of offset
+    function: str                           # Function name (e.g. 'SubClassOf')
+    error: Exception                        # What went wrong
+    resumed_at: int                         # Offset where parsing resumed
+
+    def __str__(self) -> str:
+        return f"Line {self.line} (offset {self.offset}): skipped {self.function} - {type(self.error).__name__}: " \
+               f"{self.error}"
+
+
+class LineCounter:
+    """ Map offsets to line numbers, counting forward from the previous offset when offsets increase """
+    def __init__(self, inp: Union[bytes, mmap]) -> None:
+        self.inp = inp
+        self._offset = 0
+        self._line = 1
+
+    def line(self, offset: int) -> int:
+        if offset < self._offset:
+            self._offset, self._line = 0, 1
+        self._line += self.inp[self._offset:offset].count(b'\n')
+        self._offset = offset
+        return self._line
+
+
+def last_resync_offset(inp: Union[bytes, bytearray, mmap], start: int = 0) -> int:
+    """
+    Find the last line that opens a function
+
+    :param inp: input byte stream
+    :param start: offset to search from
+    :return: offset of the function name on the last line at or after start that opens a function or 0 if there is none
+    """
+    rval = 0
+    for match in _resync_re.finditer(inp, start):
+        rval = match.end()
+    return rval
+
+
+def resume_offset(inp: Union[bytes, mmap], start: int, balanced: bool = False) -> int:
+    """
+    Determine where parsing should resume after the function that starts at start failed
+
+    :param inp: input byte stream
+    :param start: offset of the function name
+    :param balanced: True means the parenthesis of every function in inp are known to balance
+    :return: offset following the balanced closing parenthesis of the function.  If the function can't be tokenized or
+    its parenthesis don't balance, the start of the next line that opens a function or, failing that, the last
+    closing parenthesis in inp (presumably the end of the Ontology)
+    """
+    try:
+        tokens = tokenize(inp, start)
+        next(tokens)
+        end = skip_function(tokens).end
+        # A function that is missing a closing parenthesis "balances" against the end of the Ontology
+        if balanced or next(tokens, None) is not None:
+            return end
+    except ValueError:
+        pass
+    match = _resync_re.search(inp, start + 1)
+    if match:
+        return match.end()
+    last = inp.rfind(b')', start + 1)
+    return last if last >= 0 else len(inp)
@@ -0,0 +1,103 @@
+"""
+Progress reporting for the functional syntax parser.
+
+The parser hands a ProgressReporter the input position after each element in the body of the Ontology.  The reporter
+passes a Progress snapshot to the callback at most once every interval seconds, and once more when the parse is
+complete.  No reporter is created when there is no callback, so an unmonitored parse pays nothing.
+"""
+import sys
+import time
+from dataclasses import dataclass
+from typing import Optional, Callable, TextIO
+
+# Minimum number of seconds between two calls to the progress callback
+DEFAULT_INTERVAL = 0.5
+
+
+@dataclass(frozen=True)
+class Progress:
+    bytes_read: int                         # Position in the input
+    total_bytes: Optional[int]              # Size of the input
+    naxioms: int                            # Elements parsed from the body of the Ontology so far
+    elapsed: float                          # Seconds since the parse started
+    done: bool = False                      # True in the final report
+
+    @property
+    def axioms_per_second(self) -> float:
+        return self.naxioms / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def fraction(self) -> Optional[float]:
+        """ Fraction of the input that has been parsed, if the size of the input is known """
+        return self.bytes_read / self.total_bytes if self.total_bytes else None
+
+
+ProgressCallback = Callable[[Progress], None]
+
+
+class ProgressReporter:
+    def __init__(self, callback: ProgressCallback, total_bytes: Optional[int] = None,
+                 interval: Optional[float] = None, position: Optional[Callable[[], int]] = None) -> None:
+        """
+        :param callback: function to report progress to
+        :param total_bytes: size of the input, if known
+        :param interval: minimum number of seconds between two reports.  Defaults to DEFAULT_INTERVAL
+        :param position: function that returns the position in the input.  Overrides the positions passed to update
+        and finish (e.g. when the parser only sees decompressed windows of a compressed input)
+        """
+        self.callback = callback
+        self.total_bytes = total_bytes
+        self.interval = DEFAULT_INTERVAL if interval is None else interval
+        self.position = position
+        self.naxioms = 0
+        self.bytes_read = 0
+        self._start = time.monotonic()
+        self._next_report = self._start + self.interval
+
+    def update(self, bytes_read: int, naxioms: int = 1) -> None:
+        """
+        Record that naxioms more elements have been parsed, reporting if the interval has passed
+
+        :param bytes_read: position in the input following the elements
+        :param naxioms: number of elements
+        """
+        self.naxioms += naxioms
+        self.bytes_read = bytes_read
+        now = time.monotonic()
+        if now >= self._next_report:
+            self._next_report = now + self.interval
+            if self.position is not None:
+                self.bytes_read = self.position()
+            self.callback(Progress(self.bytes_read, self.total_bytes, self.naxioms, now - self._start))
+
+    def finish(self, bytes_read: Optional[int] = None) -> None:
+        """ Send the final report """
+        if self.position is not None:
+            self.bytes_read = self.position()
+        elif bytes_read is not None:
+            self.bytes_read = bytes_read
+        self.callback(Progress(self.bytes_read, self.total_bytes, self.naxioms, time.monotonic() - self._start,
+                               done=True))
+
+
+class ProgressPrinter:
+    """ Progress callback that keeps a one line status display up to date.  Parses that finish before the first
+    report is due print nothing. """
+    def __init__(self, file: Optional[TextIO] = None) -> None:
+        """
+        :param file: where to write the status line.  Defaults to stderr
+        """
+        self.file = file
+        self._shown = False
+
+    def __call__(self, progress: Progress) -> None:
+        if progress.done and not self._shown:
+            return
+        self._shown = True
+        f = self.file or sys.stderr
+        fraction = progress.fraction
+        pct = f"{fraction:7.1%}  " if fraction is not None else ''
+        f.write(f"\r{progress.naxioms:>12,} axioms  {pct}{progress.axioms_per_second:>10,.0f} axioms/s")
+        if progress.done:
+            f.write(f"  {progress.elapsed:.1f}s\n")
+        f.flush()
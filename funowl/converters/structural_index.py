@@ -0,0 +1,182 @@
+"""
+Vectorized structural index of an OWL Functional Syntax buffer.
+
+The index is built in a single NumPy pre-pass over the (mmap'd) input.  Only the structurally significant bytes
+(quotes, backslashes, parentheses, angle brackets, '#' and newlines) are extracted; quoted strings, IRIs and comments
+are then masked out with cumulative sums and the remaining parentheses are paired by nesting level.  The result
+answers two questions without any per-byte Python work:
+
+    * Where does each axiom in the body of the Ontology start and end?
+    * Where is the parenthesis that closes the one at a given offset?
+
+NumPy is optional.  structural_index returns None when it isn't installed, or when the buffer contains something that
+the vectorized scan can't classify with certainty (e.g. a quote inside of a comment), in which case callers fall back
+to the token stream.
+"""
+from mmap import mmap
+from typing import Optional, Union, List, Tuple
+
+try:
+    import numpy as np
+except ImportError:                 # pragma: no cover
+    np = None
+
+# Size of the blocks used to extract the structural bytes.  Bounds the size of the temporary arrays
+BLOCK_SIZE = 16 * 1024 * 1024
+
+_QUOTE, _BACKSLASH, _OPEN, _CLOSE, _LT, _GT, _HASH, _NL = b'"\\()<>#\n'
+
+# Characters that may precede a comment -- '#' is only a comment at the beginning of a token
+_COMMENT_PREDECESSORS = b' \t\r\n()">'
+
+
+class StructuralIndex:
+    """
+    opens / closes:             offsets of each parenthesis and its matching partner, ordered by opening offset
+    axiom_starts / axiom_ends:  byte range of each function nested directly inside a top level function.  For a
+                                well-formed document these are the Ontology axioms, annotations and imports.  Starts
+                                may include leading white space; ends are exclusive
+    """
+    def __init__(self, opens: "np.ndarray", closes: "np.ndarray", levels: "np.ndarray", prev_special: "np.ndarray")\
+            -> None:
+        self.opens = opens
+        self.closes = closes
+        axioms = levels == 2
+        self.axiom_starts = prev_special[axioms] + 1
+        self.axiom_ends = closes[axioms] + 1
+
+    def __len__(self) -> int:
+        return len(self.axiom_ends)
+
+    def closing(self, open_offset: int) -> int:
+        """
+        Return the offset of the parenthesis that closes the one at open_offset
+
+        :param open_offset: offset of an opening parenthesis
+        :return: offset of the matching closing parenthesis
+        """
+        i = int(np.searchsorted(self.opens, open_offset))
+        if i >= len(self.opens) or self.opens[i] != open_offset:
+            raise ValueError(f"No opening parenthesis at offset {open_offset}")
+        return int(self.closes[i])
+
+    def _body(self, start: int, end: Optional[int]) -> Tuple["np.ndarray", "np.ndarray"]:
+        """ Start and end offsets of the axioms that end in (start, end].  The first start is clipped to start """
+        lo = int(np.searchsorted(self.axiom_ends, start, side='right'))
+        hi = len(self) if end is None else int(np.searchsorted(self.axiom_ends, end + 1, side='right'))
+        starts = self.axiom_starts[lo:hi].copy()
+        if len(starts):
+            starts[0] = max(int(starts[0]), start)
+        return starts, self.axiom_ends[lo:hi]
+
+    def axiom_spans(self, start: int = 0, end: Optional[int] = None) -> List[Tuple[int, int]]:
+        """
+        Return the byte range of each axiom that ends in (start, end]
+
+        :param start: offset of the first byte of the first axiom.  Anything in front of it is excluded
+        :param end: offset of the closing parenthesis of the enclosing function.  Default: end of the index
+        :return: list of (start, end) offsets
+        """
+        starts, ends = self._body(start, end)
+        return list(zip(starts.tolist(), ends.tolist()))
+
+    def axiom_chunks(self, nchunks: int, start: int = 0, end: Optional[int] = None) -> List[Tuple[int, int]]:
+        """
+        Split the axioms that end in (start, end] into (at most) nchunks contiguous byte ranges of roughly equal size
+
+        :param nchunks: number of ranges
+        :param start: offset of the first byte of the first axiom.  Anything in front of it is excluded
+        :param end: offset of the closing parenthesis of the enclosing function.  Default: end of the index
+        :return: list of (start, end) offsets, each spanning one or more complete axioms
+        """
+        starts, ends = self._body(start, end)
+        if not len(ends):
+            return []
+        targets = np.linspace(starts[0], ends[-1], nchunks + 1)[1:]
+        last = np.unique(np.minimum(np.searchsorted(ends, targets), len(ends) - 1))
+        first = np.concatenate(([0], last[:-1] + 1))
+        return list(zip(starts[first].tolist(), ends[last].tolist()))
+
+
+def structural_index(inp: Union[bytes, mmap]) -> Optional[StructuralIndex]:
+    """
+    Build a structural index of inp
+
+    :param inp: input buffer
+    :return: index or None if NumPy isn't available or inp can't be indexed reliably
+    """
+    if np is None:
+        return None
+
+    buf = np.frombuffer(inp, dtype=np.uint8)
+    special = np.zeros(256, dtype=bool)
+    special[list(b'"\\()<>#\n')] = True
+
+    # Offsets and values of the structural bytes
+    pos = np.concatenate([np.flatnonzero(special[buf[i:i + BLOCK_SIZE]]) + i
+                          for i in range(0, len(buf), BLOCK_SIZE)] or [np.zeros(0, dtype=np.intp)])
+    ch = buf[pos]
+    idx = np.arange(len(pos))
+
+    # A quote is escaped if it is immediately preceded by an odd length run of backslashes
+    bs = ch == _BACKSLASH
+    contiguous = np.zeros(len(pos), dtype=bool)
+    contiguous[1:] = pos[1:] - pos[:-1] == 1
+    run_start = np.maximum.accumulate(np.where(bs & ~(contiguous & np.roll(bs, 1)), idx, 0))
+    run_len = np.where(bs, idx - run_start + 1, 0)
+    escaped = np.zeros(len(pos), dtype=bool)
+    escaped[1:] = contiguous[1:] & (run_len[:-1] % 2 == 1)
+    quotes = (ch == _QUOTE) & ~escaped
+    in_string = (np.cumsum(quotes) - quotes) % 2 == 1
+
+    # IRIs -- '<' ... '>' outside of strings.  IRIs don't nest.
+    lt = (ch == _LT) & ~in_string
+    gt = (ch == _GT) & ~in_string
+    iri_depth = np.cumsum(lt) - np.cumsum(gt)
+    if len(iri_depth) and (iri_depth.min() < 0 or iri_depth.max() > 1):
+        return None
+    in_iri = (iri_depth - lt) > 0
+
+    # Comments -- '#' at the start of a token, outside of strings and IRIs, runs to the end of the line
+    hashes = (ch == _HASH) & ~in_string & ~in_iri
+    hash_pos = pos[hashes]
+    predecessors = np.zeros(256, dtype=bool)
+    predecessors[list(_COMMENT_PREDECESSORS)] = True
+    comment_start = np.zeros(len(pos), dtype=bool)
+    comment_start[hashes] = (hash_pos == 0) | predecessors[buf[np.maximum(hash_pos - 1, 0)]]
+    newlines = ch == _NL
+    last_comment = np.maximum.accumulate(np.where(comment_start, idx, -1))
+    last_nl = np.maximum.accumulate(np.where(newlines, idx, -1))
+    in_comment = (last_comment > last_nl) & ~comment_start
+
+    # Quotes and angle brackets inside a comment are harmless as long as they balance.  If they don't, the string and
+    # IRI analysis above can't be trusted
+    starts = idx[comment_start]
+    nl_idx = np.append(idx[newlines], len(pos) - 1)
+    ends = nl_idx[np.searchsorted(nl_idx, starts)]
+    quote_count = np.cumsum(quotes)
+    if ((quote_count[ends] - quote_count[starts]) % 2).any() or (iri_depth[ends] != iri_depth[starts]).any():
+        return None
+
+    # Parentheses that remain are structural
+    live = ~in_string & ~in_iri & ~in_comment & ~comment_start
+    opens = live & (ch == _OPEN)
+    closes = live & (ch == _CLOSE)
+    paren = opens | closes
+    depth = np.cumsum(opens.astype(np.intp) - closes)
+    if len(depth) and (depth.min() < 0 or depth[-1] != 0):
+        return None
+
+    # Pair each open with its close -- within a nesting level they strictly alternate
+    p_pos = pos[paren]
+    p_open = opens[paren]
+    level = np.where(p_open, depth[paren], depth[paren] + 1)
+    order = np.argsort(level, kind='stable')
+    pairs = order.reshape(-1, 2)
+    open_pos = p_pos[pairs[:, 0]]
+    close_pos = p_pos[pairs[:, 1]]
+    pair_levels = level[pairs[:, 0]]
+    open_idx = idx[paren][pairs[:, 0]]
+    prev_special = np.where(open_idx > 0, pos[np.maximum(open_idx - 1, 0)], -1)
+    by_pos = np.argsort(open_pos)
+    return StructuralIndex(open_pos[by_pos], close_pos[by_pos], pair_levels[by_pos], prev_special[by_pos])
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import List, Union
+from typing import List, Union, ClassVar, FrozenSet
 
 from rdflib import Graph, OWL, RDFS, RDF, BNode
 
@@ -58,6 +58,7 @@ class SubDataPropertyOf(Annotatable):
 class EquivalentDataProperties(Annotatable):
     dataPropertyExpressions: List[DataPropertyExpression]
     annotations: List[Annotation] = empty_list_wrapper(Annotation)
+    _set_fields: ClassVar[FrozenSet[str]] = Annotatable._set_fields | {'dataPropertyExpressions'}
 
     def __init__(self, *dataPropertyExpressions: DataPropertyExpression, annotations: List[Annotation] = None) -> None:
         self.dataPropertyExpressions = list(dataPropertyExpressions)
@@ -85,6 +86,7 @@ class EquivalentDataProperties(Annotatable):
 class DisjointDataProperties(Annotatable):
     dataPropertyExpressions: List[DataPropertyExpression]
     annotations: List[Annotation] = empty_list_wrapper(Annotation)
+    _set_fields: ClassVar[FrozenSet[str]] = Annotatable._set_fields | {'dataPropertyExpressions'}
 
     def __init__(self, *dataPropertyExpressions: DataPropertyExpression, annotations: List[Annotation] = None) -> None:
         dpes = [DataPropertyExpression(dpe) for dpe in dataPropertyExpressions]
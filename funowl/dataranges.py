@@ -21,7 +21,7 @@ restrictionValue := Literal
 """
 from dataclasses import dataclass
 # TODO: Figure out ForwardRef issue (See: class_expressions for issue focus point)
-from typing import Union, List, ForwardRef
+from typing import Union, List, ForwardRef, ClassVar, FrozenSet
 
 from rdflib import Graph, BNode, RDF, RDFS, OWL
 
@@ -30,15 +30,16 @@ from funowl.converters.rdf_converter import SEQ
 from funowl.identifiers import IRI
 from funowl.literals import Datatype
 from funowl.literals import Literal
-from funowl.base.fun_owl_base import FunOwlBase
+from funowl.base.expression_table import SharedExpression
 from funowl.base.fun_owl_choice import FunOwlChoice
 from funowl.terminals.TypingHelper import proc_forwards
 from funowl.writers.FunctionalWriter import FunctionalWriter
 
 
 @dataclass
-class DataIntersectionOf(FunOwlBase):
+class DataIntersectionOf(SharedExpression):
     dataRanges: List["DataRange"]
+    _set_fields: ClassVar[FrozenSet[str]] = frozenset({'dataRanges'})
 
     def __init__(self, *dataRanges: List["DataRange"]) -> None:
         self.dataRanges = list(dataRanges)
@@ -50,8 +51,9 @@ class DataIntersectionOf(FunOwlBase):
 
 
 @dataclass
-class DataUnionOf(FunOwlBase):
+class DataUnionOf(SharedExpression):
     dataRanges: List["DataRange"]
+    _set_fields: ClassVar[FrozenSet[str]] = frozenset({'dataRanges'})
 
     def __init__(self, *dataRanges: List["DataRange"]) -> None:
         self.dataRanges = list(dataRanges)
@@ -63,7 +65,7 @@ class DataUnionOf(FunOwlBase):
 
 
 @dataclass
-class DataComplementOf(FunOwlBase):
+class DataComplementOf(SharedExpression):
     dataRange: ForwardRef("DataRange")
 
     def to_functional(self, w: FunctionalWriter) -> FunctionalWriter:
@@ -78,8 +80,9 @@ class DataComplementOf(FunOwlBase):
         return x
 
 @dataclass
-class DataOneOf(FunOwlBase):
+class DataOneOf(SharedExpression):
     literal: List[Literal]
+    _set_fields: ClassVar[FrozenSet[str]] = frozenset({'literal'})
 
     def __init__(self, *literal: List[Literal]) -> None:
         self.literal = list(literal)
@@ -98,7 +101,7 @@ class DataOneOf(FunOwlBase):
 
 
 @dataclass
-class FacetRestriction(FunOwlBase):
+class FacetRestriction(SharedExpression):
     constrainingFacet: IRI
     restrictionValue: Literal
 
@@ -113,9 +116,10 @@ class FacetRestriction(FunOwlBase):
 
 
 @dataclass
-class DatatypeRestriction(FunOwlBase):
+class DatatypeRestriction(SharedExpression):
     datatype: Datatype
     restrictions: List[FacetRestriction]
+    _set_fields: ClassVar[FrozenSet[str]] = frozenset({'restrictions'})
 
     def __init__(self, datatype: Datatype, *restrictions: FacetRestriction, annotations: List[Annotation] = None) \
             -> None:
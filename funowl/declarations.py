@@ -38,7 +38,7 @@ class Declaration(FunOwlChoice, Annotatable):
     _coercion_allowed = False
 
     def to_functional(self, w: FunctionalWriter) -> FunctionalWriter:
-        return w.func(self, lambda: w.func(self.v, lambda: self.v.to_functional(w), indent=False))
+        return self.annots(w, lambda: w.func(self.v, lambda: self.v.to_functional(w), indent=False))
 
     def to_rdf(self, g: Graph, emit_type_arc: bool = False) -> Optional[NODE]:
         return super().to_rdf(g, emit_type_arc=True)
@@ -8,6 +8,8 @@ fullIRI := an IRI as defined in [RFC3987], enclosed in a pair of < (U+3C) and >
 prefixName := a finite sequence of characters matching the as PNAME_NS production of [SPARQL]
 abbreviatedIRI := a finite sequence of characters matching the PNAME_LN production of [SPARQL]
 """
+import re
+from functools import lru_cache
 from typing import Optional, ClassVar, Set
 
 import bcp47
@@ -45,7 +47,11 @@ class QuotedString(QUOTED_STRING, FunOwlRoot):
      "\\ (U+5C, U+22) and \\ (U+5C, U+5C), enclosed in a pair of " (U+22) characters
      """
     def to_functional(self, w: FunctionalWriter) -> FunctionalWriter:
-        return w + ('"' + self.replace('\\', '\\\\').replace('"', '\\"') + '"')
+        v = self.replace('\\', '\\\\').replace('"', '\\"')
+        if w.compact:
+            # A compact writer puts each axiom on one line, so line breaks are written as escapes
+            v = v.replace('\n', '\\n').replace('\r', '\\r')
+        return w + ('"' + v + '"')
 
 
 class LanguageTag(str, FunOwlBase):
@@ -85,8 +91,46 @@ class NodeID(BLANK_NODE_LABEL, FunOwlRoot):
         return BNode()
 
 
+# FullIRI.VALIDATION levels
+IRI_VALIDATION_OFF = 'off'          # Anything that starts with a scheme (e.g. 'http:') is an IRI
+IRI_VALIDATION_FAST = 'fast'        # A scheme followed by characters that can occur in an IRI
+IRI_VALIDATION_STRICT = 'strict'    # The full [RFC3987] IRI grammar
+
+# Number of strings whose validity as an IRI is remembered
+IRI_VALIDATION_CACHE_SIZE = 16384
+
+_iri_scheme_re = re.compile(r'[A-Za-z][A-Za-z0-9+.-]*:')
+_iri_chars_re = re.compile(r'[A-Za-z][A-Za-z0-9+.-]*:[^\x00-\x20<>"{}|\\^`]*')
+
+# A subset of the [RFC3987] IRI grammar that covers most http(s) IRIs:  a host name, an optional port and a path,
+# query and fragment without percent escapes or non-ASCII characters
+_PCHAR = r"-A-Za-z0-9._~!$&'()*+,;=:@"
+_http_iri_re = re.compile(rf"https?://[-A-Za-z0-9._~]*(?::[0-9]*)?"
+                          rf"(?:/[{_PCHAR}/]*)?(?:\?[{_PCHAR}/?]*)?(?:#[{_PCHAR}/?]*)?")
+
+
+@lru_cache(maxsize=IRI_VALIDATION_CACHE_SIZE)
+def _is_iri(v: str, level: str) -> bool:
+    """
+    Determine whether v is an IRI
+
+    :param v: string to test
+    :param level: one of the IRI_VALIDATION levels
+    :return: True if v passes the level of validation
+    """
+    if level == IRI_VALIDATION_STRICT:
+        return _http_iri_re.fullmatch(v) is not None or rfc3987.match(v, 'IRI') is not None
+    elif level == IRI_VALIDATION_FAST:
+        return _iri_chars_re.fullmatch(v) is not None
+    elif level == IRI_VALIDATION_OFF:
+        return _iri_scheme_re.match(v) is not None
+    raise ValueError(f"Unknown IRI validation level: {level}")
+
+
 class FullIRI(str, FunOwlBase):
     """ fullIRI := an IRI as defined in [RFC3987], enclosed in a pair of < (U+3C) and > (U+3E) characters """
+    # How closely strings are checked before they are accepted as IRIs.  See IRI_VALIDATION_STRICT et al.
+    VALIDATION: ClassVar[str] = IRI_VALIDATION_STRICT
 
     def __init__(self, v: str) -> None:
         if v is None or not self._is_valid(v):
@@ -98,7 +142,7 @@ class FullIRI(str, FunOwlBase):
         #   It is already declated to be a URIRef no matter what it looks like
         #   It looks like an IRI
         return instance is not None and not isinstance(instance, (rdflib.Literal, Literal)) \
-               and (isinstance(instance, URIRef) or rfc3987.match(str(instance), 'IRI'))
+               and (isinstance(instance, URIRef) or _is_iri(str(instance), FullIRI.VALIDATION))
 
     def to_functional(self, w: FunctionalWriter) -> FunctionalWriter:
         return w + w.g.namespace_manager.normalizeUri(str(self))
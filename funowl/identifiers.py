@@ -1,11 +1,14 @@
 """ IRI := fullIRI | abbreviatedIRI """
 import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
-from typing import Union, ClassVar, Optional, List
+from typing import Union, ClassVar, Optional, List, Dict, Tuple, Type, Iterator, Any
 
 from rdflib import URIRef, Namespace, Graph, RDF, OWL, XSD, RDFS
 
-from funowl.base.cast_function import exclude
+from funowl.base.cast_function import exclude, stand_in_for
+from funowl.base.fun_owl_base import FunOwlBaseMeta
 from funowl.base.fun_owl_choice import FunOwlChoice
 from funowl.base.rdftriple import SUBJ
 from funowl.general_definitions import FullIRI, AbbreviatedIRI
@@ -13,14 +16,95 @@ from funowl.prefix_declarations import PrefixDeclarations
 from funowl.writers.FunctionalWriter import FunctionalWriter
 
 
-@dataclass(unsafe_hash=True)
-class IRI(FunOwlChoice):
+class IRITable:
+    """
+    Flyweight table for IRIs.  While a table is active, every IRI (Class, ObjectProperty, NamedIndividual, ...) that
+    is constructed from a single string resolves to one shared instance per kind and string.  Shared instances can't
+    be modified -- modify a copy instead.
+
+    to_python only interns IRIs in a table that it is given.  Pass the same table to share IRIs across documents.
+    """
+    def __init__(self) -> None:
+        self._entries: Dict[Tuple[Type, str], Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @contextmanager
+    def active(self) -> Iterator["IRITable"]:
+        """ Intern IRIs in this table for the duration of the context """
+        token = _iri_table.set(self)
+        try:
+            yield self
+        finally:
+            _iri_table.reset(token)
+
+    def intern(self, cls: Type, v: str) -> Any:
+        """
+        Return the shared instance of cls(v), constructing it if necessary
+
+        :param cls: IRI class or string terminal (e.g. AbbreviatedIRI) to construct
+        :param v: string to construct it from
+        :return: shared instance
+        """
+        # Every flavor of string (str, URIRef, AbbreviatedIRI, ...) is cast to the same IRI, but rdflib identifiers
+        # don't compare equal to plain strings
+        key = (cls, str(v))
+        rval = self._entries.get(key)
+        if rval is None:
+            if issubclass(cls, IRI):
+                rval = super(IRIMeta, cls).__call__(v)
+                object.__setattr__(rval, '_interned', True)
+            else:
+                rval = cls(v)
+            self._entries[key] = rval
+        return rval
+
+
+_iri_table: ContextVar[Optional[IRITable]] = ContextVar('iri_table', default=None)
+
+
+def active_iri_table() -> Optional[IRITable]:
+    """ Return the IRI table that is currently active, if any """
+    return _iri_table.get()
+
+
+class IRIMeta(FunOwlBaseMeta):
+    """ Route IRI construction through the active IRITable, if any """
+    def __call__(cls, *args, **kwargs):
+        table = _iri_table.get()
+        if table is not None and len(args) == 1 and not kwargs and isinstance(args[0], str):
+            return table.intern(cls, args[0])
+        return super().__call__(*args, **kwargs)
+
+
+@dataclass
+class IRI(FunOwlChoice, metaclass=IRIMeta):
     """ IRI := fullIRI | abbreviatedIRI """
     v: Union[AbbreviatedIRI, FullIRI, URIRef, str] = exclude([URIRef, str])
 
     rdf_type: ClassVar[URIRef] = None
     prefix_declarations: ClassVar[PrefixDeclarations] = None        # Link to prefixes section, if declared
 
+    def __setattr__(self, key, value):
+        if '_interned' in self.__dict__:
+            raise AttributeError(f"{type(self).__name__}({self}) is shared through an IRITable and can't be modified")
+        super().__setattr__(key, value)
+
+    def _structural_key(self) -> Tuple:
+        # The kind of entity (Class, ObjectProperty, ...) and its name
+        return stand_in_for(type(self)), str(self.v)
+
+    def __copy__(self) -> "IRI":
+        # Copies of a shared instance belong to the caller
+        rval = object.__new__(type(self))
+        rval.__dict__.update(self.__dict__)
+        rval.__dict__.pop('_interned', None)
+        return rval
+
+    def __deepcopy__(self, memo: Dict) -> "IRI":
+        return self.__copy__()
+
     # def __post_init__(self):
     #     print(f"Just constructed a {type(self)} value {str(self.v)}")
 
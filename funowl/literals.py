@@ -7,10 +7,11 @@ stringLiteralWithLanguage := quotedString languageTag
 """
 from dataclasses import dataclass
 from datetime import date, datetime, time
+from functools import lru_cache
 from typing import Optional, Union, Any, Tuple, ClassVar
 
 import rdflib
-from rdflib import Graph, Literal
+from rdflib import Graph, Literal, URIRef
 from rdflib.namespace import RDFS, XSD, RDF, Namespace
 from rdflib.plugins.parsers.notation3 import BadSyntax
 from rdflib.term import Node
@@ -18,12 +19,66 @@ from rdflib.term import Node
 from funowl.base.cast_function import exclude
 from funowl.base.fun_owl_base import FunOwlBase
 from funowl.base.fun_owl_choice import FunOwlChoice
+from funowl.terminals.LiteralLexer import lex_literal
 from funowl.writers.FunctionalWriter import FunctionalWriter
 from funowl.general_definitions import QuotedString, LanguageTag
 from funowl.identifiers import IRI
 
 DUMMY_PREFIX = Namespace("http://a/b#")
 
+# Prefixes that can be used in the datatype of a literal -- the ones declared in the statement that _graph_literal
+# parses
+LITERAL_PREFIXES = {'': str(DUMMY_PREFIX), 'xsd': str(XSD)}
+
+# Number of parsed literals to remember.  The same text tends to be parsed several times as a choice is resolved
+LITERAL_CACHE_SIZE = 8192
+
+
+@lru_cache(maxsize=LITERAL_CACHE_SIZE)
+def _parse_literal(v: str) -> Optional[rdflib.Literal]:
+    """
+    Parse the text of a literal, quoted or not
+
+    :param v: literal text
+    :return: the literal or None if v isn't a valid literal
+    """
+    v = v.replace("\n", "\\n")
+
+    # Add quotes if necessary
+    if len(v) == 0 or v[0] not in ['"', "'"]:
+        v = '"' + v + '"'
+    lexed = lex_literal(v, LITERAL_PREFIXES)
+    if lexed is None:
+        l = _graph_literal(v)
+    else:
+        value, lang, datatype = lexed
+        l = rdflib.Literal(value, datatype=URIRef(datatype)) if datatype else rdflib.Literal(value, lang=lang)
+    if l is not None:
+        if not isinstance(l, rdflib.Literal) or l.value is None:
+            l = None
+    return l
+
+
+def _graph_literal(v: str) -> Optional[Node]:
+    """
+    Parse a quoted literal with the rdflib N3 parser.  Only used for the forms that lex_literal doesn't recognize
+
+    :param v: quoted literal text
+    :return: what the parser made of v, if anything
+    """
+    # Create a turtle triple to use the n3 parser
+    stmt = f'@prefix : <{DUMMY_PREFIX}> . @prefix xsd: <{XSD}> . :f a {v} .'
+    g = Graph(bind_namespaces="core")
+    try:
+        g.parse(data=stmt, format="turtle")
+    except BadSyntax:
+        pass
+    # Probably a bug in rdflib, but "n"^^xsd.integer produces this error
+    except IndexError:
+        pass
+    return g.value(DUMMY_PREFIX.f, RDF.type)
+
+
 @dataclass
 class Datatype(IRI):
     rdf_type = RDFS.Datatype
@@ -161,29 +216,7 @@ class Literal(FunOwlChoice):
             return v
         if isinstance(v, (int, float, bool, date, datetime, time)):
             return rdflib.Literal(v)
-        if not isinstance(v, str):
-            v = str(v)
-        v = v.replace("\n", "\\n")
-
-        # Add quotes if necessary
-        if len(v) == 0 or v[0] not in ['"', "'"]:
-            v = '"' + v + '"'
-        # Create a turtle triple to use the n3 parser
-        # TODO: make the constructor static and use clear
-        stmt = f'@prefix : <{DUMMY_PREFIX}> . @prefix xsd: <{XSD}> . :f a {v} .'
-        g = Graph(bind_namespaces="core")
-        try:
-            g.parse(data=stmt, format="turtle")
-        except BadSyntax:
-            pass
-        # Probably a bug in rdflib, but "n"^^xsd.integer produces this error
-        except IndexError:
-            pass
-        l = g.value(DUMMY_PREFIX.f, RDF.type)
-        if l is not None:
-            if not isinstance(l, rdflib.Literal) or l.value is None:
-                l = None
-        return l
+        return _parse_literal(str.__str__(v) if isinstance(v, str) else str(v))
 
     def _is_valid(cls, instance) -> bool:
         return Literal._to_n3(instance) is not None
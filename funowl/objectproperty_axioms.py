@@ -38,7 +38,7 @@ AsymmetricObjectProperty := 'AsymmetricObjectProperty' '(' axiomAnnotations Obje
 TransitiveObjectProperty := 'TransitiveObjectProperty' '(' axiomAnnotations ObjectPropertyExpression ')'
 """
 from dataclasses import dataclass
-from typing import List, Union, Optional
+from typing import List, Union, Optional, ClassVar, FrozenSet
 
 from rdflib import Graph, BNode, OWL, RDF, RDFS
 
@@ -100,6 +100,7 @@ class SubObjectPropertyOf(Annotatable):
 class EquivalentObjectProperties(Annotatable):
     objectPropertyExpressions: List[ObjectPropertyExpression]
     annotations: List[Annotation] = empty_list_wrapper(Annotation)
+    _set_fields: ClassVar[FrozenSet[str]] = Annotatable._set_fields | {'objectPropertyExpressions'}
 
     def __init__(self, *objectPropertyExpressions: ObjectPropertyExpression,
                  annotations: Optional[List[Annotation]] = None) -> None:
@@ -124,6 +125,7 @@ class EquivalentObjectProperties(Annotatable):
 class DisjointObjectProperties(Annotatable):
     objectPropertyExpressions: List[ObjectPropertyExpression]
     annotations: List[Annotation] = empty_list_wrapper(Annotation)
+    _set_fields: ClassVar[FrozenSet[str]] = Annotatable._set_fields | {'objectPropertyExpressions'}
 
     def __init__(self, *objectPropertyExpressions: ObjectPropertyExpression,
                  annotations: Optional[List[Annotation]] = None) -> None:
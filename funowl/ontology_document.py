@@ -9,9 +9,10 @@ Ontology :=
       axioms
    ')'
 """
-import sys
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, MISSING
-from typing import Optional, List, Union, Dict, cast
+from typing import Optional, List, Union, Dict, Iterator, Type, cast, TextIO, Tuple, Iterable, Any
+from warnings import warn
 
 from rdflib import Graph, RDF, OWL, URIRef, BNode, Literal as Rdflib_Literal, Namespace
 
@@ -19,7 +20,8 @@ from funowl.annotations import Annotation, AnnotationValue, AnnotationProperty,
 from funowl.assertions import DataPropertyAssertion
 from funowl.axioms import Axiom
 from funowl.base.fun_owl_base import FunOwlBase
-from funowl.base.list_support import empty_list_wrapper
+from funowl.base.lazy_axiom import LazyAxiom, axioms_of_type
+from funowl.base.list_support import empty_list_wrapper, ListWrapper
 from funowl.base.rdftriple import NODE, SUBJ
 from funowl.class_axioms import SubClassOf, EquivalentClasses
 from funowl.class_expressions import Class, ClassExpression
@@ -33,7 +35,7 @@ from funowl.objectproperty_axioms import SubObjectPropertyOf, SubObjectPropertyE
     FunctionalObjectProperty, InverseFunctionalObjectProperty, ObjectPropertyDomain, ObjectPropertyRange
 from funowl.objectproperty_expressions import ObjectPropertyExpression
 from funowl.prefix_declarations import Prefix, PrefixDeclarations
-from funowl.terminals.TypingHelper import isinstance_, proc_forwards
+from funowl.terminals.TypingHelper import isinstance_, proc_forwards, get_args
 from funowl.writers.FunctionalWriter import FunctionalWriter
 
 # Predicate that references the literal representation of the functional syntax of a subject
@@ -42,6 +44,62 @@ FUNOWL_URI = Namespace("http://ontologies-r.us/funowl/")
 FUNOWL_NAMESPACE = "funowl"
 IN_FUNCTIONAL = FUNOWL_URI.functional_definition
 
+# The concrete axiom classes -- an exact type match saves probing every member of the Axiom Union
+AXIOM_TYPES = frozenset(get_args(Axiom))
+
+# Number of runs of axioms handed to each worker in a parallel write.  More than one evens out the load
+WRITE_CHUNKS_PER_WORKER = 4
+
+# Namespaces of the writer that a parallel write is for -- set in each worker by _init_writer
+_worker_graph: Optional[Graph] = None
+
+
+def _init_writer(prefixes: Optional[List[Prefix]], namespaces: List[Tuple[str, str]]) -> None:
+    """ Process pool initializer -- share the prefix declarations and writer namespaces with each worker """
+    global _worker_graph
+    prefix_declarations = None
+    if prefixes is not None:
+        prefix_declarations = PrefixDeclarations()
+        for prefix in prefixes:
+            prefix_declarations.append(prefix)
+    IRI.prefix_declarations = prefix_declarations
+    _worker_graph = Graph(bind_namespaces="none")
+    for prefix, namespace in namespaces:
+        _worker_graph.bind(prefix, namespace, override=True, replace=True)
+
+
+def _render_axioms(axioms: List[Any], compact: bool) -> List[str]:
+    """ Process pool worker -- render a run of axioms the way that Ontology.to_functional does """
+    ontology_writer = FunctionalWriter(g=_worker_graph, compact=compact)
+    ontology_writer._inside_function = True
+    rval = []
+    for axiom in axioms:
+        if hasattr(axiom, 'to_functional'):
+            rval.append(str(axiom.to_functional(ontology_writer._nested())))
+        else:
+            rval.append(str(axiom))
+    return rval
+
+
+def _render_in_parallel(axioms: Iterable[Any], w: FunctionalWriter, workers: int) -> Iterator[str]:
+    """
+    Render axioms in a pool of worker processes
+
+    :param axioms: axioms to render
+    :param w: writer that the axioms are added to
+    :param workers: number of processes to use
+    :return: the functional syntax of each axiom, in order
+    """
+    axioms = list(axioms)
+    prefixes = list(IRI.prefix_declarations.as_prefixes()) if IRI.prefix_declarations is not None else None
+    namespaces = [(str(prefix), str(namespace)) for prefix, namespace in w.g.namespaces()]
+    chunk_size = max(-(-len(axioms) // (workers * WRITE_CHUNKS_PER_WORKER)), 1)
+    with ProcessPoolExecutor(workers, initializer=_init_writer, initargs=(prefixes, namespaces)) as executor:
+        pending = [executor.submit(_render_axioms, axioms[start:start + chunk_size], w.compact)
+                   for start in range(0, len(axioms), chunk_size)]
+        for future in pending:
+            yield from future.result()
+
 
 @dataclass
 class Import(FunOwlBase):
@@ -75,7 +133,8 @@ class Ontology(Annotatable):
         self.directlyImportsDocuments = cast(List[Import], [])
         while args and isinstance(args[0], Import):
             self.directlyImportsDocuments.append(args.pop(0))
-        self.axioms = cast(List[Axiom], [])
+        # Axioms are stored as they are added.  self.axioms.validate() checks them
+        self.axioms = ListWrapper([], Union[Axiom, LazyAxiom], validate=False)
         while args and isinstance_(args[0], Axiom):
             self.axioms.append(args.pop(0))
         self.annotations = kwargs.get('annotations', [])
@@ -90,23 +149,19 @@ class Ontology(Annotatable):
 
         if args:
             raise ValueError(f"Unrecognized arguments to Ontology: {args}")
-        self._naxioms = 0
 
-    def add_arg(self, arg: [IRI.types(), Import, Axiom, Annotation], print_progress: bool = True):
-        if isinstance_(arg, Axiom):
+    def add_arg(self, arg: [IRI.types(), Import, Axiom, LazyAxiom, Annotation], print_progress: Optional[bool] = None):
+        """
+        Add an IRI, import, annotation or axiom to the ontology
+
+        :param arg: element to add
+        :param print_progress: deprecated and ignored -- pass a progress function to to_python instead
+        """
+        if print_progress is not None:
+            warn("Ontology.add_arg no longer reports progress -- use the progress argument of to_python",
+                 DeprecationWarning, stacklevel=2)
+        if type(arg) in AXIOM_TYPES or isinstance(arg, LazyAxiom) or isinstance_(arg, Axiom):
             self.axioms.append(arg)
-            if print_progress:
-                self._naxioms += 1
-                if not self._naxioms % 100000:
-                    print(self._naxioms)
-                elif not self._naxioms % 10000:
-                    print(self._naxioms)
-                elif not self._naxioms % 1000:
-                    print('k', end='')
-                    sys.stdout.flush()
-                elif not self._naxioms % 100:
-                    print('.', end='')
-                    sys.stdout.flush()
         elif isinstance(arg, IRI):
             if not self.iri:
                 self.iri = arg
@@ -121,6 +176,15 @@ class Ontology(Annotatable):
         else:
             raise ValueError(f"Unrecognized argument to Ontology: {arg}")
 
+    def axioms_of_type(self, *types: Type) -> Iterator[Axiom]:
+        """
+        Return the axioms that are instances of any of types.  Lazily loaded axioms are selected without being parsed
+
+        :param types: axiom classes or Unions of classes (e.g. SubClassOf, ClassAxiom)
+        :return: matching axioms
+        """
+        return axioms_of_type(self.axioms, *types)
+
     # =======================
     # Syntactic sugar -- fill these in as needed
     # =======================
@@ -197,15 +261,24 @@ class Ontology(Annotatable):
     # Conversion functions
     # ====================
 
-    def to_functional(self, w: Optional[FunctionalWriter]) -> FunctionalWriter:
-        """ Return a FunctionalWriter instance with the representation of the ontology in functional syntax """
+    def to_functional(self, w: Optional[FunctionalWriter], workers: Optional[int] = None) -> FunctionalWriter:
+        """
+        Return a FunctionalWriter instance with the representation of the ontology in functional syntax
+
+        :param w: writer to add the ontology to.  Default: a new writer
+        :param workers: number of processes to render the axioms with.  Default: the writer's setting
+        :return: FunctionalWriter instance
+        """
         if self.version and not self.iri:
             raise ValueError(f"Ontology cannot have a versionIRI ({self.version} without an ontologyIRI")
         w = w or FunctionalWriter()
+        workers = w.workers if workers is None else workers
+        axioms = _render_in_parallel(self.axioms, w, workers) if workers > 1 and len(self.axioms) > 1 \
+            else self.axioms
         return w.func(self, lambda: w.opt(self.iri).opt(self.version).
                       br(bool(self.directlyImportsDocuments) or bool(self.annotations) or bool(self.axioms)).
                       iter(self.directlyImportsDocuments, indent=False).iter(self.annotations, indent=False).
-                      iter(self.axioms, indent=False), indent=False)
+                      iter(axioms, indent=False), indent=False)
 
     def _add_functional_definition(self, g: Graph, s: SUBJ, n: FunOwlBase) -> None:
         """ Add a functional definition for n to g """
@@ -306,13 +379,29 @@ class OntologyDocument(FunOwlBase):
             g.namespace_manager.bind(FUNOWL_NAMESPACE, FUNOWL_URI)
         return g
 
-    def to_functional(self, w: Optional[FunctionalWriter] = None) -> FunctionalWriter:
-        """ Return a FunctionalWriter instance with the representation of the OntologyDocument in functional syntax """
+    def to_functional(self, w: Optional[FunctionalWriter] = None, stream: Optional[TextIO] = None,
+                      workers: Optional[int] = None, compact: Optional[bool] = None) -> FunctionalWriter:
+        """
+        Return a FunctionalWriter instance with the representation of the OntologyDocument in functional syntax
+
+        :param w: writer to add the document to.  Default: a new writer
+        :param stream: text stream to write the document to as it is generated, instead of holding it in memory.
+        Ignored if w is supplied
+        :param workers: number of processes to render the axioms with.  The output is the same as a sequential
+        write.  Default: the writer's setting
+        :param compact: True means write each axiom on one line, with no indentation.  Default: the writer's setting
+        :return: FunctionalWriter instance
+        """
         IRI.prefix_declarations = self.prefixDeclarations
-        w = w or FunctionalWriter()
+        flush = w is None and stream is not None
+        w = w or FunctionalWriter(stream=stream)
+        if workers is not None:
+            w.workers = workers
+        if compact is not None:
+            w.compact = compact
         self.add_namespaces(w.g)
-        return w.iter(self.prefixDeclarations.as_prefixes(), indent=False).hardbr() + \
-               (self.ontology or Ontology())
+        w.iter(self.prefixDeclarations.as_prefixes(), indent=False).hardbr() + (self.ontology or Ontology())
+        return w.flush() if flush else w
 
     def to_rdf(self, g: Graph, emit_type_arc: bool = False, emit_functional_definitions: bool = False) -> SUBJ:
         """ Convert the ontology document into RDF representation """
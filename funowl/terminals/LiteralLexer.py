@@ -0,0 +1,56 @@
+"""
+Lexer for the Turtle form of a literal -- a quoted string with an optional '@lang' or '^^datatype'.
+
+Literal._to_n3 used to hand every candidate literal to the rdflib N3 parser.  lex_literal recognizes the forms that
+actually occur -- single or double quoted strings with the N3 escapes, language tags, and datatypes that are absolute
+IRIs or prefixed names -- and decodes them the same way.  Anything else (long strings, relative IRIs, unusual local
+names, trailing text, ...) is reported as unrecognized so that the caller can fall back on the N3 parser.
+"""
+import re
+from typing import Optional, Tuple, Mapping
+
+_ESCAPES = {'a': '\a', 'b': '\b', 'f': '\f', 'r': '\r', 't': '\t', 'v': '\v', 'n': '\n',
+            '\\': '\\', '"': '"', "'": "'"}
+
+# The escapes accepted by the N3 parser.  Note that a lone surrogate (\uD800) decodes as such, just as it does there
+_ESCAPE = r'''\\(?:[abfrtvn\\"']|u[0-9A-Fa-f]{4}|U[0-9A-Fa-f]{8})'''
+
+_literal_re = re.compile(rf'''
+    (?:"(?P<dq>(?:[^"\\\r\n]|{_ESCAPE})*)"
+      | '(?P<sq>(?:[^'\\\r\n]|{_ESCAPE})*)')
+    (?:@(?P<lang>[a-zA-Z0-9]+(?:-[a-zA-Z0-9]+)*)
+      | \^\^(?:<(?P<iri>[A-Za-z][A-Za-z0-9+.-]*:[^\x00-\x20<>"{{}}|^`\\]*)>
+              | (?P<prefix>(?:[A-Za-z][A-Za-z0-9_-]*)?):(?P<local>[A-Za-z_][A-Za-z0-9_-]*)))?
+    ''', flags=re.VERBOSE)
+
+_escape_re = re.compile(_ESCAPE)
+
+
+def _unescape(m: re.Match) -> str:
+    esc = m.group()
+    return chr(int(esc[2:], 16)) if len(esc) > 2 else _ESCAPES[esc[1]]
+
+
+def lex_literal(term: str, prefixes: Mapping[str, str]) -> Optional[Tuple[str, Optional[str], Optional[str]]]:
+    """
+    Split a Turtle literal into its parts
+
+    :param term: literal text, e.g. '"42"^^xsd:integer', '"chat"@fr' or '"a \\"quoted\\" word"'
+    :param prefixes: map from prefix to namespace for prefixed datatype names
+    :return: (decoded string, language tag, datatype IRI) or None if term isn't one of the recognized forms
+    """
+    m = _literal_re.fullmatch(term)
+    if m is None:
+        return None
+    value = m.group('dq')
+    if value is None:
+        value = m.group('sq')
+    if '\\' in value:
+        value = _escape_re.sub(_unescape, value)
+    datatype = m.group('iri')
+    if m.group('local') is not None:
+        namespace = prefixes.get(m.group('prefix'))
+        if namespace is None:
+            return None
+        datatype = namespace + m.group('local')
+    return value, m.group('lang'), datatype
@@ -1,8 +1,9 @@
 import re
 from abc import abstractmethod
+from functools import lru_cache
 from typing import Optional, Any, Union, Tuple
 
-from funowl.terminals.TypingHelper import isinstance_
+from funowl.terminals.TypingHelper import isinstance_, is_union, get_args, register_type_decider
 
 
 class Validateable:
@@ -22,6 +23,10 @@ class Validateable:
         return type(self).__name__
 
 
+# Number of match results remembered by each Pattern
+PATTERN_CACHE_SIZE = 4096
+
+
 class Pattern:
     """
     A lexerRuleBlock
@@ -33,6 +38,9 @@ class Pattern:
         :param pattern: regular expression
         """
         self.pattern_re = re.compile(pattern, flags=re.DOTALL)
+        # Patterns that match escaped characters (e.g. UCHAR) are applied to unescaped text
+        self.unescape = r'\\u' in pattern
+        self._matches = lru_cache(maxsize=PATTERN_CACHE_SIZE)(self._match)
 
     def __str__(self):
         return self.pattern_re.pattern
@@ -43,20 +51,57 @@ class Pattern:
         :param txt: text to check
         :return: True if match
         """
+        return self._matches(txt)
+
+    def _match(self, txt: str) -> bool:
         # rval = ref.getText()[1:-1].encode('utf-8').decode('unicode-escape')
-        if r'\\u' in self.pattern_re.pattern:
+        if self.unescape:
             txt = txt.encode('utf-8').decode('unicode-escape')
-        match = self.pattern_re.match(txt)
-        return match is not None and match.end() == len(txt)
+        return self.pattern_re.fullmatch(txt) is not None
+
+
+def _builtin_types(python_type: Any) -> Optional[Union[type, Tuple[type, ...]]]:
+    """ Return python_type in a form that the builtin isinstance accepts or None if it takes isinstance_ """
+    if python_type is Any:
+        return object
+    types = get_args(python_type) if is_union(python_type) else python_type
+    if isinstance(types, type) or (isinstance(types, tuple) and all(isinstance(t, type) for t in types)):
+        return types
+    return None
 
 
 class PatternedValMeta(type):
     pattern: Optional[Pattern]
     python_type: None
 
+    def __init__(cls, name, bases, namespace) -> None:
+        super().__init__(name, bases, namespace)
+        cls._builtin_types = _builtin_types(getattr(cls, 'python_type', None))
+
     def __instancecheck__(self, instance) -> bool:
-        return instance is not None and \
-               isinstance_(instance, self.python_type) and (self.pattern is None or self.pattern.matches(str(instance)))
+        # Instances of the class itself were validated when they were constructed
+        if issubclass(type(instance), self):
+            return True
+        if instance is None:
+            return False
+        if self._builtin_types is not None:
+            if not isinstance(instance, self._builtin_types):
+                return False
+        elif not isinstance_(instance, self.python_type):
+            return False
+        return self.pattern is None or self.pattern.matches(str(instance))
+
+
+def _decide_type(value_type: type, typ: PatternedValMeta) -> Optional[bool]:
+    """ type_decides for patterned classes -- only the builtin type check can be made without the value """
+    if issubclass(value_type, typ):
+        return True
+    if typ._builtin_types is not None and not issubclass(value_type, typ._builtin_types):
+        return False
+    return None
+
+
+register_type_decider(PatternedValMeta, _decide_type)
 
 
 class Patterned(Validateable, metaclass=PatternedValMeta):
@@ -2,9 +2,10 @@
 Helper functions for typing library.  Variation on the version in pyjsg library
 """
 import sys
+from abc import ABCMeta
 from collections import UserList
 from dataclasses import fields
-from typing import Any, Iterable, TypeVar, _eval_type, Union
+from typing import Any, Iterable, TypeVar, _eval_type, Union, Callable, Dict, Optional, Tuple
 
 if sys.version_info < (3, 8):
     def get_origin(typ):
@@ -26,6 +27,17 @@ def is_union(etype) -> bool:
     return get_origin(etype) is Union
 
 
+def flatten_unions(types: Iterable[Any]) -> Tuple[Any, ...]:
+    """ Expand any Unions in types into their member types """
+    rval = []
+    for typ in types:
+        if is_union(typ):
+            rval += flatten_unions(get_args(typ))
+        else:
+            rval.append(typ)
+    return tuple(rval)
+
+
 def is_dict(etype) -> bool:
     """ Determine whether etype is a Dict """
     return get_origin(etype) is dict or etype is dict
@@ -53,42 +65,153 @@ def issubclass_(x, A_tuple):
     return isinstance_(type(x), A_tuple)
 
 
-def isinstance_(x, test_type):
-    """ native isinstance_ with the test for typing.Union overridden """
+# Number of type hints whose compiled isinstance_ checks are kept
+PREDICATE_CACHE_SIZE = 4096
+
+# id(type hint) -> (type hint, check).  Keyed on the id because hashing a Union hashes every one of its members
+_predicates: Dict[int, Tuple[Any, Callable[[Any], bool]]] = {}
+
+# Metaclass __instancecheck__ -> function of (type of value, class) that returns the outcome of isinstance for every
+# value of that type or None if the outcome depends on the value.  See register_type_decider
+_type_deciders: Dict[Callable, Callable[[type, type], Optional[bool]]] = {
+    type.__instancecheck__: issubclass,
+    ABCMeta.__instancecheck__: issubclass
+}
+
+
+def register_type_decider(metaclass: type, decider: Callable[[type, type], Optional[bool]]) -> None:
+    """
+    Tell type_decides how to evaluate isinstance for the classes of a metaclass that overrides __instancecheck__
+
+    :param metaclass: metaclass
+    :param decider: function of (type of value, class) that returns True or False if isinstance(v, class) has that
+    outcome for every v of the type and None if the outcome depends on v
+    """
+    _type_deciders[metaclass.__instancecheck__] = decider
+
+
+def type_decides(value_type: type, typ: Any) -> Optional[bool]:
+    """
+    Evaluate isinstance_(v, typ) for any v of type value_type
+
+    :param value_type: type of the value
+    :param typ: type to test against
+    :return: the outcome or None if it depends on the value itself (e.g. a string that must match a pattern)
+    """
+    if not isinstance(typ, type) or get_origin(typ) is not None:
+        return None
+    # isinstance doesn't consult __instancecheck__ when the type matches exactly
+    if value_type is typ:
+        return True
+    decider = _type_deciders.get(type(typ).__instancecheck__)
+    return decider(value_type, typ) if decider is not None else None
+
+
+def _always(_: Any) -> bool:
+    return True
+
+
+def _never(_: Any) -> bool:
+    return False
+
+
+def _union_plan(value_type: type, members: Tuple[Any, ...], checks: Tuple[Callable[[Any], bool], ...]) \
+        -> Union[bool, Tuple[Callable[[Any], bool], ...]]:
+    """ Return the outcome of a Union check for values of value_type or the member checks that still have to be made """
+    plan = []
+    for member, check in zip(members, checks):
+        decided = type_decides(value_type, member)
+        if decided is None:
+            plan.append(check)
+        elif decided:
+            if not plan:
+                return True
+            plan.append(_always)
+            break
+    return tuple(plan) if plan else False
+
+
+def _compile(test_type: Any) -> Callable[[Any], bool]:
+    """ Turn test_type into a function that evaluates isinstance_(x, test_type) """
     # TODO: TypeVar instances are treated as Any for the time being
     if test_type is Any or isinstance(test_type, TypeVar):
-        return True
+        return _always
 
     if is_union(test_type):
-        return any(isinstance_(x, t) for t in get_args(test_type))
+        members = get_args(test_type)
+        checks = tuple(predicate(t) for t in members)
+        union_plans: Dict[type, Union[bool, Tuple[Callable[[Any], bool], ...]]] = {}
+
+        def check_union(x: Any) -> bool:
+            plan = union_plans.get(type(x))
+            if plan is None:
+                plan = union_plans[type(x)] = _union_plan(type(x), members, checks)
+            if plan is True or plan is False:
+                return plan
+            return any(check(x) for check in plan)
+        return check_union
 
     if is_dict(test_type):
-        if isinstance(x, dict):
-            dict_args = get_args(test_type)
-            return all(isinstance_(k, dict_args[0]) and isinstance_(v, dict_args[1])
-                       for k, v in x.items()) if dict_args else True
-        else:
-            return False
+        dict_args = get_args(test_type)
+        if not dict_args:
+            return lambda x: isinstance(x, dict)
+        check_key, check_value = predicate(dict_args[0]), predicate(dict_args[1])
+        return lambda x: isinstance(x, dict) and all(check_key(k) and check_value(v) for k, v in x.items())
 
     if is_list(test_type):
-        if isinstance(x, list) or isinstance(x, UserList):
-            list_type = get_args(test_type)
-            return all(isinstance_(t, list_type[0]) for t in x) if list_type else True
-        else:
-            return False
+        list_type = get_args(test_type)
+        if not list_type:
+            return lambda x: isinstance(x, (list, UserList))
+        check_element = predicate(list_type[0])
+        return lambda x: isinstance(x, (list, UserList)) and all(check_element(e) for e in x)
 
     if is_tuple(test_type):
-        if isinstance(x, tuple):
-            tuple_args = get_args(test_type)
-            return all(isinstance_(xv, tv) for xv, tv in zip(x, tuple_args)) if tuple_args else True
-        else:
-            return False
+        tuple_checks = tuple(predicate(t) for t in get_args(test_type))
+        if not tuple_checks:
+            return lambda x: isinstance(x, tuple)
+        return lambda x: isinstance(x, tuple) and all(check(xv) for xv, check in zip(x, tuple_checks))
 
     if is_set(test_type):
-        if isinstance(x, set):
-            set_type = get_args(test_type)
-            return all(isinstance_(e, set_type[0]) for e in x) if set_type else True
-        else:
-            return False
+        set_type = get_args(test_type)
+        if not set_type:
+            return lambda x: isinstance(x, set)
+        check_element = predicate(set_type[0])
+        return lambda x: isinstance(x, set) and all(check_element(e) for e in x)
+
+    if get_origin(test_type) is not None:
+        return _never
+    if not isinstance(test_type, type) or _type_deciders.get(type(test_type).__instancecheck__) is issubclass:
+        return lambda x: isinstance(x, test_type)
+
+    # Classes that override isinstance
+    outcomes: Dict[type, Optional[bool]] = {}
+
+    def check_class(x: Any) -> bool:
+        try:
+            decided = outcomes[type(x)]
+        except KeyError:
+            decided = outcomes[type(x)] = type_decides(type(x), test_type)
+        return isinstance(x, test_type) if decided is None else decided
+    return check_class
+
+
+def predicate(test_type: Any) -> Callable[[Any], bool]:
+    """
+    Return a function that evaluates isinstance_(x, test_type).  Functions are compiled once per type hint and decide
+    by the type of x alone wherever they can
+
+    :param test_type: type or typing construct
+    :return: function of x
+    """
+    entry = _predicates.get(id(test_type))
+    if entry is None or entry[0] is not test_type:
+        if len(_predicates) >= PREDICATE_CACHE_SIZE:
+            _predicates.clear()
+        entry = _predicates[id(test_type)] = (test_type, _compile(test_type))
+    return entry[1]
 
-    return get_origin(test_type) is None and isinstance(x, test_type)
+
+def isinstance_(x, test_type):
+    """ native isinstance_ with the test for typing.Union overridden """
+    entry = _predicates.get(id(test_type))
+    return (entry[1] if entry is not None and entry[0] is test_type else predicate(test_type))(x)
@@ -1,17 +1,62 @@
-from typing import List, Optional, Callable, Union, Any, Iterable
+from typing import List, Optional, Callable, Union, Any, Iterable, TextIO
 
 from rdflib import Graph, OWL, URIRef
 
 
+class _LineSink:
+    """
+    Where a streaming FunctionalWriter sends its complete lines.  The last line with content and the blank lines after
+    it are held back, as the line may yet be continued and trailing blank lines are dropped.  The rest are forwarded.
+    The first line continues the line that the writer's output was added to (prefix)
+    """
+    def __init__(self, forward: Callable[[str], None], prefix: str = '') -> None:
+        self.forward = forward
+        self.prefix = prefix
+        self.started = False
+        self.held: List[str] = []
+
+    def push(self, line: str) -> None:
+        if not self.started:
+            line = self.prefix + line
+            self.started = True
+        if line.strip():
+            self.flush()
+        self.held.append(line)
+
+    def flush(self) -> None:
+        """ Forward the lines that are held back """
+        for line in self.held:
+            self.forward(line)
+        self.held = []
+
+    def close(self) -> Optional[str]:
+        """ Take back the last line with content, if any, and drop the blank lines after it """
+        line = self.held[0] if self.held and self.held[0].strip() else None
+        self.held = []
+        return line
+
+
 class FunctionalWriter:
     DEFAULT_TAB: str = '    '
 
-    def __init__(self, tab: Optional[str] = None, g: Optional[Graph] = None) -> None:
+    def __init__(self, tab: Optional[str] = None, g: Optional[Graph] = None, stream: Optional[TextIO] = None,
+                 workers: int = 1, compact: bool = False) -> None:
         """ Create a FunctionalWriter instance
 
         :param tab: what to emit for a tab setting.  Default: DEFAULT_TAB
         :param g: graph to use for IRI resolution.  Default - default rdflib graph
+        :param stream: text stream to write the output to as it is generated.  The output is the same as getvalue()
+        would return, but only the line that is being built is held in memory.  Call flush() once it is complete
+        :param workers: number of processes to render the axioms of an ontology with.  The output is the same
+        :param compact: write the elements inside a function (e.g. the axioms of an ontology) on one line each, with
+        single spaces between the tokens.  Line breaks in quoted strings are written as escapes
         """
+        self._stream = stream
+        self.workers = workers
+        self.compact = compact
+        self._flat = False          # Line breaks and indentation become single spaces
+        self._written = False
+        self._sink = _LineSink(self._write) if stream is not None else None
         self.tab = FunctionalWriter.DEFAULT_TAB if tab is None else tab
         if g is None:
             self.g = Graph(bind_namespaces="core")
@@ -59,14 +104,77 @@ class FunctionalWriter:
         """
         for el in eles:
             if hasattr(el, 'to_functional') and callable(getattr(el, 'to_functional')):
-                w = FunctionalWriter(g=self.g)
-                w._inside_function = self._inside_function
+                if self._flat:
+                    self._flat_element(el, sep)
+                    continue
+                if self._sink is not None:
+                    self._stream_element(el, sep)
+                    continue
+                w = self._nested()
                 line = str(el.to_functional(w))
             elif isinstance(el, FunctionalWriter):
                 raise ValueError("FunctionalWriter can never be concatenated to itself")
             else:
                 line = str(el)
-            self._line += (sep if not self.bol() else '') + line
+            line = (sep if not self.bol() else '') + line
+            if self.compact:
+                # Runs of separators (e.g. w + a + ' ' + b) come out as a single space
+                line = line.lstrip() if self._line[-1:].isspace() else ' ' if line.isspace() else line
+            self._line += line
+        return self
+
+    def _nested(self) -> "FunctionalWriter":
+        """ Return a writer for an element that is added to this one """
+        w = FunctionalWriter(g=self.g, workers=self.workers, compact=self.compact)
+        w._inside_function = self._inside_function
+        w._flat = self._flat or (self.compact and self._inside_function)
+        return w
+
+    def _flat_element(self, el: Any, sep: str) -> None:
+        """ Flat form of concat for an element -- a flat writer never breaks a line, so the element is rendered in
+        place rather than in a writer of its own """
+        line, inside = self._line, self._inside_function
+        self._line = ''
+        el.to_functional(self)
+        self._inside_function = inside
+        element_line = self._line.strip()
+        self._line = line + (sep if line.strip() and not line[-1].isspace() else '') + element_line
+
+    def _stream_element(self, el: Any, sep: str) -> None:
+        """ Streaming form of concat for an element -- its lines are passed on as they are completed """
+        w = self._nested()
+        prefix = self._line + (sep if not self.bol() else '')
+        sink = w._sink = _LineSink(self._push, prefix)
+        el.to_functional(w)
+        # Carry on from the element's last line with content, as if the element had been rendered to a string
+        if not w.bol():
+            sink.flush()
+            self._line = (prefix if not sink.started else '') + w._line.rstrip()
+        else:
+            last = sink.close()
+            self._line = prefix if last is None else last
+
+    def _push(self, line: str) -> None:
+        """ Add a complete line to the output """
+        if self._sink is None:
+            self.output.append(line)
+        else:
+            self._sink.push(line)
+
+    def _write(self, line: str) -> None:
+        self._stream.write('\n' + line if self._written else line)
+        self._written = True
+
+    def flush(self) -> "FunctionalWriter":
+        """
+        Write the output that a streaming writer is holding back.  Call once the output is complete
+        :return: FunctionWriter instance
+        """
+        if self._stream is not None:
+            self.br()
+            last = self._sink.close()
+            if last is not None:
+                self._write(last.rstrip())
         return self
 
     def bol(self) -> bool:
@@ -77,6 +185,8 @@ class FunctionalWriter:
         """
         Return the current writer content
         """
+        if self._sink is not None:
+            raise ValueError("A streaming FunctionalWriter writes its content to its stream")
         return '\n'.join(self.contents).rstrip()
 
     @property
@@ -89,6 +199,8 @@ class FunctionalWriter:
         :param line: String or to add to the output
         :return: FunctionWriter instance
         """
+        if self._flat:
+            return self.opt(line)
         if line is not None:
             self.concat(line, sep='')
         return self.br()
@@ -106,9 +218,9 @@ class FunctionalWriter:
         :param cond: If false, act as a no-op
         :return: FunctionWriter instance
         """
-        if cond:
+        if cond and not self._flat:
             if not self.bol():
-                self.output.append(self._line.rstrip())
+                self._push(self._line.rstrip())
             self._line = self.tab * self._indent
         return self
 
@@ -116,16 +228,20 @@ class FunctionalWriter:
         """ Output a line break and then indent
         :return: FunctionWriter instance
         """
+        if self._flat:
+            return self
         if not self.bol():
             self.br()
         else:
-            self.output.append('')
+            self._push('')
         return self
 
     def indent(self, line: Optional[Any] = None) -> "FunctionalWriter":
         """ Flush the buffer and increase the indent level
         :return: FunctionWriter instance
         """
+        if self._flat:
+            return self.opt(line)
         self._indent += 1
         return self.br().add(line)
 
@@ -133,6 +249,8 @@ class FunctionalWriter:
         """ Flush the buffer and decrease the indent level
         :return: FunctionWriter instance
         """
+        if self._flat:
+            return self.opt(line)
         self._indent = max(self._indent - 1, 0)
         return self.br().add(line)
 
@@ -189,7 +307,7 @@ class FunctionalWriter:
         return self if v is None else self.concat(v, sep=sep)
 
     def __repr__(self):
-        return '"' + self.getvalue() + '"'
+        return object.__repr__(self) if self._sink is not None else '"' + self.getvalue() + '"'
 
     def __str__(self):
         return self.getvalue()
@@ -0,0 +1,45 @@
+import unittest
+from dataclasses import fields
+from unittest.mock import patch
+
+from rdflib import Literal
+
+from funowl import SubClassOf, ObjectSomeValuesFrom, Class, ObjectIntersectionOf, AnnotationAssertion, \
+    ObjectUnionOf
+from funowl.base.cast_function import cast, _cast_plan
+from funowl.general_definitions import AbbreviatedIRI
+
+
+def field_of(cls, name):
+    return next(f for f in fields(cls) if f.name == name)
+
+
+class CastFunctionTestCase(unittest.TestCase):
+    def test_cast_plans(self):
+        """ Values whose type determines the outcome get a plan that casts them as the full search would """
+        sub = field_of(SubClassOf, 'subClassExpression')
+        operands = field_of(ObjectUnionOf, 'classExpressions')
+        iri = AbbreviatedIRI('pizza:Margherita')
+        expr = ObjectSomeValuesFrom(iri, iri)
+        for cast_to, v in ((sub, iri), (sub, expr), (operands, [iri, expr]), (operands, iri)):
+            plan = _cast_plan(cast_to, type(v))
+            self.assertIsNotNone(plan)
+            self.assertIs(plan, _cast_plan(cast_to, type(v)))
+            with patch('funowl.base.cast_function.USE_CAST_PLANS', False):
+                expected = cast(cast_to, v)
+            actual = cast(cast_to, v)
+            self.assertEqual(expected, actual)
+            self.assertEqual(repr(expected), repr(actual))
+        self.assertIs(type(cast(sub, iri)), Class)
+        self.assertIs(expr, cast(sub, expr))
+
+        # Strings and literals have to be checked one at a time
+        self.assertIsNone(_cast_plan(sub, str))
+        self.assertIsNone(_cast_plan(field_of(AnnotationAssertion, 'value'), Literal))
+        self.assertEqual(ObjectIntersectionOf(':A', ':B'), cast(sub, ObjectIntersectionOf(':A', ':B')))
+        with self.assertRaises(TypeError):
+            cast(sub, 17)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import pickle
+import subprocess
+import sys
+import unittest
+from types import FunctionType
+
+from rdflib import Graph, Namespace
+
+from funowl import SubClassOf, ObjectSomeValuesFrom, EquivalentClasses, Ontology, Class, ObjectIntersectionOf, \
+    Declaration
+from funowl.compact import compact, COMPACT_CLASSES
+import funowl.compact as compact_classes
+from funowl.converters.functional_converter import to_python
+from tests import datadir
+from tests.utils.base import TestBase
+
+EX = Namespace('http://example.org/')
+
+
+class CompactTestCase(TestBase):
+    def test_compact_classes(self):
+        """ Compact nodes have no __dict__, keep lists in tuples and pass for the model classes """
+        axiom = compact_classes.SubClassOf(':A', compact_classes.ObjectSomeValuesFrom(':p', ':B'))
+        self.assertFalse(hasattr(axiom, '__dict__'))
+        self.assertIsInstance(axiom, SubClassOf)
+        self.assertIsInstance(axiom.superClassExpression, ObjectSomeValuesFrom)
+        self.assertEqual(Class(':A'), axiom.subClassExpression)
+        self.assertEqual(str(SubClassOf(':A', ObjectSomeValuesFrom(':p', ':B')).to_functional(self.w.reset())),
+                         str(axiom.to_functional(self.w.reset())))
+        equivalents = compact_classes.EquivalentClasses(':A', ':B', ':C')
+        self.assertEqual((Class(':A'), Class(':B'), Class(':C')), equivalents.classExpressions)
+        self.assertEqual(equivalents, pickle.loads(pickle.dumps(equivalents)))
+
+        # Model objects take compact nodes as they are
+        o = Ontology(':o', axiom)
+        o.axioms.append(equivalents)
+        self.assertIs(axiom, o.axioms[0])
+        self.assertIs(equivalents, o.axioms[1])
+        self.assertIs(axiom.superClassExpression,
+                      SubClassOf(':A', axiom.superClassExpression).superClassExpression)
+        self.assertNotIn(EquivalentClasses, COMPACT_CLASSES.values())
+
+    def test_rebound_super(self):
+        """ Methods that use zero argument super() are rebound to the compact class """
+        intersection = compact_classes.ObjectIntersectionOf(':A', ':B')      # __init__ calls super().__init__
+        self.assertEqual((Class(':A'), Class(':B')), intersection.classExpressions)
+        self.assertEqual(ObjectIntersectionOf(':A', ':B'), intersection)
+        self.assertEqual(hash(ObjectIntersectionOf(':A', ':B')), hash(intersection))
+        g, expected = Graph(), Graph()
+        compact_classes.Declaration(Class(EX.A)).to_rdf(g)                  # to_rdf calls super().to_rdf
+        Declaration(Class(EX.A)).to_rdf(expected)
+        self.assertEqual(set(expected), set(g))
+
+        for compact_cls in COMPACT_CLASSES.values():
+            for name, member in vars(compact_cls).items():
+                for f in (member.fget, member.fset, member.fdel) if isinstance(member, property) else \
+                        (getattr(member, '__func__', member), ):
+                    if isinstance(f, FunctionType) and '__class__' in f.__code__.co_freevars:
+                        cell = f.__closure__[f.__code__.co_freevars.index('__class__')]
+                        self.assertIs(compact_cls, cell.cell_contents, f"{compact_cls.__name__}.{name}")
+
+    def test_opt_in(self):
+        """ Importing funowl.compact doesn't register the compact classes -- using them does """
+        script = """
+import funowl, funowl.compact as compact_classes
+assert not compact_classes.COMPACT_CLASSES and 'SubClassOf' not in vars(compact_classes)
+assert isinstance(compact_classes.SubClassOf(':A', ':B'), funowl.SubClassOf)
+assert compact_classes.COMPACT_CLASSES[funowl.SubClassOf] is compact_classes.SubClassOf
+"""
+        subprocess.run([sys.executable, '-c', script], check=True, cwd=os.path.dirname(os.path.dirname(datadir)))
+
+    def test_compact(self):
+        """ A compacted document is written exactly as the original was """
+        doc = to_python(os.path.join(datadir, 'pizza.owl'), print_progress=False)
+        expected = str(doc.to_functional())
+        self.assertIs(doc, compact(doc))
+        self.assertTrue(all(type(a) in COMPACT_CLASSES.values() for a in doc.ontology.axioms))
+        self.assertEqual(expected, str(doc.to_functional()))
+        axiom = doc.ontology.axioms[-1]
+        self.assertIs(axiom, compact(axiom))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import copy
+import os
+import pickle
+import unittest
+
+from funowl import ObjectSomeValuesFrom, ObjectIntersectionOf, DataSomeValuesFrom, DatatypeRestriction, Class, \
+    SubClassOf
+from funowl.base.expression_table import ExpressionTable
+import funowl.compact as compact_classes
+from funowl.converters.functional_converter import to_python, iter_axioms
+from funowl.identifiers import IRITable
+from tests import datadir
+
+
+class ExpressionTableTestCase(unittest.TestCase):
+    def test_sharing(self):
+        """ Structurally equal expressions constructed while a table is active are one instance """
+        table = ExpressionTable()
+        with table.active():
+            some = ObjectSomeValuesFrom(':p', ObjectIntersectionOf(':A', ':B'))
+            self.assertIs(some, ObjectSomeValuesFrom(':p', ObjectIntersectionOf(':A', ':B')))
+            self.assertIsNot(some, ObjectSomeValuesFrom(':p', ObjectIntersectionOf(':B', ':A')))
+            self.assertIs(some.classExpression, ObjectIntersectionOf(':A', ':B'))
+            restriction = DatatypeRestriction('xsd:integer', 'xsd:minInclusive', '"1"^^xsd:integer')
+            self.assertIs(restriction, DatatypeRestriction('xsd:integer', 'xsd:minInclusive', '"1"^^xsd:integer'))
+            self.assertIs(DataSomeValuesFrom(':d', restriction), DataSomeValuesFrom(':d', restriction))
+            compact_some = compact_classes.ObjectSomeValuesFrom(':p', ':A')
+            self.assertIs(compact_some, compact_classes.ObjectSomeValuesFrom(':p', ':A'))
+        self.assertEqual(8, len(table))
+        self.assertIsNot(some, ObjectSomeValuesFrom(':p', ObjectIntersectionOf(':A', ':B')))
+        self.assertEqual(some, ObjectSomeValuesFrom(':p', ObjectIntersectionOf(':A', ':B')))
+
+        # Expressions built without a table are shared through intern
+        built = ObjectSomeValuesFrom(':p', ObjectIntersectionOf(':A', ':B'))
+        self.assertIs(some, table.intern(built))
+        self.assertIsNot(built, ExpressionTable().intern(built))
+        built.classExpression = Class(':C')
+        self.assertIs(some, table.intern(ObjectSomeValuesFrom(':p', ObjectIntersectionOf(':A', ':B'))))
+
+    def test_immutable(self):
+        """ Shared expressions can't be modified, but their copies can """
+        with ExpressionTable().active():
+            intersection = ObjectIntersectionOf(':A', ':B')
+            some = ObjectSomeValuesFrom(':p', intersection)
+        with self.assertRaises(AttributeError):
+            some.classExpression = Class(':C')
+        with self.assertRaises(TypeError):
+            intersection.classExpressions.append(Class(':C'))
+        self.assertEqual([Class(':A'), Class(':B')], intersection.classExpressions)
+
+        mutable = copy.copy(intersection)
+        mutable.classExpressions.append(Class(':C'))
+        self.assertEqual(2, len(intersection.classExpressions))
+        deep = copy.deepcopy(some)
+        deep.classExpression.classExpressions.append(Class(':C'))
+        deep.classExpression = Class(':C')
+        self.assertEqual(some, pickle.loads(pickle.dumps(some)))
+
+    def test_parser(self):
+        """ The parser shares the expressions of a document """
+        table = ExpressionTable()
+        doc = to_python("""Prefix(:=<http://example.org/>)
+Ontology(<http://example.org/o>
+    SubClassOf(:A ObjectSomeValuesFrom(:p :Heart))
+    SubClassOf(:B ObjectSomeValuesFrom(:p :Heart))
+)""", print_progress=False, expression_table=table)
+        first, second = doc.ontology.axioms
+        self.assertIs(first.superClassExpression, second.superClassExpression)
+        self.assertEqual(1, len(table))
+        self.assertIsInstance(SubClassOf(':C', first.superClassExpression), SubClassOf)
+
+        # Without a table, parsed expressions are separate objects that can be modified
+        doc = to_python("""Prefix(:=<http://example.org/>)
+Ontology(<http://example.org/o>
+    SubClassOf(:A ObjectIntersectionOf(:Heart :Organ))
+    SubClassOf(:B ObjectIntersectionOf(:Heart :Organ))
+)""", print_progress=False)
+        first, second = doc.ontology.axioms
+        self.assertIsNot(first.superClassExpression, second.superClassExpression)
+        first.superClassExpression.classExpressions.append(Class(':Muscle'))
+        first.superClassExpression.classExpressions = [Class(':Heart')]
+        self.assertEqual(2, len(second.superClassExpression.classExpressions))
+
+    def test_parallel(self):
+        """ A parallel parse shares IRIs and expressions across its chunks through the tables that it is given """
+        pizza = os.path.join(datadir, 'pizza.owl')
+        sequential = IRITable(), ExpressionTable()
+        to_python(pizza, print_progress=False, iri_table=sequential[0], expression_table=sequential[1])
+        iri_table, expression_table = IRITable(), ExpressionTable()
+        doc = to_python(pizza, print_progress=False, workers=2, iri_table=iri_table, expression_table=expression_table)
+        self.assertEqual((len(sequential[0]), len(sequential[1])), (len(iri_table), len(expression_table)))
+        subclass_axioms = [a for a in doc.ontology.axioms if isinstance(a, SubClassOf)]
+        with iri_table.active(), expression_table.active():
+            for axiom in subclass_axioms:
+                self.assertIs(axiom.subClassExpression, Class(str(axiom.subClassExpression)))
+                self.assertIs(axiom.superClassExpression, expression_table.intern(axiom.superClassExpression))
+
+        # Without tables nothing is shared or frozen
+        axiom = next(a for a in iter_axioms(pizza, workers=2) if isinstance(a, SubClassOf) and
+                     isinstance(a.superClassExpression, ObjectSomeValuesFrom))
+        axiom.superClassExpression.classExpression = Class(':C')
+        axiom.subClassExpression.v = ':D'
+
+
+if __name__ == '__main__':
+    unittest.main()
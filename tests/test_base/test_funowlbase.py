@@ -1,9 +1,12 @@
 import unittest
 from dataclasses import dataclass, fields, field
 from typing import List, Union, Optional
+from unittest.mock import patch
 
 # This has to be global for the cast forwards to work correctly
-from funowl.base.fun_owl_base import FunOwlBase
+from funowl import Class, SubClassOf, EquivalentClasses
+from funowl.base.cast_function import cast
+from funowl.base.fun_owl_base import FunOwlBase, trusted, class_metadata
 from funowl.base.fun_owl_choice import FunOwlChoice
 from funowl.base.list_support import empty_list_wrapper
 from funowl.terminals.TypingHelper import proc_forwards
@@ -189,6 +192,45 @@ class FunOwlBaseTestCase(TestBase):
         self.assertEqual(['jane', 'sally'], x.v1)
         self.assertEqual('    jane\n    sally', str(x.to_functional(self.w)))
 
+    def test_trusted(self):
+        """ Inside trusted(), values that are already of a declared type are stored without a cast """
+        a, b = Class(':A'), Class(':B')
+        with patch('funowl.base.fun_owl_base.cast', side_effect=cast) as mock_cast:
+            SubClassOf(a, b)
+            self.assertTrue(mock_cast.called)
+            mock_cast.reset_mock()
+            with trusted():
+                sco = SubClassOf(a, b)
+                ec = EquivalentClasses(a, b)
+            mock_cast.assert_not_called()
+        self.assertIs(a, sco.subClassExpression)
+        self.assertEqual([a, b], ec.classExpressions)
+        self.assertIs(list, type(ec.classExpressions))
+
+        # Anything else is coerced as usual
+        with trusted():
+            sco = SubClassOf(':A', b)
+        self.assertEqual(Class(':A'), sco.subClassExpression)
+        with self.assertRaises(TypeError):
+            with trusted():
+                SubClassOf(a, 17)
+
+    def test_class_metadata(self):
+        """ Field lookups are built once per class and follow types that are resolved later """
+        @dataclass
+        class Choice(FunOwlChoice):
+            v: Union[int, "C1", str] = field(metadata=dict(exclude=[str]))
+
+        metadata = class_metadata(Choice)
+        self.assertIs(metadata, class_metadata(Choice))
+        self.assertIs(Choice.v_field(), metadata.fields['v'])
+        self.assertEqual(2, len(Choice.real_types()))
+        self.assertIs(Choice.real_types(), Choice.real_types())
+        proc_forwards(Choice, globals())
+        self.assertEqual([int, C1], Choice.real_types())
+        self.assertEqual(C1, Choice(C1(1)).v.__class__)
+        self.assertIsNone(Choice(17)._field_for('w'))
+
 
 if __name__ == '__main__':
     unittest.main()
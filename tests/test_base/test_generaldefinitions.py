@@ -2,7 +2,8 @@ import unittest
 
 from rdflib import URIRef
 
-from funowl.general_definitions import NonNegativeInteger, QuotedString, LanguageTag, NodeID, FullIRI, PrefixName
+from funowl.general_definitions import NonNegativeInteger, QuotedString, LanguageTag, NodeID, FullIRI, PrefixName, \
+    IRI_VALIDATION_STRICT, IRI_VALIDATION_FAST, IRI_VALIDATION_OFF
 from funowl.ontology_document import Ontology
 from tests.utils.base import TestBase
 
@@ -62,6 +63,24 @@ class TestGeneralDefinitons(TestBase):
         with self.assertRaises(TypeError):
             FullIRI("//just/a/path:")
 
+    def test_fullIRI_validation(self):
+        """ Each validation level accepts a superset of the one above it """
+        iris = ['http://example.org/a/b?c=d#e', 'urn:isbn:0451450523', 'http://example.org/caf%C3%A9', 'ex:é']
+        almost = ['http://example.org/a b', 'http://[bad/', 'http://example.org/%zz']
+        not_iris = ['"Cajun"', 'Alan Rector', '//just/a/path:', '']
+        self.assertEqual(IRI_VALIDATION_STRICT, FullIRI.VALIDATION)
+        try:
+            for level, valid in ((IRI_VALIDATION_STRICT, iris), (IRI_VALIDATION_FAST, iris + almost[1:]),
+                                 (IRI_VALIDATION_OFF, iris + almost)):
+                FullIRI.VALIDATION = level
+                for v in iris + almost + not_iris:
+                    self.assertEqual(v in valid, isinstance(v, FullIRI), f"{level}: {v}")
+            FullIRI.VALIDATION = 'sloppy'
+            with self.assertRaises(ValueError):
+                FullIRI('http://example.org/')
+        finally:
+            FullIRI.VALIDATION = IRI_VALIDATION_STRICT
+
     def test_fullIRI_URIRef(self):
         self.assertEqual('http://example.org/foo#', FullIRI(URIRef("http://example.org/foo#")))
         self.assertTrue(isinstance(URIRef("http://example.org/foo#"), FullIRI))
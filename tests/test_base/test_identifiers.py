@@ -1,8 +1,12 @@
+import copy
+import pickle
 import unittest
 
 from rdflib import RDFS, OWL
 
-from funowl.identifiers import IRI
+from funowl import Class, SubClassOf
+from funowl.converters.functional_converter import to_python
+from funowl.identifiers import IRI, IRITable
 from tests.utils.base import TestBase
 
 
@@ -21,6 +25,39 @@ class IdentifiersTestCase(TestBase):
         x5 = IRI('foo:type')
         self.assertEqual('foo:type', x5.to_functional(w.reset()).getvalue())
 
+    def test_iri_table(self):
+        table = IRITable()
+        with table.active():
+            self.assertIs(Class(':A'), Class(':A'))
+            self.assertIsNot(Class(':A'), IRI(':A'))
+            self.assertEqual(2, len(table))
+            a = Class(':A')
+        self.assertIsNot(a, Class(':A'))
+        with self.assertRaises(AttributeError):
+            a.v = ':B'
+        b = copy.copy(a)
+        b.v = ':B'
+        self.assertEqual(':A', str(a))
+
+        doc = to_python("""Prefix(:=<http://example.org/>)
+Ontology(<http://example.org/o>
+    SubClassOf(:A :B)
+    SubClassOf(:B :A)
+)""", print_progress=False, iri_table=table)
+        axioms = doc.ontology.axioms
+        self.assertIs(a, axioms[0].subClassExpression)
+        self.assertIs(axioms[0].superClassExpression, axioms[1].subClassExpression)
+        axioms = pickle.loads(pickle.dumps(axioms))
+        self.assertIs(axioms[0].superClassExpression, axioms[1].subClassExpression)
+
+        # Without a table, the IRIs of a document are separate objects that can be modified
+        doc = to_python("Prefix(:=<http://example.org/>)\nOntology(<http://example.org/o> SubClassOf(:A :B) "
+                        "SubClassOf(:B :A))", print_progress=False)
+        axioms = doc.ontology.axioms
+        self.assertIsNot(axioms[0].superClassExpression, axioms[1].subClassExpression)
+        axioms[0].subClassExpression.v = ':C'
+        self.assertEqual(Class(':C'), axioms[0].subClassExpression)
+
 
 if __name__ == '__main__':
     unittest.main()
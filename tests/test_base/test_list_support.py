@@ -0,0 +1,63 @@
+import unittest
+from unittest.mock import patch
+
+from funowl import Class, ClassExpression, ObjectSomeValuesFrom, Ontology, SubClassOf, Declaration
+from funowl.axioms import Axiom
+from funowl.base.cast_function import cast
+from funowl.base.list_support import ListWrapper
+
+
+class ListSupportTestCase(unittest.TestCase):
+    def test_extend(self):
+        """ Elements that are already of the list type are added without a cast """
+        axioms = [SubClassOf(':A', ':B'), Declaration(Class(':A')), SubClassOf(':B', ':C')]
+        with patch('funowl.base.list_support.cast', side_effect=cast) as mock_cast:
+            l = ListWrapper(axioms, Axiom)
+            mock_cast.assert_not_called()
+            self.assertEqual(axioms, l)
+
+            # Whether a string or a class expression needs a cast depends on its value
+            expr = ObjectSomeValuesFrom(':p', ':B')
+            l = ListWrapper([Class(':A'), expr, Class(':C')], ClassExpression)
+            l.extend([':D'])
+            self.assertEqual(2, mock_cast.call_count)
+        self.assertEqual([Class(':A'), expr, Class(':C'), Class(':D')], l)
+
+        both = l + [':E']
+        self.assertIs(ClassExpression, both._typ)
+        self.assertEqual(Class(':E'), both[-1])
+        self.assertEqual(Class(':F'), ([':F'] + l)[0])
+        self.assertEqual(4, len(l))
+        with self.assertRaises(TypeError):
+            l.extend([17])
+
+    def test_deferred_validation(self):
+        """ Unchecked elements are cast by validate() """
+        l = ListWrapper([':A'], ClassExpression, validate=False)
+        l.append(':B')
+        l.extend_trusted([Class(':C')])
+        self.assertEqual([':A', ':B', Class(':C')], l.data)
+        self.assertIs(l, l.validate())
+        self.assertEqual([Class(':A'), Class(':B'), Class(':C')], l)
+        l.append(':D')
+        self.assertEqual(Class(':D'), l[-1])
+
+        bad = ListWrapper([Class(':A'), 17], ClassExpression, validate=False)
+        with self.assertRaises(TypeError):
+            bad.validate()
+        self.assertEqual([Class(':A'), 17], bad.data)
+
+    def test_ontology_axioms(self):
+        """ Ontology axioms are stored as they are added and can be checked later """
+        axiom = SubClassOf(':A', ':B')
+        o = Ontology(':o', axiom)
+        with patch('funowl.base.list_support.cast', side_effect=cast) as mock_cast:
+            o.axioms.append(axiom)
+            mock_cast.assert_not_called()
+        self.assertIs(axiom, o.axioms[1])
+        o.axioms.validate()
+        self.assertEqual([axiom, axiom], o.axioms)
+
+
+if __name__ == '__main__':
+    unittest.main()
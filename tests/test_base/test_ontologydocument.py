@@ -2,7 +2,7 @@ import unittest
 
 from rdflib import Graph, URIRef, Namespace
 
-from funowl import Prefix
+from funowl import Prefix, SubClassOf
 from funowl.ontology_document import Ontology, Import, OntologyDocument
 from tests import RDFLIB_PREFIXES_ARE_BROKEN, PREFIXES_BROKEN_MESSAGE
 from tests.utils.base import TestBase, A
@@ -17,6 +17,17 @@ class ImportTestCase(TestBase):
         self.assertEqual('http://www.example.com/ontology', str(imp.to_rdf(g)))
 
 
+class OntologyTestCase(TestBase):
+
+    def test_add_arg_print_progress(self):
+        """ The print_progress argument of add_arg is still accepted """
+        o = Ontology()
+        with self.assertWarns(DeprecationWarning):
+            o.add_arg(SubClassOf(A.x, A.y), print_progress=False)
+        o.add_arg(SubClassOf(A.y, A.z))
+        self.assertEqual(2, len(o.axioms))
+
+
 EX = Namespace("http://www.example.com/ontology1#")
 
 class OntologyDocumentTestCase(TestBase):
@@ -0,0 +1,49 @@
+import pickle
+import unittest
+
+from funowl import SubClassOf, EquivalentClasses, DisjointClasses, ObjectIntersectionOf, ObjectSomeValuesFrom, \
+    SubObjectPropertyOf, ObjectProperty, Class, Declaration, Annotation, DataOneOf, ObjectPropertyChain
+from funowl.base.expression_table import ExpressionTable
+import funowl.compact as compact_classes
+
+
+class StructuralEqualityTestCase(unittest.TestCase):
+    def test_set_semantics(self):
+        """ The order and repeats of set valued operands don't count """
+        self.assertEqual(EquivalentClasses(':A', ':B'), EquivalentClasses(':B', ':A', ':A'))
+        self.assertEqual(hash(EquivalentClasses(':A', ':B')), hash(EquivalentClasses(':B', ':A')))
+        self.assertEqual(ObjectIntersectionOf(':A', ':B'), ObjectIntersectionOf(':B', ':A'))
+        self.assertEqual(DataOneOf('"1"', '"2"'), DataOneOf('"2"', '"1"'))
+        self.assertNotEqual(EquivalentClasses(':A', ':B'), DisjointClasses(':A', ':B'))
+        self.assertNotEqual(SubClassOf(':A', ':B'), SubClassOf(':B', ':A'))
+        self.assertNotEqual(ObjectPropertyChain(':p', ':q'), ObjectPropertyChain(':q', ':p'))
+
+        label, comment = Annotation('rdfs:label', '"A"'), Annotation('rdfs:comment', '"B"')
+        self.assertEqual(SubClassOf(':A', ':B', annotations=[label, comment]),
+                         SubClassOf(':A', ':B', annotations=[comment, label]))
+        self.assertNotEqual(SubClassOf(':A', ':B'), SubClassOf(':A', ':B', annotations=[label]))
+        self.assertEqual(1, len({EquivalentClasses(':A', ':B'), EquivalentClasses(':B', ':A')}))
+
+    def test_structure(self):
+        """ Entities are compared by kind and name, and wrappers by what they wrap """
+        self.assertNotEqual(Class(':A'), ObjectProperty(':A'))
+        self.assertEqual(SubObjectPropertyOf(':p', ':q'),
+                         SubObjectPropertyOf(ObjectProperty(':p'), ObjectProperty(':q')))
+        self.assertNotEqual(Declaration(Class(':A')), Class(':A'))
+        self.assertEqual(SubClassOf(':A', ':B'), compact_classes.SubClassOf(':A', ':B'))
+        self.assertEqual(hash(SubClassOf(':A', ':B')), hash(compact_classes.SubClassOf(':A', ':B')))
+
+    def test_cached_hash(self):
+        """ Shared expressions hash once """
+        with ExpressionTable().active():
+            some = ObjectSomeValuesFrom(':p', ObjectIntersectionOf(':A', ':B'))
+            other = ObjectSomeValuesFrom(':p', ObjectIntersectionOf(':B', ':A'))
+        self.assertIsNot(some, other)
+        self.assertEqual(some, other)
+        self.assertEqual(hash(some), some.__dict__['_hash'])
+        self.assertNotIn('_hash', pickle.loads(pickle.dumps(some)).__dict__)
+        self.assertEqual(some, ObjectSomeValuesFrom(':p', ObjectIntersectionOf(':A', ':B')))
+
+
+if __name__ == '__main__':
+    unittest.main()
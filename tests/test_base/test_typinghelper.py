@@ -1,8 +1,11 @@
 import unittest
 from typing import Union, List, Tuple, Dict, Any
+from unittest.mock import patch
 
-from funowl import Class
-from funowl.terminals.TypingHelper import is_union, is_dict, is_iterable, isinstance_, is_list
+from funowl import Class, SubClassOf, Declaration, ObjectIntersectionOf
+from funowl.axioms import Axiom
+from funowl.terminals.TypingHelper import is_union, is_dict, is_iterable, isinstance_, is_list, predicate, \
+    type_decides, flatten_unions
 
 inst_union = Union[int, str, Class, Dict[str, str], dict, Tuple[int, str]]
 inst_union_2 = Union[int, str, Class, Dict[str, str], Tuple[int, str]]
@@ -36,6 +39,25 @@ class TypingHelperTestCase(unittest.TestCase):
         self.assertTrue(isinstance_(([1,2,3], [True, False, True]), Tuple[List[int], List[bool]]))
 
 
+    def test_predicates(self):
+        """ Type hints are compiled once and Union members are picked out by the type of the value """
+        self.assertIs(predicate(Axiom), predicate(Axiom))
+        axiom = SubClassOf(':A', ':B')
+        self.assertTrue(type_decides(SubClassOf, Axiom.__args__[0]) is not None)
+        self.assertTrue(isinstance_(axiom, Axiom))
+        with patch('funowl.terminals.TypingHelper.type_decides', side_effect=type_decides) as mock_decides:
+            self.assertTrue(isinstance_(axiom, Axiom))
+            self.assertTrue(isinstance_(Declaration(Class(':A')), Axiom))
+            self.assertFalse(isinstance_(ObjectIntersectionOf(':A', ':B'), Axiom))
+            calls = mock_decides.call_count
+            self.assertTrue(isinstance_(SubClassOf(':C', ':D'), Axiom))
+            self.assertFalse(isinstance_(ObjectIntersectionOf(':C', ':D'), Axiom))
+            self.assertEqual(calls, mock_decides.call_count)
+        self.assertTrue(isinstance_([axiom, axiom], List[Axiom]))
+        self.assertFalse(isinstance_([axiom, 17], List[Axiom]))
+        self.assertTrue(isinstance_(':A', Union[int, Class]))
+        self.assertFalse(isinstance_('not a class', Union[int, Class]))
+
     def test_is_union(self):
         self.assertTrue(is_union(Union[int, str]))
         self.assertFalse(is_union(int))
@@ -46,6 +68,10 @@ class TypingHelperTestCase(unittest.TestCase):
         self.assertFalse(is_union(dict))
         self.assertFalse(is_union(list))
 
+    def test_flatten_unions(self):
+        self.assertEqual((int, str, Class, List[str]), flatten_unions([Union[int, Union[str, Class]], List[str]]))
+        self.assertEqual((), flatten_unions([]))
+
     def test_is_dict(self):
         self.assertFalse(is_dict(Union[int, str]))
         self.assertFalse(is_dict(int))
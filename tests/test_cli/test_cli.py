@@ -1,11 +1,12 @@
 import argparse
 import os.path
 import unittest
-from contextlib import redirect_stdout
+from contextlib import redirect_stdout, redirect_stderr
 from io import StringIO
 from typing import List
 
 from funowl import cli
+from funowl.converters.functional_converter import to_python
 
 CWD = os.path.dirname(__file__)
 TEST_DATA_DIR = os.path.join(CWD, 'data')
@@ -77,6 +78,21 @@ class CLITestCase(unittest.TestCase):
         # Not sure
         self._generate_file('pizza.owl', 'pizza_out3.foo')
 
+    def test_functional_output(self):
+        """ Test writing functional syntax """
+        self._generate_file('pizza.owl', 'pizza_out.ofn', ['-j', '2'])
+        with open(os.path.join(TEST_DATA_DIR, 'pizza_out.ofn')) as f:
+            self.assertEqual(str(to_python(os.path.join(TEST_DATA_DIR, 'pizza.owl')).to_functional()), f.read())
+        output = StringIO()
+        with redirect_stdout(output):
+            cli.evaluate_cli([os.path.join(TEST_DATA_DIR, 'basic.owl'), '-f', 'ofn', '-c'], CLI_NAME)
+        self.assertIn('\nObjectPropertyDomain( pizza:hasIngredient pizza:Food )\n)', output.getvalue())
+
+        # Compact output is functional syntax only
+        with self.assertRaises(SystemExit), redirect_stderr(StringIO()) as errors:
+            cli.evaluate_cli([os.path.join(TEST_DATA_DIR, 'basic.owl'), '-f', 'ttl', '-c'], CLI_NAME)
+        self.assertIn("-c/--compact only applies to 'ofn' output", errors.getvalue())
+
     def test_cli_options(self):
         """ Make sure that file name suffixes are recognized """
         cli.evaluate_cli(
@@ -87,7 +103,8 @@ class CLITestCase(unittest.TestCase):
         output = StringIO()
         with redirect_stdout(output):
             cli.evaluate_cli(
-                [os.path.join(TEST_DATA_DIR, 'pizza.owl'), os.path.join(TEST_DATA_DIR, 'pizza_out4.n3'), '-np'],
+                [os.path.join(TEST_DATA_DIR, 'pizza.owl'), os.path.join(TEST_DATA_DIR, 'pizza_out4.n3'), '-np',
+                 '-j', '2'],
                 CLI_NAME)
             cli.evaluate_cli(
                 [os.path.join(TEST_DATA_DIR, 'pizza.owl')],
@@ -0,0 +1,117 @@
+import bz2
+import gzip
+import lzma
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from funowl.converters import compressed_input
+from funowl.converters.compressed_input import open_compressed, windows
+from funowl.converters.functional_converter import to_python
+from tests import datadir
+
+pizza = os.path.join(datadir, 'pizza.owl')
+
+
+class CompressedInputTestCase(unittest.TestCase):
+    def test_compressed_input(self):
+        """ gzip, bzip2 and xz input parses to the same ontology as the plain text, whatever the window size """
+        with open(pizza, 'rb') as f:
+            text = f.read()
+        self.assertIsNone(open_compressed(text))
+        expected = str(to_python(pizza, print_progress=False).to_functional())
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for codec, suffix in ((gzip, 'gz'), (bz2, 'bz2'), (lzma, 'xz')):
+                fname = os.path.join(tmpdir, 'pizza.owl.' + suffix)
+                with open(fname, 'wb') as f:
+                    f.write(codec.compress(text))
+                self.assertEqual(expected, str(to_python(fname, print_progress=False).to_functional()))
+                with patch.object(compressed_input.windows, '__defaults__', (101, )):
+                    reports = []
+                    doc = to_python(fname, progress=reports.append)
+                    self.assertEqual(expected, str(doc.to_functional()))
+                    self.assertEqual(os.path.getsize(fname), reports[-1].bytes_read)
+            self.assertEqual(expected, str(to_python(gzip.compress(text), print_progress=False).to_functional()))
+
+    def test_non_strict(self):
+        """ Damaged compressed input yields the same axioms and diagnostics as damaged plain text """
+        damaged = b'''Prefix(:=<http://example.org/>)
+Ontology(<http://example.org/o> <http://example.org/v>
+    SubClassOf(:A :B)
+    SubClassOf(:A)
+    SubClassOf(:C :D)
+    SubClassOf(:E :F
+    SubClassOf(:G :H)
+)'''
+        def parse(defn):
+            diagnostics = []
+            with self.assertLogs(level='WARNING'):
+                doc = to_python(defn, print_progress=False, strict=False, diagnostics=diagnostics)
+            return str(doc.to_functional()), [(d.offset, d.line, d.function, d.resumed_at) for d in diagnostics]
+
+        expected = parse(damaged)
+        self.assertEqual(2, len(expected[1]))
+        for block_size in (7, 40, 1000):
+            with patch.object(compressed_input.windows, '__defaults__', (block_size, )):
+                self.assertEqual(expected, parse(gzip.compress(damaged)))
+
+    def test_cut_literals(self):
+        """ Parenthesis in a quoted string or IRI that a window boundary cuts through are not structure """
+        text = b'''Prefix(:=<http://example.org/>)
+Prefix(rdfs:=<http://www.w3.org/2000/01/rdf-schema#>)
+Ontology(<http://example.org/o>
+    AnnotationAssertion(rdfs:label :A "Structure of heart 1) body structure")
+    AnnotationAssertion(rdfs:label :B "(x) \\"q)\\" y)"@en)
+    AnnotationAssertion(rdfs:comment <http://example.org/a(b)c> "1) one"^^<http://example.org/dt(x)>)
+    AnnotationAssertion(rdfs:label :C ")") # a comment (with a parenthesis
+    # ) another one
+    SubClassOf(<http://example.org/p(q)> :D)
+)'''
+        expected = to_python(text, print_progress=False).ontology.axioms
+        self.assertEqual(5, len(expected))
+        compressed = gzip.compress(text)
+        for block_size in range(1, len(text) + 1):
+            with patch.object(compressed_input.windows, '__defaults__', (block_size, )):
+                self.assertEqual(expected, to_python(compressed, print_progress=False).ontology.axioms,
+                                 msg=f"block size {block_size}")
+
+    def test_malformed_windows(self):
+        """ A function that is missing its closing parenthesis doesn't pull the rest of the input into one window """
+        damaged = b'Prefix(:=<http://example.org/>)\nOntology(<http://example.org/o>\n    SubClassOf(:A :B\n' + \
+            b''.join(b'    SubClassOf(:C%d :D)\n' % i for i in range(200)) + b')\n'
+
+        def parse(defn):
+            diagnostics = []
+            with self.assertLogs(level='WARNING'):
+                doc = to_python(defn, print_progress=False, strict=False, diagnostics=diagnostics)
+            return doc.ontology.axioms, [(d.offset, d.line, d.function, d.resumed_at) for d in diagnostics]
+
+        expected = parse(damaged)
+        self.assertEqual(200, len(expected[0]))
+        with patch.object(compressed_input, 'MAX_WINDOW', 500):
+            pieces = list(windows(open_compressed(gzip.compress(damaged))[0], 64))
+            self.assertEqual(damaged, b''.join(w for _, w, _ in pieces))
+            self.assertTrue(all(len(w) <= 500 + 64 for _, w, _ in pieces))
+            with patch.object(compressed_input.windows, '__defaults__', (64, )):
+                self.assertEqual(expected, parse(gzip.compress(damaged)))
+                with self.assertRaises(ValueError):
+                    to_python(gzip.compress(damaged), print_progress=False)
+
+    def test_windows(self):
+        """ Windows end on top level function boundaries """
+        text = b'Prefix(:=<http://a/>)\nOntology(<http://a/o> <http://a/v>\n' + \
+               b''.join(b'SubClassOf(:C%d ObjectIntersectionOf(:D :E))\n' % i for i in range(100)) + b')\n'
+        stream = open_compressed(gzip.compress(text))[0]
+        pieces = list(windows(stream, 50))
+        self.assertEqual(text, b''.join(w for _, w, _ in pieces))
+        self.assertEqual([len(b''.join(w for _, w, _ in pieces[:i])) for i in range(len(pieces))],
+                         [o for o, _, _ in pieces])
+        self.assertTrue(all(complete for _, _, complete in pieces[:-1]))
+        self.assertTrue(pieces[1][1].lstrip().startswith(b'Ontology(<http://a/o> <http://a/v>'))
+        for _, window, _ in pieces[2:-1]:
+            self.assertRegex(window, rb'(?s)^\s*SubClassOf\(.*\)$')
+
+
+if __name__ == '__main__':
+    unittest.main()
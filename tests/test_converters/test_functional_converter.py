@@ -1,10 +1,17 @@
+import gzip
 import os
 import unittest
 from mmap import mmap, ACCESS_READ
 from typing import Any
+from unittest.mock import patch
 
-from funowl import OntologyDocument
-from funowl.converters.functional_converter import to_python
+from rdflib import Graph
+
+from funowl import OntologyDocument, Ontology, Prefix, ClassAxiom, SubClassOf, Declaration, AnnotationAssertion
+from funowl.base.lazy_axiom import LazyAxiom
+from funowl.converters.functional_converter import to_python, iter_axioms
+from funowl.converters.parse_diagnostics import ParseDiagnostic
+from funowl.converters.progress import Progress
 from tests import datadir, PREFIXES_BROKEN_MESSAGE, RDFLIB_PREFIXES_ARE_BROKEN
 from tests.utils.base import TestBase
 
@@ -49,6 +56,150 @@ class FunctionalConverterTestCase(TestBase):
         with open(pizza) as f:
             self.verify(mmap(f.fileno(), 0, access=ACCESS_READ))
 
+    def test_iter_axioms(self):
+        """ Streaming parse yields the same content as to_python without accumulating it """
+        doc = to_python(pizza, print_progress=False)
+        elements = list(iter_axioms(pizza))
+        ontologies = [e for e in elements if isinstance(e, Ontology)]
+        self.assertEqual(1, len(ontologies))
+        header = ontologies[0]
+        self.assertEqual(doc.ontology.iri, header.iri)
+        self.assertEqual([], header.axioms)
+        hdr_idx = elements.index(header)
+        self.assertTrue(all(isinstance(e, Prefix) for e in elements[:hdr_idx]))
+        self.assertEqual(len(doc.ontology.axioms) + len(doc.ontology.annotations) +
+                         len(doc.ontology.directlyImportsDocuments), len(elements) - hdr_idx - 1)
+        self.assertEqual(doc.ontology.axioms[-1], elements[-1])
+
+    def test_parallel(self):
+        """ Parallel parse produces the same ontology as the sequential one """
+        sequential = to_python(pizza, print_progress=False)
+        parallel = to_python(pizza, print_progress=False, workers=2)
+        self.assertEqual(str(sequential.to_functional()), str(parallel.to_functional()))
+
+    def test_lazy(self):
+        """ Lazy axioms are selected by type without being parsed and materialize to the eager result """
+        eager = to_python(pizza, print_progress=False)
+        eager_graph = Graph()
+        eager.to_rdf(eager_graph)
+        indexed = to_python(pizza, print_progress=False, lazy=True)
+        with patch('funowl.converters.functional_converter.structural_index', return_value=None):
+            tokenized = to_python(pizza, print_progress=False, lazy=True)
+        for lazy in (indexed, tokenized):
+            axioms = lazy.ontology.axioms
+            self.assertTrue(all(isinstance(a, LazyAxiom) for a in axioms))
+            self.assertEqual(len(list(eager.ontology.axioms_of_type(ClassAxiom))),
+                             len(list(lazy.ontology.axioms_of_type(ClassAxiom))))
+            self.assertFalse(any(a.is_materialized for a in axioms))
+            subclass = next(lazy.ontology.axioms_of_type(SubClassOf))
+            self.assertIsNotNone(subclass.subClassExpression)
+            self.assertIsInstance(subclass.materialize(), SubClassOf)
+            self.assertEqual(1, sum(a.is_materialized for a in axioms))
+            self.assertEqual(eager.ontology.annotations, lazy.ontology.annotations)
+            self.assertEqual(str(eager.to_functional()), str(lazy.to_functional()))
+            lazy_graph = Graph()
+            lazy.to_rdf(lazy_graph)
+            self.assertEqual(len(eager_graph), len(lazy_graph))
+
+    def test_progress(self):
+        """ Progress is reported at a limited rate and the final report covers the whole input """
+        for kwargs in (dict(), dict(lazy=True), dict(workers=2)):
+            reports = []
+            with patch('funowl.converters.progress.DEFAULT_INTERVAL', 0):
+                doc = to_python(pizza, progress=reports.append, **kwargs)
+            self.assertTrue(all(isinstance(r, Progress) for r in reports))
+            self.assertGreater(len(reports), 2)
+            final = reports[-1]
+            self.assertTrue(final.done)
+            self.assertEqual(os.path.getsize(pizza), final.total_bytes)
+            self.assertEqual(len(doc.ontology.axioms) + len(doc.ontology.annotations), final.naxioms)
+            self.assertLessEqual(final.bytes_read, final.total_bytes)
+            self.assertEqual(sorted(r.bytes_read for r in reports), [r.bytes_read for r in reports])
+
+        # With the default interval, a quick parse only gets the final report
+        reports = []
+        to_python(pizza, progress=reports.append)
+        self.assertLess(len(reports), len(doc.ontology.axioms) // 10)
+        self.assertTrue(reports[-1].done)
+
+    def test_non_strict(self):
+        """ Axioms that fail to parse are skipped and reported when strict is False """
+        damaged = b'''Prefix(:=<http://example.org/>)
+Ontology(<http://example.org/o>
+    SubClassOf(:A :B)
+    SubClassOf(:A)
+    Bogus(:x)
+    SubClassOf(:C :D)
+    SubClassOf(:E :F
+    SubClassOf(:G :H)
+)'''
+        with self.assertRaises(TypeError):
+            to_python(damaged, print_progress=False)
+        for workers in (1, 2):
+            diagnostics = []
+            with self.assertLogs(level='WARNING'):
+                doc = to_python(damaged, print_progress=False, workers=workers, strict=False, diagnostics=diagnostics)
+            self.assertEqual([':A', ':C', ':G'], [str(a.subClassExpression) for a in doc.ontology.axioms])
+            self.assertTrue(all(isinstance(d, ParseDiagnostic) for d in diagnostics))
+            self.assertEqual([(4, 'SubClassOf'), (5, 'Bogus'), (7, 'SubClassOf')],
+                             [(d.line, d.function) for d in diagnostics])
+            self.assertEqual([damaged.index(b'SubClassOf(:A)'), damaged.index(b'Bogus'),
+                              damaged.index(b'SubClassOf(:E')], [d.offset for d in diagnostics])
+
+    def test_trailing_content(self):
+        """ Nothing but whitespace and comments may follow the Ontology """
+        extra_paren = b'''Prefix(:=<http://example.org/>)
+Ontology(<http://example.org/o>
+    Declaration(Class(:A)))
+    Declaration(Class(:B))
+    SubClassOf(:A :B)
+)'''
+        junk = b'''Prefix(:=<http://example.org/>)
+Ontology(<http://example.org/o>
+    Declaration(Class(:A))
+)
+garbage here'''
+        for damaged, content in ((extra_paren, 'Declaration(Class(:B))'), (junk, 'garbage')):
+            for source in (damaged, gzip.compress(damaged)):
+                for kwargs in (dict(), dict(workers=2), dict(lazy=True), dict(include=['Declaration']),
+                               dict(exclude=['SubClassOf'])):
+                    with self.assertRaises(ValueError, msg=str(kwargs)):
+                        to_python(source, print_progress=False, **kwargs)
+                with self.assertRaises(ValueError):
+                    list(iter_axioms(source))
+                for workers in (1, 2):
+                    diagnostics = []
+                    with self.assertLogs(level='WARNING'):
+                        to_python(source, print_progress=False, workers=workers, strict=False, diagnostics=diagnostics)
+                    self.assertEqual([(damaged.index(content.encode()), content)],
+                                     [(d.offset, d.function) for d in diagnostics])
+        self.assertEqual(1, len(to_python(junk.replace(b'garbage here', b'# garbage here\n'),
+                                          print_progress=False).ontology.axioms))
+
+    def test_selective(self):
+        """ include and exclude select the top level functions that are loaded """
+        full = to_python(pizza, print_progress=False)
+        expected = [a for a in full.ontology.axioms if type(a) in (SubClassOf, Declaration)]
+        with open(pizza, 'rb') as f:
+            compressed = gzip.compress(f.read())
+        for kwargs in (dict(), dict(workers=2), dict(lazy=True)):
+            for source in (pizza, compressed):
+                doc = to_python(source, print_progress=False, include=['SubClassOf', Declaration], **kwargs)
+                axioms = [a.materialize() if isinstance(a, LazyAxiom) else a for a in doc.ontology.axioms]
+                self.assertEqual(expected, axioms)
+            with patch('funowl.converters.functional_converter.structural_index', return_value=None):
+                doc = to_python(pizza, print_progress=False, include=['SubClassOf', Declaration], **kwargs)
+            self.assertEqual(len(expected), len(doc.ontology.axioms))
+        self.assertEqual(full.ontology.annotations,
+                         to_python(pizza, print_progress=False, include=['Annotation']).ontology.annotations)
+
+        # Unions of classes are expanded and exclude wins over include
+        doc = to_python(pizza, print_progress=False, include=[ClassAxiom], exclude=[SubClassOf])
+        self.assertEqual([a for a in full.ontology.axioms if isinstance(a, ClassAxiom) and type(a) is not SubClassOf],
+                         doc.ontology.axioms)
+        doc = to_python(pizza, print_progress=False, exclude=[AnnotationAssertion])
+        self.assertEqual([a for a in full.ontology.axioms if type(a) is not AnnotationAssertion], doc.ontology.axioms)
+
     def test_web_page(self):
         self.verify('https://raw.githubusercontent.com/hsolbrig/funowl/master/tests/data/pizza.owl')
 
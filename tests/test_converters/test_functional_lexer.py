@@ -0,0 +1,79 @@
+import os
+import subprocess
+import sys
+import unittest
+
+from funowl import HasKey, DataPropertyAssertion, ObjectInverseOf
+from funowl.converters.functional_converter import to_python
+from funowl.converters.functional_lexer import tokenize, FUNCTION, OPEN, CLOSE, FULL_IRI, PREFIX_NAME, \
+    PREFIXED_NAME, NODE_ID, LITERAL
+from funowl.writers.FunctionalWriter import FunctionalWriter
+from tests import datadir
+
+
+class FunctionalLexerTestCase(unittest.TestCase):
+    def test_token_types(self):
+        """ Every token type, with values and offsets """
+        txt = b'Prefix( xsd: = <http://www.w3.org/2001/XMLSchema#> )\n' \
+              b'HasKey ( :C (_:x) () ) "a \\"(b" "1"^^xsd:integer "c"@en 12'
+        tokens = list(tokenize(txt))
+        self.assertEqual([FUNCTION, PREFIX_NAME, FULL_IRI, CLOSE,
+                          FUNCTION, PREFIXED_NAME, OPEN, NODE_ID, CLOSE, OPEN, CLOSE, CLOSE,
+                          LITERAL, LITERAL, LITERAL, LITERAL], [t.type for t in tokens])
+        self.assertEqual(['Prefix', 'xsd', 'http://www.w3.org/2001/XMLSchema#', '',
+                          'HasKey', ':C', '', '_:x', '', '', '', '',
+                          'a \\"(b', '1', 'c', '12'], [t.value for t in tokens])
+        self.assertEqual('xsd:integer', tokens[13].datatype)
+        self.assertEqual('en', tokens[14].lang)
+        for token in tokens:
+            self.assertTrue(txt[token.start:token.end].strip().startswith(txt[token.start:token.start+1]))
+        self.assertEqual(b'<http://www.w3.org/2001/XMLSchema#>', txt[tokens[2].start:tokens[2].end])
+        self.assertEqual(b'"1"^^xsd:integer', txt[tokens[13].start:tokens[13].end])
+
+    def test_comments(self):
+        """ Comments are only recognized at the start of a token """
+        txt = b'# Leading comment\nClass(:a#b) # trailing comment'
+        self.assertEqual([(FUNCTION, 'Class'), (PREFIXED_NAME, ':a#b'), (CLOSE, '')],
+                         [(t.type, t.value) for t in tokenize(txt)])
+
+    def test_parse(self):
+        """ Parser cases that are driven by the lexer """
+        doc = to_python("""Prefix(:=<http://example.org/>)
+Ontology(<http://example.org/o>
+    HasKey(:C (:p ObjectInverseOf(:q)) (:d))
+    DataPropertyAssertion(:p :i "1"^^<http://www.w3.org/2001/XMLSchema#integer>)
+)""", print_progress=False)
+        haskey, dpa = doc.ontology.axioms
+        self.assertIsInstance(haskey, HasKey)
+        self.assertIsInstance(haskey.objectPropertyExpressions[1].v, ObjectInverseOf)
+        self.assertEqual(1, len(haskey.dataPropertyExpressions))
+        self.assertIsInstance(dpa, DataPropertyAssertion)
+        w = FunctionalWriter()
+        doc.add_namespaces(w.g)
+        self.assertEqual('DataPropertyAssertion( :p :i "1"^^xsd:integer )', str(dpa.to_functional(w)))
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            to_python("Ontology( SubClassOf( :a :b )\n", print_progress=False)
+        with self.assertRaises(ValueError):
+            to_python("Ontology( HasKey( :C (:p) )\n)", print_progress=False)
+
+    def test_malformed_whitespace(self):
+        """ Malformed input that ends in whitespace fails in linear time """
+        script = '''
+from funowl.converters.functional_lexer import tokenize
+for inp in (b'Foo(' + b' ' * 100000, b'Foo(' + b' \\n' * 50000 + b'"unterminated',
+            b'Foo(' + b'# comment\\n ' * 10000 + b'<unterminated'):
+    try:
+        list(tokenize(inp))
+    except ValueError:
+        pass
+'''
+        subprocess.run([sys.executable, '-c', script], check=True, timeout=30,
+                       cwd=os.path.dirname(os.path.dirname(datadir)))
+        with self.assertRaises(ValueError):
+            list(tokenize(b'Foo(' + b' \n' * 10 + b'"unterminated'))
+
+
+if __name__ == '__main__':
+    unittest.main()
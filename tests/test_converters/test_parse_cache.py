@@ -0,0 +1,101 @@
+import os
+import tempfile
+import time
+import unittest
+
+from funowl.converters.functional_converter import to_python
+from funowl.converters.parse_cache import ParseCache, SUFFIX
+from funowl.identifiers import IRITable
+
+ONTOLOGY = """Prefix(:=<http://example.org/>)
+Ontology(<http://example.org/o>
+    SubClassOf(:A :B)
+)"""
+
+
+class ParseCacheTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmpdir.name, 'cache')
+        self.source = os.path.join(self.tmpdir.name, 'o.ofn')
+        with open(self.source, 'w') as f:
+            f.write(ONTOLOGY)
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def entries(self):
+        return [f for f in os.listdir(self.cache_dir) if f.endswith(SUFFIX)]
+
+    def test_warm_load(self):
+        cold = to_python(self.source, print_progress=False, cache_dir=self.cache_dir)
+        self.assertEqual(1, len(self.entries()))
+        cache = ParseCache(self.cache_dir)
+        self.assertIsNotNone(cache.load(*cache.entry(self.source)))
+        warm = to_python(self.source, print_progress=False, cache_dir=self.cache_dir)
+        self.assertEqual(str(cold.to_functional()), str(warm.to_functional()))
+
+        # In memory sources are keyed on their content
+        to_python(ONTOLOGY, print_progress=False, cache_dir=self.cache_dir)
+        self.assertEqual(2, len(self.entries()))
+        self.assertIsNotNone(cache.load(*cache.entry(ONTOLOGY)))
+
+        # Selective loads are cached separately from the full one
+        doc = to_python(self.source, print_progress=False, cache_dir=self.cache_dir, exclude=['SubClassOf'])
+        self.assertEqual([], doc.ontology.axioms)
+        self.assertEqual(3, len(self.entries()))
+        warm = to_python(self.source, print_progress=False, cache_dir=self.cache_dir)
+        self.assertEqual(1, len(warm.ontology.axioms))
+
+    def test_tables(self):
+        """ A cached document is moved into the caller's tables just like a freshly parsed one """
+        to_python(self.source, print_progress=False, cache_dir=self.cache_dir)
+        table = IRITable()
+        diagnostics = []
+        doc = to_python(self.source, print_progress=False, cache_dir=self.cache_dir, iri_table=table, strict=False,
+                        diagnostics=diagnostics)
+        self.assertEqual(1, len(self.entries()))
+        axiom = doc.ontology.axioms[0]
+        self.assertIs(axiom.subClassExpression, table.intern(type(axiom.subClassExpression), ':A'))
+        self.assertIs(doc.ontology.iri, table.intern(type(doc.ontology.iri), 'http://example.org/o'))
+        self.assertEqual([], diagnostics)
+
+    def test_invalidation(self):
+        to_python(self.source, print_progress=False, cache_dir=self.cache_dir)
+        with open(self.source, 'w') as f:
+            f.write(ONTOLOGY.replace(':B', ':C'))
+        os.utime(self.source, ns=(0, os.stat(self.source).st_mtime_ns + 1000))
+        doc = to_python(self.source, print_progress=False, cache_dir=self.cache_dir)
+        self.assertIn('SubClassOf( :A :C )', str(doc.to_functional()))
+        self.assertEqual(1, len(self.entries()))
+
+        # Same size and modification time -- only a digest catches the change
+        cache = ParseCache(self.cache_dir, digest=True)
+        to_python(self.source, print_progress=False, cache_dir=cache)
+        stat = os.stat(self.source)
+        with open(self.source, 'w') as f:
+            f.write(ONTOLOGY.replace(':B', ':D'))
+        os.utime(self.source, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        doc = to_python(self.source, print_progress=False, cache_dir=cache)
+        self.assertIn('SubClassOf( :A :D )', str(doc.to_functional()))
+
+    def test_eviction(self):
+        cache = ParseCache(self.cache_dir, max_age=60)
+        to_python(self.source, print_progress=False, cache_dir=cache)
+        old = self.entries()[0]
+        source_size = os.path.getsize(os.path.join(self.cache_dir, old))
+        past = time.time() - 120
+        os.utime(os.path.join(self.cache_dir, old), (past, past))
+        to_python(ONTOLOGY, print_progress=False, cache_dir=cache)
+        self.assertNotIn(old, self.entries())
+        self.assertEqual(1, len(self.entries()))
+
+        cache = ParseCache(self.cache_dir, max_size=source_size)
+        to_python(self.source, print_progress=False, cache_dir=cache)
+        self.assertEqual([old], self.entries())
+        cache.clear()
+        self.assertEqual([], self.entries())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import unittest
+
+from funowl.converters.functional_lexer import tokenize, FUNCTION, OPEN, CLOSE
+from funowl.converters.structural_index import structural_index, np
+from tests import datadir
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class StructuralIndexTestCase(unittest.TestCase):
+    @staticmethod
+    def lexer_index(inp: bytes):
+        """ Reference paren pairs and body axiom ends computed from the token stream """
+        stack = []
+        pairs = {}
+        axiom_ends = []
+        for token in tokenize(inp):
+            if token.type in (FUNCTION, OPEN):
+                stack.append(token.end - 1)
+            elif token.type == CLOSE:
+                pairs[stack.pop()] = token.start
+                if len(stack) == 1:
+                    axiom_ends.append(token.end)
+        return pairs, axiom_ends
+
+    def check(self, inp: bytes) -> None:
+        index = structural_index(inp)
+        self.assertIsNotNone(index)
+        pairs, axiom_ends = self.lexer_index(inp)
+        self.assertEqual(pairs, dict(zip(index.opens.tolist(), index.closes.tolist())))
+        self.assertEqual(axiom_ends, index.axiom_ends.tolist())
+        for start, end in zip(index.axiom_starts.tolist(), index.axiom_ends.tolist()):
+            tokens = list(tokenize(inp, start, end))
+            self.assertEqual(FUNCTION, tokens[0].type)
+            self.assertEqual(end, tokens[-1].end)
+
+    def test_pizza(self):
+        with open(os.path.join(datadir, 'pizza.owl'), 'rb') as f:
+            inp = f.read()
+        self.check(inp)
+        index = structural_index(inp)
+        chunks = index.axiom_chunks(4)
+        self.assertEqual(4, len(chunks))
+        self.assertEqual(index.axiom_ends[-1], chunks[-1][1])
+        for (_, end), (start, _) in zip(chunks, chunks[1:]):
+            self.assertEqual(end + 1, start)
+
+    def test_quoting(self):
+        """ Parentheses inside of strings, IRIs and comments aren't structural """
+        self.check(rb'''Prefix(:=<http://example.org/a(b#>)  # Comment with ( "(" <)>
+Ontology( <http://example.org/o>  # ) and another "quote"
+    Annotation( :p "a \" ) (b" )
+    Annotation( :p "\\" )
+    Annotation( :p "<(>" )
+    Annotation( :p "\\\")" )
+    SubClassOf(:a#b :c)   # ()
+)''')
+
+    def test_unindexable(self):
+        """ Input that can't be reliably indexed is left to the lexer """
+        self.assertIsNone(structural_index(b'Ontology( SubClassOf( :a :b )'))
+        self.assertIsNone(structural_index(b'Ontology( ) )'))
+        self.assertIsNone(structural_index(b'Ontology( # unbalanced " in comment\n)'))
+        self.assertIsNone(structural_index(b'Ontology( <<a> )'))
+
+    def test_closing(self):
+        inp = b'Ontology( SubClassOf( :a ObjectUnionOf( :b :c ) ) )'
+        index = structural_index(inp)
+        self.assertEqual(len(inp) - 1, index.closing(inp.index(b'(')))
+        self.assertEqual(inp.rindex(b') )'), index.closing(inp.index(b'(', 10)))
+        with self.assertRaises(ValueError):
+            index.closing(0)
+
+
+if __name__ == '__main__':
+    unittest.main()
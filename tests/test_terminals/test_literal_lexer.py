@@ -0,0 +1,43 @@
+import unittest
+
+import rdflib
+from rdflib import XSD
+
+from funowl.terminals.LiteralLexer import lex_literal
+from funowl.literals import LITERAL_PREFIXES, Literal, _graph_literal
+
+
+class LiteralLexerTestCase(unittest.TestCase):
+    def test_forms(self):
+        """ Strings, escapes, language tags and datatypes """
+        self.assertEqual(('abc', None, None), lex_literal('"abc"', LITERAL_PREFIXES))
+        self.assertEqual(("it's", None, None), lex_literal("'it\\'s'", LITERAL_PREFIXES))
+        self.assertEqual(('a"b\\c\n\té\U0001F600', None, None),
+                         lex_literal(r'"a\"b\\c\n\té\U0001F600"', LITERAL_PREFIXES))
+        self.assertEqual(('chat', 'fr-CA', None), lex_literal('"chat"@fr-CA', LITERAL_PREFIXES))
+        self.assertEqual(('42', None, str(XSD.integer)), lex_literal('"42"^^xsd:integer', LITERAL_PREFIXES))
+        self.assertEqual(('x', None, 'http://example.org/t'), lex_literal('"x"^^<http://example.org/t>', {}))
+
+    def test_unrecognized(self):
+        """ Forms that are left to the N3 parser """
+        for term in ('"""long"""', '"a"b"', '"bad\\q"', '"x"^^rdf:XMLLiteral', '"x"^^<relative>', '"x"@en^^xsd:string',
+                     '"x" ', '"x"^^xsd:a.b', 'abc'):
+            self.assertIsNone(lex_literal(term, LITERAL_PREFIXES), term)
+
+    def test_same_as_n3(self):
+        """ The lexer and the N3 parser produce the same literals """
+        for term in ('"abc"', "'abc'", r'"a\"b\\c\né"', '"chat"@fr-CA', '"42"^^xsd:integer', '"4.2"^^xsd:double',
+                     '"true"^^xsd:boolean', '"2002-03-11"^^xsd:date', '"x"^^<http://example.org/t>',
+                     '"x"^^:local'):
+            value, lang, datatype = lex_literal(term, LITERAL_PREFIXES)
+            lexed = rdflib.Literal(value, datatype=rdflib.URIRef(datatype)) if datatype else \
+                rdflib.Literal(value, lang=lang)
+            parsed = _graph_literal(term)
+            self.assertEqual((parsed, parsed.language, parsed.datatype), (lexed, lexed.language, lexed.datatype))
+        self.assertIsNone(Literal._to_n3('"abc"^^xsd:integer'))
+        self.assertIsNone(Literal._to_n3('"AB\\"\\\\C\\""^^xsd:integer'))
+        self.assertIsNone(Literal._to_n3('"123"^^xsd.integer'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,8 @@
 import unittest
 from typing import Any, Type
+from unittest.mock import patch
 
-from funowl.terminals.Terminals import PN_CHARS_BASE, PNAME_LN, HEX, QUOTED_STRING
+from funowl.terminals.Terminals import PN_CHARS_BASE, PNAME_LN, HEX, QUOTED_STRING, BLANK_NODE_LABEL
 # class IRIREF(jsg.JSGString):
 #     pattern = jsg.JSGPattern(r'([^\u0000-\u0020\u005C\u007B\u007D<>"|^`]|({UCHAR}))*'.format(UCHAR=UCHAR.pattern))
 #
@@ -75,6 +76,21 @@ class TerminalsTestCase(TestBase):
     def test_pn_ln(self):
         self.assertTrue(isinstance('rdf:cool', PNAME_LN))
 
+    def test_validation_cache(self):
+        """ Match results are cached per pattern and constructed instances aren't revalidated """
+        self.assertTrue(PNAME_LN.pattern.unescape)
+        self.assertFalse(HEX.pattern.unescape)
+        self.assertFalse(isinstance('rdf:cool:', PNAME_LN))
+        self.assertFalse(isinstance('rdf:cool', BLANK_NODE_LABEL))
+        self.assertTrue(isinstance('_:b1', BLANK_NODE_LABEL))
+        self.eval('"a"\n', QUOTED_STRING)
+        hits = PNAME_LN.pattern._matches.cache_info().hits
+        self.assertTrue(isinstance('rdf:cool', PNAME_LN))
+        self.assertEqual(hits + 1, PNAME_LN.pattern._matches.cache_info().hits)
+        v = PNAME_LN('rdf:cool')
+        with patch.object(PNAME_LN.pattern, '_matches', side_effect=AssertionError):
+            self.assertTrue(isinstance(v, PNAME_LN))
+
 
 
 if __name__ == '__main__':
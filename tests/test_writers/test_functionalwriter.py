@@ -1,3 +1,5 @@
+import io
+import os
 import unittest
 from dataclasses import dataclass
 
@@ -6,6 +8,10 @@ from rdflib import Namespace
 from funowl.base.fun_owl_base import FunOwlRoot, FunOwlBase
 from funowl.writers.FunctionalWriter import FunctionalWriter
 from funowl.identifiers import IRI
+from funowl.converters.functional_converter import to_python, iter_axioms
+from funowl.ontology_document import Ontology
+from funowl.prefix_declarations import Prefix
+from tests import datadir
 from tests.utils.base import TestBase
 
 EX = Namespace("http://example.org/ex/")
@@ -100,6 +106,86 @@ class FunctionalWriterTestCase(TestBase):
         self.w.reset()
         self.assertEqual('Foo( )', str(self.w.opt(Foo())))
 
+    def test_stream(self):
+        """ A streaming writer writes what getvalue() would return """
+        class Nested(FunOwlBase):
+            def to_functional(self, w: FunctionalWriter) -> FunctionalWriter:
+                return w.hardbr().func(self, lambda: w.indent('a').hardbr().hardbr()).br().hardbr()
+
+        def build(w: FunctionalWriter) -> FunctionalWriter:
+            return w.func("Foo", lambda: (w + 'x' + Nested()).iter([Nested(), 'y']) + 'z').hardbr().hardbr()
+
+        out = io.StringIO()
+        self.assertIsNotNone(build(FunctionalWriter(stream=out)).flush())
+        self.assertEqual(build(FunctionalWriter()).getvalue(), out.getvalue())
+        with self.assertRaises(ValueError):
+            FunctionalWriter(stream=out).getvalue()
+
+        doc = to_python(os.path.join(datadir, 'pizza.owl'), print_progress=False)
+        out = io.StringIO()
+        doc.to_functional(stream=out)
+        self.assertEqual(str(doc.to_functional()), out.getvalue())
+
+    def test_parallel(self):
+        """ Axioms rendered in a process pool come out as a sequential write would have them """
+        doc = to_python(os.path.join(datadir, 'pizza.owl'), print_progress=False)
+        expected = str(doc.to_functional())
+        self.assertEqual(expected, str(doc.to_functional(workers=2)))
+        out = io.StringIO()
+        doc.to_functional(stream=out, workers=3)
+        self.assertEqual(expected, out.getvalue())
+
+    def test_compact(self):
+        """ A compact writer puts each axiom on one line """
+        doc = to_python("""Prefix(:=<http://example.org/>)
+Ontology(<http://example.org/o>
+    Annotation(:note "compact")
+    SubClassOf(Annotation(:note "a") :A ObjectIntersectionOf(:B ObjectSomeValuesFrom(:p :C)))
+    EquivalentClasses(:B :C)
+)""", print_progress=False)
+        self.assertEqual("""Prefix( : = <http://example.org/> )
+
+Ontology( :o
+Annotation( :note "compact" )
+SubClassOf( Annotation( :note "a" ) :A ObjectIntersectionOf( :B ObjectSomeValuesFrom( :p :C ) ) )
+EquivalentClasses( :B :C )
+)""", '\n'.join(str(doc.to_functional(compact=True)).split('\n')[5:]))
+
+        doc = to_python(os.path.join(datadir, 'pizza.owl'), print_progress=False)
+        compact = str(doc.to_functional(compact=True))
+        self.assertEqual(doc.ontology, to_python(compact, print_progress=False).ontology)
+        self.assertEqual(compact, str(doc.to_functional(compact=True, workers=2)))
+        out = io.StringIO()
+        doc.to_functional(stream=out, compact=True)
+        self.assertEqual(compact, out.getvalue())
+
+    def test_compact_lines(self):
+        """ Every line of a compact body parses as exactly one axiom, even when literals span lines """
+        # After TestCase-WebOnt I5.8/013
+        doc = to_python("""Prefix(eg:=<http://example.org/user/data#>)
+Prefix(first:=<http://www.w3.org/2002/03owlt/I5.8/consistent013#>)
+Ontology(<http://www.w3.org/2002/03owlt/I5.8/consistent013>
+    Declaration(Datatype(eg:type))
+    AnnotationAssertion(rdfs:comment eg:type "
+  This type maps the string foo to the number 3.
+  All other strings are not in the lexical space.
+       ")
+    DataPropertyRange(first:prop eg:type)
+)""", print_progress=False)
+        compact = str(doc.to_functional(compact=True))
+        self.assertIn('DataPropertyRange( first:prop eg:type )', compact)
+        self.assertEqual(doc.ontology, to_python(compact, print_progress=False).ontology)
+
+        for doc in (doc, to_python(os.path.join(datadir, 'pizza.owl'), print_progress=False)):
+            lines = str(doc.to_functional(compact=True)).split('\n')
+            start = next(i for i, line in enumerate(lines) if line.startswith('Ontology('))
+            prefixes = '\n'.join(lines[:start])
+            self.assertEqual(')', lines[-1])
+            for line in lines[start + 1:-1]:
+                elements = [e for e in iter_axioms(f'{prefixes}\nOntology(\n{line}\n)\n')
+                            if not isinstance(e, (Prefix, Ontology))]
+                self.assertEqual(1, len(elements), line)
+
     def test_error_check(self):
         """ Make sure FunctionalWriter error check catches what we are expecting """
         with self.assertRaises(ValueError):
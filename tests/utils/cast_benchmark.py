@@ -0,0 +1,62 @@
+"""
+Microbenchmark for the cast plans in funowl.base.cast_function.
+
+Times the casts that the functional parser makes most often, and a parse of pizza.owl, with and without cast plans:
+
+    python -m tests.utils.cast_benchmark
+"""
+import os
+import timeit
+from dataclasses import fields
+
+from funowl import SubClassOf, ObjectSomeValuesFrom, Declaration, Class
+import funowl.base.cast_function as cast_function
+from funowl.base.cast_function import cast
+from funowl.converters.functional_converter import to_python
+from funowl.general_definitions import AbbreviatedIRI
+from tests import datadir
+
+
+def _field(cls, name):
+    return next(f for f in fields(cls) if f.name == name)
+
+
+SUB = _field(SubClassOf, 'subClassExpression')
+PROP = _field(ObjectSomeValuesFrom, 'objectPropertyExpression')
+DECL = _field(Declaration, 'v')
+IRIS = [AbbreviatedIRI(f'pizza:C{i}') for i in range(50)]
+CLASSES = [Class(iri) for iri in IRIS]
+EXPR = ObjectSomeValuesFrom(IRIS[0], IRIS[1])
+
+
+def cast_workload() -> None:
+    """ Prefixed names and class expressions placed in class expression, property and declaration fields """
+    for iri, cls in zip(IRIS, CLASSES):
+        cast(SUB, iri)
+        cast(PROP, iri)
+        cast(SUB, EXPR)
+        cast(DECL, cls)
+
+
+def parse_workload() -> None:
+    to_python(os.path.join(datadir, 'pizza.owl'), print_progress=False)
+
+
+def best(fn, number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number
+
+
+def main() -> None:
+    for name, workload, number in (('cast', cast_workload, 20), ('parse pizza.owl', parse_workload, 1)):
+        timings = {}
+        for use_plans in (False, True):
+            cast_function.USE_CAST_PLANS = use_plans
+            workload()
+            timings[use_plans] = best(workload, number)
+        print(f"{name:>16}: {timings[False] * 1000:8.2f}ms without plans  {timings[True] * 1000:8.2f}ms with plans  "
+              f"({timings[False] / timings[True]:.1f}x)")
+    cast_function.USE_CAST_PLANS = True
+
+
+if __name__ == '__main__':
+    main()
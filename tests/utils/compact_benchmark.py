@@ -0,0 +1,48 @@
+"""
+Memory used per axiom by the model classes and by their compact variants in funowl.compact.
+
+Loads a generated ontology of Declaration, SubClassOf/ObjectSomeValuesFrom and AnnotationAssertion axioms and reports
+the memory held by the document before and after it is compacted:
+
+    python -m tests.utils.compact_benchmark [number of classes]
+"""
+import gc
+import sys
+import tracemalloc
+
+from funowl.compact import compact
+from funowl.converters.functional_converter import to_python
+
+
+def ontology_text(n: int) -> str:
+    """ Functional syntax for an ontology with three axioms for each of n classes """
+    axioms = []
+    for i in range(n):
+        axioms.append(f'Declaration(Class(:C{i}))')
+        axioms.append(f'SubClassOf(:C{i} ObjectSomeValuesFrom(:p{i % 10} :C{(i + 1) % n}))')
+        axioms.append(f'AnnotationAssertion(rdfs:label :C{i} "Class {i}"@en)')
+    return 'Prefix(:=<http://example.org/>)\nPrefix(rdfs:=<http://www.w3.org/2000/01/rdf-schema#>)\n' \
+           'Ontology(<http://example.org/o>\n' + '\n'.join(axioms) + '\n)\n'
+
+
+def traced() -> int:
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def main(n: int = 10000) -> None:
+    text = ontology_text(n)
+    tracemalloc.start()
+    base = traced()
+    doc = to_python(text, print_progress=False)
+    before = traced() - base
+    compact(doc)
+    after = traced() - base
+    tracemalloc.stop()
+    naxioms = len(doc.ontology.axioms)
+    print(f"{naxioms} axioms:  {before / naxioms:6.0f} bytes per axiom as loaded  {after / naxioms:6.0f} compacted  "
+          f"({1 - after / before:.0%} less)")
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])